@@ -33,14 +33,20 @@ class IRException(Exception):
     """IR error"""
 
     def __init__(self, *args):
-        msg = ' '.join(str(arg) for arg in args)
-
-        if not msg:
-            self._msg = self.__doc__
-        else:
-            self._msg = msg
+        # decoders raise these for every frame they turn down, so the
+        # message only gets built if something asks for it
+        self._args = args
+        self._msg = None
 
     def __str__(self):
+        if self._msg is None:
+            msg = ' '.join(str(arg) for arg in self._args)
+
+            if not msg:
+                self._msg = self.__doc__
+            else:
+                self._msg = msg
+
         return self._msg
 
 
@@ -109,27 +115,14 @@ def pronto_to_mce(pronto_code):
 
 
 def decode_pronto_code(pronto_code):
-    frequency, rlc = pronto.pronto_to_rlc(pronto_code)
-    code = protocols.decode(rlc, frequency)
-
-    if code.decoder == protocols.Universal:
-        protocols.RC57F.enabled = False
-        code = protocols.decode(rlc, frequency)
+    # the candidates come in decoder order so the first one is the code
+    # decode would return
+    candidates = protocols.decode_all(pronto_code)
 
-    if code.decoder == protocols.Universal:
-        protocols.RC57F57.enabled = False
-        code = protocols.decode(rlc, frequency)
+    if not candidates:
+        return None
 
-    if code.decoder == protocols.Universal:
-        protocols.Thomson.enabled = False
-        code = protocols.decode(rlc, frequency)
-
-    if code.decoder == protocols.Universal:
-        protocols.NEC.enabled = False
-        protocols.NECf16.enabled = False
-        code = protocols.decode(rlc, frequency)
-
-    return code
+    return candidates[0][0]
 
 
 __all__ = (
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in 
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN 
+# THE SOFTWARE.
+
+# ****************************************************************************
+
+# Checksum rules let a protocol say what makes a frame valid without having
+# to build an IRCode first. A rule is a tuple that holds the name of the
+# parameter being checked, an operator and one or more terms.
+#
+#   ('F_CHECKSUM', '~', 'F')            F_CHECKSUM = ~F
+#   ('C3', '=', 15)                     C3 = 15
+#   ('C1', '-', 'S1', 'S2', 15, 'D', ('D', 4, 4))
+#                                       C1 = -(S1 + S2 + 15 + D + D::4)
+#
+# A term is the name of a parameter, an int or a (name, num_bits, shift)
+# tuple that works like the IRP name:num_bits:shift. The operators are
+#
+#   '='  the parameter is the same as the term
+#   '~'  the parameter is the inverse of the term
+#   '+'  the parameter is the sum of the terms
+#   '-'  the parameter is the negated sum of the terms
+#   '^'  the parameter is the terms xor'd together
+#
+# The result always gets masked to the width of the parameter being checked.
+# The rules are compiled into shift and mask operations against the raw
+# decoded bits, the first bit received is the most significant bit.
+
+from .code_wrapper import _reverse_bits
+
+
+def _mask(num_bits):
+    return (1 << num_bits) - 1
+
+
+class ChecksumRules(object):
+
+    def __init__(self, rules, parameters, encoding, num_bits):
+        self.rules = rules
+        self.parameters = parameters
+        self.encoding = encoding
+        self.num_bits = num_bits
+
+        self._fields = dict(
+            (name, (start, stop)) for name, start, stop in parameters
+        )
+        self._checks = [self._compile_rule(rule) for rule in rules]
+
+    def matches(self, parameters, encoding, num_bits):
+        return (
+            self.num_bits == num_bits and
+            self.encoding == encoding and
+            (self.parameters is parameters or self.parameters == parameters)
+        )
+
+    def __call__(self, value):
+        for check in self._checks:
+            if not check(value):
+                return False
+
+        return True
+
+    def _compile_field(self, name):
+        try:
+            start, stop = self._fields[name]
+        except KeyError:
+            raise ValueError('Unknown checksum parameter ' + repr(name))
+
+        # same bits CodeWrapper.get_value gives
+        bits = range(self.num_bits)[start:stop + 1]
+        if not bits:
+            return (lambda value: 0), stop - start + 1
+
+        shift = self.num_bits - 1 - bits[-1]
+        num_bits = len(bits)
+        mask = _mask(num_bits)
+
+        if self.encoding.startswith('lsb'):
+            def get_field(value):
+                return _reverse_bits(value >> shift & mask, num_bits)
+        else:
+            def get_field(value):
+                return value >> shift & mask
+
+        return get_field, stop - start + 1
+
+    def _compile_term(self, term):
+        if isinstance(term, int):
+            return lambda value: term
+
+        if isinstance(term, tuple):
+            name, num_bits, shift = term
+            get_field = self._compile_field(name)[0]
+            mask = _mask(num_bits)
+
+            return lambda value: get_field(value) >> shift & mask
+
+        return self._compile_field(term)[0]
+
+    def _compile_rule(self, rule):
+        name, op = rule[:2]
+        terms = [self._compile_term(term) for term in rule[2:]]
+
+        get_target, num_bits = self._compile_field(name)
+        mask = _mask(num_bits)
+
+        if not terms:
+            raise ValueError('Checksum rule without any terms ' + repr(rule))
+
+        if op in ('=', '~'):
+            if len(terms) != 1:
+                raise ValueError(
+                    'Checksum rule takes a single term ' + repr(rule)
+                )
+
+            term = terms[0]
+
+            if op == '=':
+                def check(value):
+                    return get_target(value) == term(value) & mask
+            else:
+                def check(value):
+                    return get_target(value) == ~term(value) & mask
+
+        elif op in ('+', '-'):
+            sign = 1 if op == '+' else -1
+
+            def check(value):
+                total = 0
+                for term in terms:
+                    total += term(value)
+
+                return get_target(value) == sign * total & mask
+
+        elif op == '^':
+            def check(value):
+                total = 0
+                for term in terms:
+                    total ^= term(value)
+
+                return get_target(value) == total & mask
+
+        else:
+            raise ValueError('Unknown checksum operator ' + repr(op))
+
+        return check
@@ -98,6 +98,13 @@
 
 
 import math
+from itertools import chain, islice, repeat
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from . import (
     LeadOutError,
     LeadInError,
@@ -107,6 +114,1078 @@ from . import (
 from . import integer_wrapper
 
 
+# cap on the number of entries a timing table will hold. some of the lookups
+# are sums that include timings from the frame being decoded, those only get
+# computed once they go past this limit instead of growing the table.
+MAX_TABLE_SIZE = 1024
+
+# frames with at least this many pulses get sliced with numpy when it is
+# installed. below this building the arrays costs more than the loop of
+# the pulse distance slicer does. set to 0 to turn the numpy slicer off.
+NUMPY_MIN_PULSES = 300
+
+
+def timing_bounds(expected_timing_value, tolerance):
+    high = math.floor(
+        expected_timing_value +
+        (expected_timing_value * (tolerance / 100.0))
+    )
+    low = math.floor(
+        expected_timing_value -
+        (expected_timing_value * (tolerance / 100.0))
+    )
+
+    # do a flip flop of the high and low so the same expression can
+    # be used when evaluating a raw timing
+    if expected_timing_value < 0:
+        low, high = high, low
+
+    return int(low), int(high)
+
+
+def get_stream_encoding(bursts):
+    if not bursts:
+        return 'halfbit'
+
+    last_pair = bursts[0]
+
+    if isinstance(last_pair, int):
+        return 'bit'
+
+    for mark, space in bursts[1:]:
+        if (
+            mark == last_pair[1] and
+            space == last_pair[0]
+        ):
+            return 'manchester'
+
+        last_pair = [mark, space]
+
+    return 'halfbit'
+
+
+class TimingTable(dict):
+    """
+    Expected timing -> (low, high) lookup table for a single tolerance.
+
+    Timings that are not in the table get computed and stored the first
+    time they are looked up.
+    """
+
+    def __init__(self, tolerance, timings=()):
+        dict.__init__(self)
+        self.tolerance = tolerance
+        self.biphase_slicers = {}
+        self.distance_slicers = {}
+        self.symbol_slicers = {}
+        self.symbol_tables = {}
+        self.numpy_slicers = {}
+
+        for timing in timings:
+            self[timing] = timing_bounds(timing, tolerance)
+
+    def __missing__(self, expected_timing_value):
+        bounds = timing_bounds(expected_timing_value, self.tolerance)
+
+        if len(self) < MAX_TABLE_SIZE:
+            self[expected_timing_value] = bounds
+
+        return bounds
+
+
+_reverse_bits = integer_wrapper._reverse
+
+
+def compile_parameters(parameters):
+    """
+    Turns a protocol's parameters into extractors for extract_values.
+
+    An extractor is (name, start, stop, mask, num_bits). Protocols have
+    theirs compiled when the class gets made.
+    """
+    return tuple(
+        (name, start, stop, (1 << max(stop - start + 1, 0)) - 1,
+         stop - start + 1)
+        for name, start, stop in parameters
+    )
+
+
+def extract_values(extractors, value, num_bits, encoding, bursts, params):
+    """
+    Adds an IntegerWrapper to params for each extractor.
+
+    value holds the decoded bits with the first bit received being the most
+    significant. The values are the same ones CodeWrapper.get_value gives.
+    """
+    top = num_bits - 1
+    reverse = encoding.startswith('lsb')
+
+    for name, start, stop, mask, param_bits in extractors:
+        if start < 0 or stop < start or stop > top:
+            # python slicing rules apply to these, get_value deals with it
+            bits = range(num_bits)[start: stop + 1]
+
+            if bits:
+                res = value >> (top - bits[-1]) & ((1 << len(bits)) - 1)
+
+                if reverse:
+                    res = _reverse_bits(res, len(bits))
+            else:
+                res = 0
+        else:
+            res = value >> (top - stop) & mask
+
+            if reverse:
+                res = _reverse_bits(res, param_bits)
+
+        params[name] = integer_wrapper.IntegerWrapper(
+            res,
+            param_bits,
+            bursts,
+            encoding
+        )
+
+    return params
+
+
+def _signed_bounds(timings, expected_timing_value):
+    # same result as CodeWrapper._match, the sign check is folded into the
+    # bounds so a pulse only has to be compared against them
+    low, high = timings[expected_timing_value]
+
+    if expected_timing_value > 0:
+        low = max(low, 0)
+    elif expected_timing_value < 0:
+        high = min(high, 0)
+
+    return low, high
+
+
+def _is_mirrored(bursts):
+    return (
+        len(bursts) == 2 and
+        all(
+            isinstance(burst, list) and len(burst) == 2 for burst in bursts
+        ) and
+        bursts[1] == [bursts[0][1], bursts[0][0]]
+    )
+
+
+def get_biphase_slicer(timings, bursts, middle_timings):
+    """
+    Returns the bi-phase slicer for the bursts or None if they are not
+    bi-phase.
+
+    Bi-phase (manchester) bursts are a (mark, space) pair and the same
+    pair mirrored. The middle timings that are able to be handled are the
+    double width bit RC6 has and the (mark, space) tuples and single
+    timings that get sent once somewhere in the frame without being a bit,
+    like the ones MCE and RC5x have. Anything else gets left for the
+    generic manchester loop in CodeWrapper.
+
+    Humax4Phase has four phase bursts that are not bi-phase and it decodes
+    its frames itself. The other protocols that have no static shape are
+    pulse distance or symbol coded, see get_pulse_distance_slicer and
+    get_symbol_slicer.
+    """
+    if not _is_mirrored(bursts):
+        return None
+
+    trailer = None
+    gaps = []
+
+    for timing in middle_timings:
+        if isinstance(timing, dict):
+            if trailer is not None or not _is_mirrored(timing['bursts']):
+                return None
+
+            trailer = timing
+
+        elif isinstance(timing, tuple) and len(timing) == 2:
+            gaps.append(timing)
+
+        elif isinstance(timing, int):
+            gaps.append(timing)
+
+        else:
+            return None
+
+    if trailer is None:
+        key = (tuple(bursts[0]), None, tuple(gaps))
+    else:
+        key = (
+            tuple(bursts[0]),
+            (
+                trailer['start'],
+                trailer['stop'],
+                tuple(trailer['bursts'][0])
+            ),
+            tuple(gaps)
+        )
+
+    try:
+        return timings.biphase_slicers[key]
+    except KeyError:
+        pass
+
+    slicer = BiphaseSlicer(timings, bursts, trailer, gaps)
+    timings.biphase_slicers[key] = slicer
+    return slicer
+
+
+class BiphaseSlicer(object):
+    """
+    Turns the pulses of a bi-phase frame into bits.
+
+    Every pulse is either one or two half bit periods long. The pulses get
+    cut into half bits and every two half bits make a bit. This gives the
+    same pairs, cleaned code and errors as the manchester loop in
+    CodeWrapper does for the same bursts.
+
+    gaps are the middle timings that are not a bit. Each one is found once
+    at most and a pulse is able to hold a gap and the half bit next to it.
+    """
+
+    def __init__(self, timings, bursts, trailer, gaps):
+        mark, space = bursts[0]
+
+        self.bursts = [burst[:] for burst in bursts]
+        self.mark = mark
+        self.space = space
+        self.bounds = tuple(
+            _signed_bounds(timings, timing)
+            for timing in (mark, space, mark * 2, space * 2)
+        )
+
+        if trailer is None:
+            self.trailer = None
+            self.trailer_bursts = []
+        else:
+            t_mark, t_space = trailer['bursts'][0]
+
+            self.trailer = (
+                trailer['start'] - 1,
+                trailer['stop'] - 1,
+                t_mark,
+                t_space
+            ) + tuple(
+                _signed_bounds(timings, timing)
+                for timing in (
+                    t_mark,
+                    t_space,
+                    t_mark * 2,
+                    t_space * 2,
+                    mark + t_mark,
+                    space + t_space
+                )
+            )
+            self.trailer_bursts = [burst[:] for burst in trailer['bursts']]
+
+        self.gaps = []
+
+        for gap in gaps:
+            if isinstance(gap, tuple):
+                t_mark, t_space = gap
+                self.gaps.append(
+                    (True, t_mark, t_space) + tuple(
+                        _signed_bounds(timings, timing)
+                        for timing in (
+                            t_space,
+                            t_space * 2,
+                            space + t_space,
+                            t_mark,
+                            mark + t_mark
+                        )
+                    )
+                )
+                continue
+
+            # a single timing is able to run into a half bit that has the
+            # same sign
+            if gap < 0 > mark or gap > 0 < mark:
+                half_bit = mark
+            elif gap < 0 > space or gap > 0 < space:
+                half_bit = space
+            else:
+                half_bit = None
+
+            if half_bit is None:
+                bounds = ()
+            else:
+                bounds = (
+                    _signed_bounds(timings, gap + half_bit),
+                    _signed_bounds(timings, gap + half_bit * 2)
+                )
+
+            self.gaps.append(
+                (False, gap, half_bit, _signed_bounds(timings, gap)) + bounds
+            )
+
+    def __call__(self, stream, num_pulses, lead_in, cleaned_code):
+        mark = self.mark
+        space = self.space
+        (
+            (mark_low, mark_high),
+            (space_low, space_high),
+            (mark2_low, mark2_high),
+            (space2_low, space2_high)
+        ) = self.bounds
+        trailer = self.trailer
+
+        half_bits = []
+        append = half_bits.append
+        extend = half_bits.extend
+        code_append = cleaned_code.append
+        code_extend = cleaned_code.extend
+
+        if self.gaps:
+            # a gap is found by looking at the pulse that comes after it
+            stream = list(stream)
+            gaps = self.gaps[:]
+        else:
+            gaps = None
+
+        for i, burst in enumerate(stream):
+            if mark_low <= burst <= mark_high:
+                append(mark)
+                code_append(mark)
+                continue
+
+            if space_low <= burst <= space_high:
+                append(space)
+                code_append(space)
+                continue
+
+            if (
+                trailer is not None and
+                trailer[0] <= len(half_bits) // 2 <= trailer[1]
+            ):
+                (
+                    _, _, t_mark, t_space,
+                    (t_mark_low, t_mark_high),
+                    (t_space_low, t_space_high),
+                    (t_mark2_low, t_mark2_high),
+                    (t_space2_low, t_space2_high),
+                    (mark_t_low, mark_t_high),
+                    (space_t_low, space_t_high)
+                ) = trailer
+
+                if t_mark_low <= burst <= t_mark_high:
+                    append(t_mark)
+                    code_append(t_mark)
+                    continue
+
+                if t_space_low <= burst <= t_space_high:
+                    append(t_space)
+                    code_append(t_space)
+                    continue
+
+                if t_mark2_low <= burst <= t_mark2_high:
+                    extend((t_mark, t_mark))
+                    code_extend((t_mark, t_mark))
+                    continue
+
+                if t_space2_low <= burst <= t_space2_high:
+                    extend((t_space, t_space))
+                    code_extend((t_space, t_space))
+                    continue
+
+                if mark_t_low <= burst <= mark_t_high:
+                    if half_bits[-1] == space:
+                        extend((mark, t_mark))
+                        code_extend((mark, t_mark))
+                        continue
+
+                    if half_bits[-1] == t_space:
+                        extend((t_mark, mark))
+                        code_extend((t_mark, mark))
+                        continue
+
+                if space_t_low <= burst <= space_t_high:
+                    if half_bits[-1] == mark:
+                        extend((space, t_space))
+                        code_extend((space, t_space))
+                        continue
+
+                    if half_bits[-1] == t_mark:
+                        extend((t_space, space))
+                        code_extend((t_space, space))
+                        continue
+
+            if gaps and self._gap(
+                burst, i, stream, gaps, half_bits, cleaned_code
+            ):
+                continue
+
+            if mark2_low <= burst <= mark2_high:
+                extend((mark, mark))
+                code_extend((mark, mark))
+
+            elif space2_low <= burst <= space2_high:
+                extend((space, space))
+                code_extend((space, space))
+
+            elif (
+                lead_in and
+                lead_in[-1] == -999999999999 and
+                i + 1 == num_pulses
+            ):
+                # the last pulse runs into a lead out that has no length
+                if len(half_bits) % 2:
+                    for b_mark, b_space in self.bursts:
+                        if b_space > 0:
+                            continue
+
+                        if b_mark == half_bits[-1]:
+                            append(b_space)
+                            code_extend((b_space, burst - b_space))
+                            break
+                    else:
+                        raise IRStreamError
+                else:
+                    code_extend((space, burst))
+            else:
+                raise IRStreamError(burst)
+
+        return self._to_bits(half_bits, cleaned_code)
+
+    def _gap(self, burst, i, pulses, gaps, half_bits, cleaned_code):
+        # returns True when the pulse was taken by one of the gaps that has
+        # not been found yet. the checks and the order they are made in are
+        # the same as the generic manchester loop has
+        mark = self.mark
+        space = self.space
+
+        for gap in gaps[:]:
+            if gap[0]:
+                (
+                    _, t_mark, t_space,
+                    (t_space_low, t_space_high),
+                    (t_space2_low, t_space2_high),
+                    (space_t_low, space_t_high),
+                    (t_mark_low, t_mark_high),
+                    (mark_t_low, mark_t_high)
+                ) = gap
+
+                if cleaned_code[-1] == t_mark:
+                    if t_space_low <= burst <= t_space_high:
+                        gaps.remove(gap)
+                        cleaned_code.append(t_space)
+                        return True
+
+                    if t_space2_low <= burst <= t_space2_high:
+                        half_bits.append(t_space)
+                        gaps.remove(gap)
+                        cleaned_code.extend((t_space, t_space))
+                        return True
+
+                    if space_t_low <= burst <= space_t_high:
+                        if not half_bits:
+                            raise IRStreamError
+
+                        gaps.remove(gap)
+                        if half_bits[-1] == mark:
+                            cleaned_code.extend((space, t_space))
+                        else:
+                            cleaned_code.extend((t_space, space))
+
+                        half_bits.append(space)
+                        return True
+
+                if t_mark_low <= burst <= t_mark_high:
+                    next_burst = pulses[i + 1]
+
+                    if (
+                        t_space_low <= next_burst <= t_space_high or
+                        space_t_low <= next_burst <= space_t_high
+                    ):
+                        cleaned_code.append(t_mark)
+                        return True
+
+                if mark_t_low <= burst <= mark_t_high:
+                    next_burst = pulses[i + 1]
+
+                    if (
+                        t_space_low <= next_burst <= t_space_high or
+                        space_t_low <= next_burst <= space_t_high
+                    ):
+                        cleaned_code.extend((mark, t_mark))
+                        half_bits.append(mark)
+
+                    # the generic loop drops the pulse when the one after
+                    # it does not finish the gap
+                    return True
+
+                continue
+
+            _, timing, half_bit, (low, high) = gap[:4]
+
+            if low <= burst <= high:
+                gaps.remove(gap)
+                cleaned_code.append(timing)
+                return True
+
+            if half_bit is None:
+                continue
+
+            (low, high), (low2, high2) = gap[4:]
+
+            if low <= burst <= high:
+                half_bits.append(half_bit)
+                cleaned_code.extend((half_bit, timing))
+                gaps.remove(gap)
+                return True
+
+            if low2 <= burst <= high2:
+                half_bits.extend((half_bit, half_bit))
+                cleaned_code.extend((half_bit, timing, half_bit))
+                gaps.remove(gap)
+                return True
+
+        return False
+
+    def _to_bits(self, half_bits, cleaned_code):
+        bursts = self.bursts
+        zero, one = bursts
+        trailer_bursts = self.trailer_bursts
+
+        pairs = []
+        decoded_code = 0
+        num_bits = 0
+
+        for i in range(0, len(half_bits) - 1, 2):
+            bp = [half_bits[i], half_bits[i + 1]]
+
+            if bp in trailer_bursts:
+                bp = bursts[trailer_bursts.index(bp)][:]
+
+            pairs.append(bp)
+
+        if len(half_bits) % 2:
+            pairs.append([half_bits[-1]])
+
+        last_pair = len(pairs) - 1
+
+        for i, bp in enumerate(pairs):
+            if len(bp) == 1:
+                if i != last_pair:
+                    raise IRStreamError
+
+                for b_mark, b_space in bursts:
+                    if bp[0] == b_mark:
+                        bp.append(b_space)
+                        cleaned_code.append(b_space)
+                        break
+                else:
+                    raise IRStreamError
+
+            if bp == zero:
+                decoded_code <<= 1
+            elif bp == one:
+                decoded_code = decoded_code << 1 | 1
+            else:
+                raise IRStreamError(pairs)
+
+            num_bits += 1
+
+        return pairs, decoded_code, num_bits
+
+
+def get_pulse_distance_slicer(timings, bursts):
+    """
+    Returns the pulse distance slicer for the bursts or None if they are
+    not pulse distance (or pulse width) bursts.
+
+    The bursts have to be two (mark, space) pairs where one of the two
+    timings is the same for both and the other timing is what tells a 0
+    from a 1.
+    """
+    if (
+        len(bursts) != 2 or
+        not all(
+            isinstance(burst, list) and len(burst) == 2 for burst in bursts
+        )
+    ):
+        return None
+
+    if bursts[0][0] == bursts[1][0]:
+        fixed = 0
+    elif bursts[0][1] == bursts[1][1]:
+        fixed = 1
+    else:
+        return None
+
+    key = tuple(bursts[0]) + tuple(bursts[1])
+
+    try:
+        return timings.distance_slicers[key]
+    except KeyError:
+        pass
+
+    slicer = PulseDistanceSlicer(timings, bursts, fixed)
+
+    if not slicer.usable:
+        slicer = None
+
+    timings.distance_slicers[key] = slicer
+    return slicer
+
+
+class PulseDistanceSlicer(object):
+    """
+    Turns the pulses of a pulse distance or pulse width frame into bits.
+
+    The timing that is the same for both bursts gets checked against its
+    bounds and the timing that changes gets split with a single compare
+    against the top of the lower of the two bounds before the bounds of
+    the one it lands on get checked. This gives the same result as
+    matching every pulse against every burst does as long as the bounds
+    do not overlap, when that is not the case the slicer is not used. Any
+    frame the slicer is not able to handle gets handed back so the
+    generic code is able to decode it or raise the error it normally
+    would.
+    """
+
+    def __init__(self, timings, bursts, fixed):
+        varying = 1 - fixed
+        fixed_timing = bursts[0][fixed]
+        zero = bursts[0][varying]
+        one = bursts[1][varying]
+
+        self.bursts = [burst[:] for burst in bursts]
+        self.fixed = fixed
+        self.fixed_bounds = _signed_bounds(timings, fixed_timing)
+
+        (low_a, high_a, bit_a), (low_b, high_b, bit_b) = sorted((
+            _signed_bounds(timings, zero) + (0,),
+            _signed_bounds(timings, one) + (1,)
+        ))
+        self.split = (low_a, high_a, bit_a, low_b, high_b, bit_b)
+
+        # a lone pulse at the end of the frame is the first half of a
+        # burst, the generic code pairs it with the first burst that
+        # starts with the same timing
+        self.lone = []
+        starts = []
+
+        for num, burst in enumerate(bursts):
+            if burst[0] not in starts:
+                starts.append(burst[0])
+                self.lone.append(_signed_bounds(timings, burst[0]) + (num,))
+
+        self.usable = (
+            zero != one and
+            0 not in (fixed_timing, zero, one) and
+            (fixed_timing > 0) != (zero > 0) and
+            (zero > 0) == (one > 0) and
+            high_a < low_b
+        )
+
+    def __call__(self, pulses, cleaned_code):
+        num_pulses = len(pulses)
+        end = num_pulses - num_pulses % 2
+
+        low, high = self.fixed_bounds
+        for burst in islice(pulses, self.fixed, end, 2):
+            if not low <= burst <= high:
+                return None
+
+        low_a, high_a, bit_a, low_b, high_b, bit_b = self.split
+        decoded_code = 0
+        bits = []
+
+        for burst in islice(pulses, 1 - self.fixed, end, 2):
+            if burst <= high_a:
+                if burst < low_a:
+                    return None
+
+                bit = bit_a
+
+            elif low_b <= burst <= high_b:
+                bit = bit_b
+            else:
+                return None
+
+            decoded_code = decoded_code << 1 | bit
+            bits.append(bit)
+
+        bursts = self.bursts
+        pairs = [bursts[bit][:] for bit in bits]
+
+        if end != num_pulses:
+            burst = pulses[-1]
+
+            for low, high, bit in self.lone:
+                if low <= burst <= high:
+                    break
+            else:
+                return None
+
+            decoded_code = decoded_code << 1 | bit
+            pairs.append(bursts[bit][:])
+
+        for pair in pairs:
+            cleaned_code.extend(pair)
+
+        return pairs, decoded_code, len(pairs)
+
+
+# most buckets a symbol table is allowed to have, the bucket width grows
+# to stay under this
+MAX_SYMBOL_BUCKETS = 4096
+
+
+def _unsigned_bounds(timings, expected_timing_value):
+    return timings[expected_timing_value]
+
+
+def get_symbol_table(timings, symbols, signed=True):
+    """
+    Returns the symbol table for the symbols at the tolerance of timings.
+
+    A symbol is a list holding a single timing or a (mark, space) pair.
+    signed is True to match the same way CodeWrapper does, where a pulse
+    with the wrong sign never matches, and False to match the way
+    IrProtocolBase._match does.
+    """
+    key = (signed,) + tuple(tuple(symbol) for symbol in symbols)
+
+    try:
+        return timings.symbol_tables[key]
+    except KeyError:
+        pass
+
+    table = SymbolTable(timings, symbols, signed)
+    timings.symbol_tables[key] = table
+    return table
+
+
+class SymbolTable(object):
+    """
+    Finds the first symbol a pulse or a (mark, space) pair matches.
+
+    The last timing of every symbol gets quantized into buckets when the
+    table is made. Each bucket holds the symbols whose bounds reach into
+    it, in the order the symbols were given, so finding a symbol is one
+    division and one index followed by checking the bounds of the few
+    symbols in the bucket. This gives the same symbol as checking every
+    symbol in order does.
+    """
+
+    def __init__(self, timings, symbols, signed=True):
+        get_bounds = _signed_bounds if signed else _unsigned_bounds
+
+        entries = []
+        for index, symbol in enumerate(symbols):
+            entry = (index,) + get_bounds(timings, symbol[-1])
+            if len(symbol) == 2:
+                entry += get_bounds(timings, symbol[0])
+
+            entries.append(entry)
+
+        base = min(entry[1] for entry in entries)
+        top = max(entry[2] for entry in entries)
+
+        quantum = max(
+            1,
+            min(entry[2] - entry[1] for entry in entries) // 2,
+            (top - base) // MAX_SYMBOL_BUCKETS + 1
+        )
+
+        buckets = []
+        for low in range(base, top + 1, quantum):
+            high = low + quantum - 1
+            buckets.append(tuple(
+                entry for entry in entries
+                if entry[1] <= high and entry[2] >= low
+            ))
+
+        self.base = base
+        self.quantum = quantum
+        self.buckets = buckets
+
+    def find(self, value):
+        """
+        Index of the first single timing symbol value matches or -1.
+        """
+        bucket = (value - self.base) // self.quantum
+
+        if 0 <= bucket < len(self.buckets):
+            for index, low, high in self.buckets[bucket]:
+                if low <= value <= high:
+                    return index
+
+        return -1
+
+    def find_pair(self, mark, space):
+        """
+        Index of the first (mark, space) symbol the pair matches or -1.
+        """
+        bucket = (space - self.base) // self.quantum
+
+        if 0 <= bucket < len(self.buckets):
+            for index, low, high, mark_low, mark_high in self.buckets[bucket]:
+                if low <= space <= high and mark_low <= mark <= mark_high:
+                    return index
+
+        return -1
+
+
+def get_symbol_slicer(timings, bursts):
+    """
+    Returns the symbol slicer for the bursts or None if the bursts are not
+    all (mark, space) pairs.
+    """
+    if (
+        len(bursts) < 2 or
+        not all(
+            isinstance(burst, list) and len(burst) == 2 for burst in bursts
+        )
+    ):
+        return None
+
+    key = tuple(tuple(burst) for burst in bursts)
+
+    try:
+        return timings.symbol_slicers[key]
+    except KeyError:
+        pass
+
+    slicer = SymbolSlicer(timings, bursts)
+    timings.symbol_slicers[key] = slicer
+    return slicer
+
+
+class SymbolSlicer(object):
+    """
+    Turns the pulses of a frame with any number of bursts into bits.
+
+    Every pulse gets looked up in a symbol table made of the burst timings
+    in the order the generic code checks them, every two pulses have to
+    make up one of the bursts. Any frame the slicer is not able to handle
+    gets handed back so the generic code is able to decode it or raise the
+    error it normally would.
+    """
+
+    def __init__(self, timings, bursts):
+        self.bursts = [burst[:] for burst in bursts]
+
+        self.timings = []
+        for burst in bursts:
+            for timing in burst:
+                if timing not in self.timings:
+                    self.timings.append(timing)
+
+        self.table = get_symbol_table(
+            timings,
+            [[timing] for timing in self.timings]
+        )
+
+        # burst index for every (mark, space) made up of symbol numbers
+        self.pairs = {}
+        for num, (mark, space) in enumerate(bursts):
+            self.pairs.setdefault(
+                (self.timings.index(mark), self.timings.index(space)),
+                num
+            )
+
+        # a lone pulse at the end of the frame gets paired with the first
+        # burst that starts with it
+        self.lone = {}
+        for num, (mark, _) in enumerate(bursts):
+            self.lone.setdefault(self.timings.index(mark), num)
+
+        if len(bursts) == 2:
+            self.bit_width = 1
+        elif len(bursts) == 4:
+            self.bit_width = 2
+        else:
+            self.bit_width = 4
+
+    def __call__(self, pulses, cleaned_code):
+        find = self.table.find
+        pair_nums = self.pairs
+        bit_width = self.bit_width
+        bit_mask = (1 << bit_width) - 1
+
+        nums = []
+        decoded_code = 0
+        num_pulses = len(pulses)
+
+        for i in range(0, num_pulses - 1, 2):
+            num = pair_nums.get((find(pulses[i]), find(pulses[i + 1])), -1)
+
+            if num == -1:
+                return None
+
+            decoded_code = decoded_code << bit_width | num & bit_mask
+            nums.append(num)
+
+        if num_pulses % 2:
+            num = self.lone.get(find(pulses[-1]), -1)
+
+            if num == -1:
+                return None
+
+            decoded_code = decoded_code << bit_width | num & bit_mask
+            nums.append(num)
+
+        bursts = self.bursts
+        pairs = [bursts[num][:] for num in nums]
+
+        for pair in pairs:
+            cleaned_code.extend(pair)
+
+        return pairs, decoded_code, len(pairs) * bit_width
+
+
+def get_numpy_slicer(timings, bursts):
+    """
+    Returns the numpy slicer for the bursts or None if numpy is not
+    installed or the bursts are not all (mark, space) pairs.
+    """
+    if (
+        numpy is None or
+        len(bursts) < 2 or
+        not all(
+            isinstance(burst, list) and len(burst) == 2 for burst in bursts
+        )
+    ):
+        return None
+
+    key = tuple(tuple(burst) for burst in bursts)
+
+    try:
+        return timings.numpy_slicers[key]
+    except KeyError:
+        pass
+
+    slicer = NumpySlicer(timings, bursts)
+    timings.numpy_slicers[key] = slicer
+    return slicer
+
+
+class NumpySlicer(object):
+    """
+    Turns the pulses of a frame into bits using numpy.
+
+    This does the same thing SymbolSlicer does for a whole frame at a
+    time. The bounds of the burst timings split the timeline into ranges
+    and every range is given the first timing whose bounds it is in when
+    the slicer is made, a single search finds the range of every pulse.
+    The timings of every two pulses are then looked up in a table that
+    holds the burst they make up. Any frame the slicer is not able to
+    handle gets handed back so the generic code is able to decode it or
+    raise the error it normally would.
+    """
+
+    def __init__(self, timings, bursts):
+        burst_timings = []
+        for burst in bursts:
+            for timing in burst:
+                if timing not in burst_timings:
+                    burst_timings.append(timing)
+
+        # a pulse is within the bounds when low <= pulse < edge
+        bounds = []
+        for timing in burst_timings:
+            low, high = _signed_bounds(timings, timing)
+            bounds.append((low, numpy.nextafter(high, numpy.inf)))
+
+        edges = sorted(set(edge for bound in bounds for edge in bound))
+        self.edges = numpy.array(edges, numpy.float64)
+
+        # the timing number of every range, a pulse below the first edge
+        # is in range 0. a pulse that is not within the bounds of any of
+        # the timings gets one past the last timing number.
+        no_match = len(burst_timings)
+        ranges = [no_match]
+        for edge in edges:
+            for num, (low, high) in enumerate(bounds):
+                if low <= edge < high:
+                    ranges.append(num)
+                    break
+            else:
+                ranges.append(no_match)
+
+        self.ranges = numpy.array(ranges, numpy.int64)
+
+        # burst number for every (mark, space) made up of timing numbers,
+        # -1 when the two timings do not make up a burst
+        size = no_match + 1
+        pairs = numpy.full(size * size, -1, numpy.int64)
+        lone = numpy.full(size, -1, numpy.int64)
+
+        for num in range(len(bursts) - 1, -1, -1):
+            mark = burst_timings.index(bursts[num][0])
+            space = burst_timings.index(bursts[num][1])
+            pairs[mark * size + space] = num
+            # a lone pulse at the end of the frame gets paired with the
+            # first burst that starts with it
+            lone[mark] = num
+
+        self.size = size
+        self.pairs = pairs
+        self.lone = lone
+        self.bursts = numpy.array(bursts, numpy.int64)
+
+        if len(bursts) == 2:
+            self.bit_width = 1
+        elif len(bursts) == 4:
+            self.bit_width = 2
+        else:
+            self.bit_width = 4
+
+    def __call__(self, pulses, cleaned_code):
+        num_pulses = len(pulses)
+        end = num_pulses - num_pulses % 2
+
+        values = numpy.array(pulses)
+        indexes = self.ranges[
+            numpy.searchsorted(self.edges, values, 'right')
+        ]
+
+        nums = self.pairs[indexes[0:end:2] * self.size + indexes[1:end:2]]
+
+        if end != num_pulses:
+            nums = numpy.append(nums, self.lone[indexes[-1]])
+
+        if not num_pulses:
+            return [], 0, 0
+
+        if nums.min() < 0:
+            return None
+
+        burst_pairs = self.bursts[nums]
+        pairs = burst_pairs.tolist()
+        cleaned_code.extend(burst_pairs.ravel().tolist())
+
+        bit_width = self.bit_width
+        if bit_width == 1:
+            bits = nums
+        else:
+            nums &= (1 << bit_width) - 1
+            shifts = numpy.arange(bit_width - 1, -1, -1)
+            bits = (nums[:, None] >> shifts & 1).ravel()
+
+        num_bits = len(bits)
+        packed = numpy.packbits(bits.astype(numpy.uint8))
+        decoded_code = int.from_bytes(packed.tobytes(), 'big')
+        decoded_code >>= len(packed) * 8 - num_bits
+
+        return pairs, decoded_code, num_bits
+
+
+_timing_tables = {}
+
+
+def get_timing_table(tolerance):
+    try:
+        return _timing_tables[tolerance]
+    except KeyError:
+        return _timing_tables.setdefault(tolerance, TimingTable(tolerance))
+
+
 class CodeWrapper(object):
     @property
     def encoding(self):
@@ -140,55 +1219,67 @@ class CodeWrapper(object):
             middle_timings,
             bursts,
             tolerance,
-            code
+            code,
+            timings=None,
+            stream_encoding=None
     ):
+        if timings is None:
+            timings = get_timing_table(tolerance)
+
+        if stream_encoding is None:
+            stream_encoding = get_stream_encoding(bursts)
+
         self._encoding = encoding
-        self._original_code = code[:]
+        # the frame is only ever read from, nothing in here modifies it
+        self._original_code = code
         self._lead_in = lead_in[:]
         self._lead_out = lead_out[:]
         self._bursts = bursts[:]
         self._tolerance = tolerance
-        self._stream_encoding = 'halfbit'
+        self._timings = timings
+        self._stream_encoding = stream_encoding
         self._middle_timings = middle_timings[:]
 
-        total_time = sum(abs(item) for item in code[:-1])
-        decoded_code = []
-        cleaned_code = []
-        pairs = []
+        # middle timings get removed as they are found in the frame
+        if middle_timings:
+            middle_timings = middle_timings[:]
 
-        if bursts:
-            last_pair = bursts[0]
+        # instead of popping the lead in and lead out off of the frame a
+        # cursor is used. begin and stop mark the part of the frame that
+        # holds the bursts. when a lead in timing runs into the first burst
+        # the remainder of the pulse is stored in head and it stands in for
+        # the pulse at begin.
+        begin = 0
+        stop = len(code)
+        head = None
+        total_time = None
 
-            if isinstance(last_pair, int):
-                self._stream_encoding = 'bit'
-            else:
-                for mark, space in bursts[1:]:
-                    if (
-                        mark == last_pair[1] and
-                        space == last_pair[0]
-                    ):
-                        self._stream_encoding = 'manchester'
-                        break
+        cleaned_code = []
+        pairs = []
+        decoded_code = None
+        num_bits = 0
 
-                    last_pair = [mark, space]
+        if len(bursts) == 2:
+            bit_width = 1
+        elif len(bursts) == 4:
+            bit_width = 2
         else:
-            self._stream_encoding = 'halfbit'
+            bit_width = 4
 
         cleaned_lead_out = []
         half_bits = []
-        offset = 0
 
         if self._stream_encoding == 'bit':
-            for i, e_burst in enumerate(lead_in):
-                try:
-                    burst = code[i - offset]
-                except IndexError:
+            for e_burst in lead_in:
+                if begin == stop:
                     raise LeadInError
 
+                burst = code[begin] if head is None else head
+
                 if self._match(burst, e_burst):
-                    code.pop(0)
-                    cleaned_code += [e_burst]
-                    offset += 1
+                    begin += 1
+                    head = None
+                    cleaned_code.append(e_burst)
                     continue
 
                 for timing in bursts:
@@ -197,52 +1288,29 @@ class CodeWrapper(object):
                         continue
 
                     if self._match(burst, timing * multiplier + e_burst):
-                        offset += 1
-                        code.pop(0)
-                        code.insert(0, burst - e_burst)
-                        cleaned_code += [e_burst]
+                        head = burst - e_burst
+                        cleaned_code.append(e_burst)
                         break
                 else:
                     raise LeadInError
 
-            for i, e_burst in enumerate(lead_out):
-                idx = ~(i - len(lead_out)) + 1
-                burst = code.pop(len(code) - idx)
-
-                if self._match(burst, e_burst):
-                    cleaned_lead_out += [e_burst]
-                    continue
-
-                if i == 0:
-                    for timing in bursts:
-                        multiplier = (burst - e_burst) // timing
-                        if multiplier == 0:
-                            continue
-
-                        if self._match(burst, timing * multiplier + e_burst):
-                            half_bits += [burst - e_burst]
-                            cleaned_lead_out += [e_burst]
-                            break
-                    else:
-                        raise LeadOutError
-
         else:
             for e_burst in lead_in:
-                try:
-                    burst = code[0]
-                except IndexError:
+                if begin == stop:
                     raise LeadInError
 
+                burst = code[begin] if head is None else head
+
                 if self._match(burst, e_burst):
-                    code.pop(0)
-                    cleaned_code += [e_burst]
+                    begin += 1
+                    head = None
+                    cleaned_code.append(e_burst)
                     continue
 
                 for mark, _ in bursts:
                     if self._match(burst, e_burst + mark):
-                        code.pop(0)
-                        code.insert(0, mark)
-                        cleaned_code += [e_burst]
+                        head = mark
+                        cleaned_code.append(e_burst)
                         break
                 else:
                     for timing in middle_timings:
@@ -252,48 +1320,109 @@ class CodeWrapper(object):
                         timing = timing[0]
 
                         if self._match(burst, e_burst + timing):
-                            code.pop(0)
-                            code.insert(0, timing)
-                            cleaned_code += [e_burst]
+                            head = timing
+                            cleaned_code.append(e_burst)
+                            break
+                    else:
+                        raise LeadInError(burst)
+
+        num_lead_out = len(lead_out)
+
+        if stop - begin < num_lead_out:
+            # the frame is shorter then the lead out. this is not going to
+            # decode so the few pulses that are left get copied and the lead
+            # out gets taken off of them the long way
+            extras = list(code[begin:stop])
+            if head is not None:
+                extras[0] = head
+
+            begin = stop
+            head = None
+
+            def lead_out_pulse(index):
+                return extras.pop(len(extras) - (num_lead_out - index))
+
+        else:
+            cut = stop - num_lead_out
+            extras = []
+
+            def lead_out_pulse(index):
+                index += cut
+                if index == begin and head is not None:
+                    return head
+
+                return code[index]
+
+        consumed = 0
+
+        if self._stream_encoding == 'bit':
+            for i, e_burst in enumerate(lead_out):
+                try:
+                    burst = lead_out_pulse(i)
+                except IndexError:
+                    raise LeadOutError
+
+                consumed += 1
+
+                if self._match(burst, e_burst):
+                    cleaned_lead_out.append(e_burst)
+                    continue
+
+                if i == 0:
+                    for timing in bursts:
+                        multiplier = (burst - e_burst) // timing
+                        if multiplier == 0:
+                            continue
+
+                        if self._match(burst, timing * multiplier + e_burst):
+                            half_bits.append(burst - e_burst)
+                            cleaned_lead_out.append(e_burst)
                             break
                     else:
-                        raise LeadInError(str(burst))
+                        raise LeadOutError
 
+        else:
             for i, e_burst in enumerate(lead_out):
                 if e_burst == -999999999999:
                     break
 
-                idx = ~(i - len(lead_out)) + 1
                 try:
-                    burst = code.pop(len(code) - idx)
+                    burst = lead_out_pulse(i)
                 except IndexError:
                     raise LeadOutError
 
+                consumed += 1
+
                 if self._match(burst, e_burst):
-                    cleaned_lead_out += [e_burst]
+                    cleaned_lead_out.append(e_burst)
                     continue
 
                 for _, space in bursts:
                     if (
-                        len(lead_out) % 2 == 0 and
+                        num_lead_out % 2 == 0 and
                         i == 0 and
                         self._match(burst - space, e_burst)
                     ):
-                        half_bits += [space]
-                        cleaned_lead_out += [e_burst]
+                        half_bits.append(space)
+                        cleaned_lead_out.append(e_burst)
                         break
 
                     if (
-                        i + 1 == len(lead_out) and
+                        i + 1 == num_lead_out and
                         space < 0 and
                         self._match(burst + space, e_burst)
                     ):
-                        half_bits += [space]
-                        cleaned_lead_out += [e_burst]
+                        half_bits.append(space)
+                        cleaned_lead_out.append(e_burst)
                         break
                 else:
+                    if total_time is None:
+                        total_time = sum(
+                            map(abs, islice(code, len(code) - 1))
+                        )
+
                     if self._match(e_burst, total_time + abs(burst)):
-                        cleaned_lead_out += [None]
+                        cleaned_lead_out.append(None)
 
                     elif not cleaned_lead_out:
                         for _, space in bursts:
@@ -301,31 +1430,89 @@ class CodeWrapper(object):
                                 e_burst < 0 > space and
                                 self._match(e_burst, burst - space)
                             ):
-                                cleaned_lead_out += [e_burst]
-                                half_bits += [space]
+                                cleaned_lead_out.append(e_burst)
+                                half_bits.append(space)
                                 break
 
                             if (
                                     e_burst > 0 < space and
                                     self._match(e_burst, burst - space)
                             ):
-                                cleaned_lead_out += [e_burst]
-                                half_bits += [space]
+                                cleaned_lead_out.append(e_burst)
+                                half_bits.append(space)
                                 break
                         else:
-                            raise LeadOutError(
-                                str(burst) + ' : ' + str(lead_out)
-                            )
+                            raise LeadOutError(burst, ':', lead_out)
 
                     else:
                         raise LeadOutError(str(e_burst) + ':' + str(burst))
 
-        code += half_bits[:]
+        if begin != stop:
+            # anything the lead out did not get to stays at the end
+            if consumed < num_lead_out:
+                index = cut + consumed
+                if index == begin and head is not None:
+                    extras.append(head)
+                    index += 1
+
+                extras.extend(islice(code, index, stop))
+
+            stop = cut
+
+            if begin == stop:
+                head = None
+
+        extras.extend(half_bits)
+
+        # what is left is the pulses between begin and stop followed by the
+        # extras. stream is used to walk them and pulse to look ahead.
+        num_middle = stop - begin
+        num_pulses = num_middle + len(extras)
+
+        if head is None:
+            stream = chain(islice(code, begin, stop), extras)
+        else:
+            stream = chain((head,), islice(code, begin + 1, stop), extras)
+
+        def pulse(index):
+            if index >= num_middle:
+                return extras[index - num_middle]
+
+            if index == 0 and head is not None:
+                return head
+
+            return code[begin + index]
+
+        fast = None
+
+        if self._stream_encoding == 'manchester':
+            slicer = get_biphase_slicer(timings, bursts, middle_timings)
+        else:
+            slicer = None
+
+            if self._stream_encoding == 'halfbit' and not middle_timings:
+                if 0 < NUMPY_MIN_PULSES <= num_pulses:
+                    pair_slicer = get_numpy_slicer(timings, bursts)
+                else:
+                    pair_slicer = None
+
+                if pair_slicer is None:
+                    pair_slicer = get_pulse_distance_slicer(timings, bursts)
+
+                if pair_slicer is None:
+                    pair_slicer = get_symbol_slicer(timings, bursts)
+
+                if pair_slicer is not None:
+                    pulses = list(stream)
+                    fast = pair_slicer(pulses, cleaned_code)
+
+                    if fast is None:
+                        stream = iter(pulses)
 
         if self._stream_encoding == 'bit':
             mark, space = bursts
 
-            for burst in code:
+            for burst in stream:
                 multiplier = burst // mark
 
                 if multiplier <= 0:
@@ -339,23 +1526,34 @@ class CodeWrapper(object):
                     timing = mark
 
                 if self._match(burst, timing * multiplier):
-                    cleaned_code += [timing] * multiplier
-                    pairs += [timing] * multiplier
+                    cleaned_code.extend(repeat(timing, multiplier))
+                    pairs.extend(repeat(timing, multiplier))
                 else:
                     raise IRStreamError
 
+        elif fast is not None:
+            pairs, decoded_code, num_bits = fast
+
+        elif slicer is not None:
+            pairs, decoded_code, num_bits = slicer(
+                stream,
+                num_pulses,
+                lead_in,
+                cleaned_code
+            )
+
         elif self._stream_encoding == 'manchester':
             mark, space = bursts[0]
 
-            for i, burst in enumerate(code[:]):
+            for i, burst in enumerate(stream):
                 if self._match(burst, mark):
-                    pairs += [mark]
-                    cleaned_code += [mark]
+                    pairs.append(mark)
+                    cleaned_code.append(mark)
                     continue
 
                 if self._match(burst, space):
-                    pairs += [space]
-                    cleaned_code += [space]
+                    pairs.append(space)
+                    cleaned_code.append(space)
                     continue
 
                 for timing in middle_timings:
@@ -369,43 +1567,43 @@ class CodeWrapper(object):
                         t_mark, t_space = timing['bursts'][0]
 
                         if self._match(burst, t_mark):
-                            pairs += [t_mark]
-                            cleaned_code += [t_mark]
+                            pairs.append(t_mark)
+                            cleaned_code.append(t_mark)
                             break
 
                         if self._match(burst, t_space):
-                            pairs += [t_space]
-                            cleaned_code += [t_space]
+                            pairs.append(t_space)
+                            cleaned_code.append(t_space)
                             break
 
                         if self._match(burst, t_mark * 2):
-                            pairs += [t_mark, t_mark]
-                            cleaned_code += [t_mark, t_mark]
+                            pairs.extend((t_mark, t_mark))
+                            cleaned_code.extend((t_mark, t_mark))
                             break
 
                         if self._match(burst, t_space * 2):
-                            pairs += [t_space, t_space]
-                            cleaned_code += [t_space, t_space]
+                            pairs.extend((t_space, t_space))
+                            cleaned_code.extend((t_space, t_space))
                             break
 
                         if self._match(burst, mark + t_mark):
                             if pairs[-1] == space:
-                                pairs += [mark, t_mark]
-                                cleaned_code += [mark, t_mark]
+                                pairs.extend((mark, t_mark))
+                                cleaned_code.extend((mark, t_mark))
                                 break
                             if pairs[-1] == t_space:
-                                pairs += [t_mark, mark]
-                                cleaned_code += [t_mark, mark]
+                                pairs.extend((t_mark, mark))
+                                cleaned_code.extend((t_mark, mark))
                                 break
 
                         if self._match(burst, space + t_space):
                             if pairs[-1] == mark:
-                                pairs += [space, t_space]
-                                cleaned_code += [space, t_space]
+                                pairs.extend((space, t_space))
+                                cleaned_code.extend((space, t_space))
                                 break
                             if pairs[-1] == t_mark:
-                                pairs += [t_space, space]
-                                cleaned_code += [t_space, space]
+                                pairs.extend((t_space, space))
+                                cleaned_code.extend((t_space, space))
                                 break
 
                 else:
@@ -419,43 +1617,46 @@ class CodeWrapper(object):
                             if cleaned_code[-1] == t_mark:
                                 if self._match(burst, t_space):
                                     middle_timings.remove(timing)
-                                    cleaned_code += [t_space]
+                                    cleaned_code.append(t_space)
                                     break
 
                                 if self._match(burst, t_space * 2):
-                                    pairs += [t_space]
+                                    pairs.append(t_space)
                                     middle_timings.remove(timing)
-                                    cleaned_code += [t_space, t_space]
+                                    cleaned_code.extend((t_space, t_space))
                                     break
 
                                 if self._match(burst, space + t_space):
+                                    if not pairs:
+                                        raise IRStreamError
+
                                     middle_timings.remove(timing)
                                     if pairs[-1] == mark:
-                                        pairs += [space]
-                                        cleaned_code += [space, t_space]
+                                        pairs.append(space)
+                                        cleaned_code.extend((space, t_space))
                                     else:
-                                        pairs += [space]
-                                        cleaned_code += [t_space, space]
+                                        pairs.append(space)
+                                        cleaned_code.extend((t_space, space))
                                     break
 
                             if self._match(burst, t_mark):
-                                if self._match(code[i + 1], t_space):
-                                    cleaned_code += [t_mark]
+                                if self._match(pulse(i + 1), t_space):
+                                    cleaned_code.append(t_mark)
                                     break
 
-                                if self._match(code[i + 1], t_space + space):
-                                    cleaned_code += [t_mark]
+                                if self._match(pulse(i + 1), t_space + space):
+                                    cleaned_code.append(t_mark)
                                     break
 
                             if self._match(burst, t_mark + mark):
-                                if self._match(code[i + 1], t_space):
-                                    cleaned_code += [mark, t_mark]
-                                    pairs += [mark]
+                                if self._match(pulse(i + 1), t_space):
+                                    cleaned_code.extend((mark, t_mark))
+                                    pairs.append(mark)
                                     break
 
-                                if self._match(code[i + 1], t_space + space):
-                                    cleaned_code += [mark, t_mark]
-                                    pairs += [mark]
+                                if self._match(pulse(i + 1), t_space + space):
+                                    cleaned_code.extend((mark, t_mark))
+                                    pairs.append(mark)
                                     break
 
                             else:
@@ -464,47 +1665,47 @@ class CodeWrapper(object):
                             break
                         elif self._match(burst, timing):
                             middle_timings.remove(timing)
-                            cleaned_code += [timing]
+                            cleaned_code.append(timing)
                             break
 
                         elif timing < 0 > mark or timing > 0 < mark:
                             if self._match(burst, timing + mark):
-                                pairs += [mark]
-                                cleaned_code += [mark, timing]
+                                pairs.append(mark)
+                                cleaned_code.extend((mark, timing))
                                 middle_timings.remove(timing)
                                 break
 
                             if self._match(burst, timing + (mark * 2)):
-                                pairs += [mark, mark]
-                                cleaned_code += [mark, timing, mark]
+                                pairs.extend((mark, mark))
+                                cleaned_code.extend((mark, timing, mark))
                                 middle_timings.remove(timing)
                                 break
 
                         elif timing < 0 > space or timing > 0 < space:
                             if self._match(burst, timing + space):
-                                pairs += [space]
-                                cleaned_code += [space, timing]
+                                pairs.append(space)
+                                cleaned_code.extend((space, timing))
                                 middle_timings.remove(timing)
                                 break
 
                             if self._match(burst, timing + (space * 2)):
-                                pairs += [space, space]
-                                cleaned_code += [space, timing, space]
+                                pairs.extend((space, space))
+                                cleaned_code.extend((space, timing, space))
                                 middle_timings.remove(timing)
                                 break
                     else:
                         if self._match(burst, mark * 2):
-                            pairs += [mark, mark]
-                            cleaned_code += [mark, mark]
+                            pairs.extend((mark, mark))
+                            cleaned_code.extend((mark, mark))
 
                         elif self._match(burst, space * 2):
-                            pairs += [space, space]
-                            cleaned_code += [space, space]
+                            pairs.extend((space, space))
+                            cleaned_code.extend((space, space))
                         else:
                             if (
                                 lead_in and
                                 lead_in[-1] == -999999999999 and
-                                i + 1 == len(code)
+                                i + 1 == num_pulses
                             ):
                                 if len(pairs) % 2:
                                     for mark, space in bursts:
@@ -512,20 +1713,17 @@ class CodeWrapper(object):
                                             continue
 
                                         if mark == pairs[-1]:
-                                            pairs += [space]
-                                            cleaned_code += [
-                                                space,
-                                                burst - space
-                                            ]
+                                            pairs.append(space)
+                                            cleaned_code.extend(
+                                                (space, burst - space)
+                                            )
                                             break
                                     else:
                                         raise IRStreamError
                                 else:
-                                    cleaned_code += [space, burst]
+                                    cleaned_code.extend((space, burst))
                             else:
-                                raise IRStreamError(str(burst))
-
-            tmp = []
+                                raise IRStreamError(burst)
 
             extra_timings = list(
                 timing['bursts'] for timing in middle_timings
@@ -534,20 +1732,21 @@ class CodeWrapper(object):
             if extra_timings:
                 extra_timings = extra_timings[0]
 
-            for i in range(0, len(pairs), 2):
-                mark = pairs[i]
+            flat_pairs = pairs
+            pairs = []
+
+            for i in range(0, len(flat_pairs), 2):
+                mark = flat_pairs[i]
                 try:
-                    space = pairs[i + 1]
+                    space = flat_pairs[i + 1]
                     if [mark, space] in extra_timings:
                         mark, space = bursts[
                             extra_timings.index([mark, space])
                         ]
 
-                    tmp += [[mark, space]]
+                    pairs.append([mark, space])
                 except IndexError:
-                    tmp += [[mark]]
-
-            pairs = tmp[:]
+                    pairs.append([mark])
 
         else:
 
@@ -556,7 +1755,7 @@ class CodeWrapper(object):
                 def _check_timing():
                     if (
                         self._match(burst, m) and
-                        self._match(code[i + 1], s)
+                        self._match(pulse(i + 1), s)
                     ):
                         cleaned_code.append(m)
                         return True
@@ -572,7 +1771,7 @@ class CodeWrapper(object):
 
                     if (
                         self._match(burst, m + space) and
-                        self._match(code[i + 1], s) and
+                        self._match(pulse(i + 1), s) and
                         len(pairs[-1]) == 1
                     ):
                         pairs[-1].append(space)
@@ -657,9 +1856,9 @@ class CodeWrapper(object):
 
                 return False
 
-            for i, burst in enumerate(code):
+            for i, burst in enumerate(stream):
                 for mark, space in bursts:
-                    if len(pairs) > 0:
+                    if pairs and middle_timings:
                         try:
                             if _check_middles():
                                 break
@@ -668,77 +1867,95 @@ class CodeWrapper(object):
 
                     if self._match(burst, mark):
                         if pairs and len(pairs[-1]) == 1:
-                            pairs[-1] += [mark]
+                            pairs[-1].append(mark)
                         else:
-                            pairs += [[mark]]
+                            pairs.append([mark])
 
-                        cleaned_code += [mark]
+                        cleaned_code.append(mark)
                         break
                     if self._match(burst, space):
                         if pairs and len(pairs[-1]) == 1:
-                            pairs[-1] += [space]
+                            pairs[-1].append(space)
                         else:
-                            pairs += [[space]]
+                            pairs.append([space])
 
-                        cleaned_code += [space]
+                        cleaned_code.append(space)
                         break
 
                 else:
-                    raise IRStreamError(str(code))
-
-        for i, bp in enumerate(pairs):
-            if self._stream_encoding != 'bit' and len(bp) == 1:
-                if i + 1 == len(pairs):
-                    for mark, space in bursts:
-                        if bp[0] == mark:
-                            bp += [space]
-                            cleaned_code += [space]
-                            break
+                    raise IRStreamError(
+                        [pulse(index) for index in range(num_pulses)]
+                    )
+
+        # the bits get shifted into a single integer in the order they are
+        # received, the first bit ends up being the most significant one
+        if decoded_code is None:
+            bit_mask = (1 << bit_width) - 1
+            decoded_code = 0
+            num_bits = 0
+            last_pair = len(pairs) - 1
+
+            for i, bp in enumerate(pairs):
+                if self._stream_encoding != 'bit' and len(bp) == 1:
+                    if i == last_pair:
+                        for mark, space in bursts:
+                            if bp[0] == mark:
+                                bp.append(space)
+                                cleaned_code.append(space)
+                                break
+                        else:
+                            raise IRStreamError
                     else:
                         raise IRStreamError
-                else:
-                    raise IRStreamError
 
-            if bp in bursts:
-                if len(bursts) == 2:
-                    decoded_code += [bursts.index(bp)]
-                elif len(bursts) == 4:
-                    num = bursts.index(bp)
-                    decoded_code += [num >> 1 & 1, num & 1]
-                else:
+                try:
                     num = bursts.index(bp)
-                    decoded_code += [
-                        num >> 3 & 1,
-                        num >> 2 & 1,
-                        num >> 1 & 1,
-                        num & 1
-                    ]
-            else:
-                raise IRStreamError(str(pairs))
+                except ValueError:
+                    raise IRStreamError(pairs)
+
+                decoded_code = decoded_code << bit_width | num & bit_mask
+                num_bits += bit_width
+
+        if None in cleaned_lead_out[:-1]:
+            # only the last pulse of the lead out is able to stand in for
+            # the total time of the frame
+            raise LeadOutError
 
-        self._code = []
-        cleaned_code += cleaned_lead_out
+        cleaned_code.extend(cleaned_lead_out)
 
         if not cleaned_code:
             raise IRStreamError
 
         if cleaned_code[-1] is None:
             total_time = -self._lead_out[-1]
-            total_time += sum(abs(item) for item in cleaned_code[:-1])
+            total_time += sum(
+                map(abs, islice(cleaned_code, len(cleaned_code) - 1))
+            )
             cleaned_code[-1] = total_time
 
-        for pulse in cleaned_code:
+        # pulses with the same sign get merged together, this is done in
+        # place with count being the number of merged pulses
+        count = 0
+        for item in cleaned_code:
             if (
-                len(self._code) and
-                (self._code[-1] < 0 > pulse or self._code[-1] > 0 < pulse)
+                count and
+                (
+                    cleaned_code[count - 1] < 0 > item or
+                    cleaned_code[count - 1] > 0 < item
+                )
             ):
-                self._code[-1] += pulse
+                cleaned_code[count - 1] += item
                 continue
 
-            self._code += [pulse]
+            cleaned_code[count] = item
+            count += 1
+
+        del cleaned_code[count:]
 
-        self._stream_pairs = pairs[:]
-        self._decoded_code = decoded_code[:]
+        self._code = cleaned_code
+        self._stream_pairs = pairs
+        self._decoded_code = decoded_code
+        self._num_bits = num_bits
 
     def _match_pair(self, mark, space, expected_mark, expected_space):
         return (
@@ -753,20 +1970,7 @@ class CodeWrapper(object):
         ):
             return False
 
-        high = math.floor(
-            expected_timing_value +
-            (expected_timing_value * (self._tolerance / 100.0))
-        )
-        low = math.floor(
-            expected_timing_value -
-            (expected_timing_value * (self._tolerance / 100.0))
-        )
-
-        # do a flip flop of the high and low so the same expression can
-        # be used when evaluating a raw timing
-        if expected_timing_value < 0:
-            low, high = high, low
-
+        low, high = self._timings[expected_timing_value]
         return low <= value <= high
 
     def __iter__(self):
@@ -777,16 +1981,17 @@ class CodeWrapper(object):
         return self._code[item]
 
     def get_value(self, start_bit, stop_bit):
-        bits = self._decoded_code[start_bit: stop_bit + 1]
+        # same bits as slicing a list of the bits would give
+        bits = range(self._num_bits)[start_bit: stop_bit + 1]
 
-        res = 0
+        if bits:
+            res = self._decoded_code >> (self._num_bits - 1 - bits[-1])
+            res &= (1 << len(bits)) - 1
 
-        if self._encoding.startswith('lsb'):
-            for i, item in enumerate(bits):
-                res |= item << i
+            if self._encoding.startswith('lsb'):
+                res = _reverse_bits(res, len(bits))
         else:
-            for i, item in enumerate(bits):
-                res |= item << ~i + len(bits)
+            res = 0
 
         return integer_wrapper.IntegerWrapper(
             res,
@@ -795,6 +2000,16 @@ class CodeWrapper(object):
             self._encoding
         )
 
+    def get_values(self, extractors, params):
+        return extract_values(
+            extractors,
+            self._decoded_code,
+            self._num_bits,
+            self._encoding,
+            self._bursts,
+            params
+        )
+
     @staticmethod
     def _set_bit(value, bit_num, state):
         if state:
@@ -822,11 +2037,18 @@ class CodeWrapper(object):
 
     @property
     def num_bits(self):
-        return len(self._decoded_code)
+        return self._num_bits
+
+    @property
+    def value(self):
+        return self._decoded_code
 
     @property
     def bits(self):
-        return self._decoded_code[:]
+        return [
+            self._decoded_code >> i & 1
+            for i in range(self._num_bits - 1, -1, -1)
+        ]
 
     def get_burst_pair(self, index):
         return self._stream_pairs[index]
@@ -0,0 +1,918 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in 
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN 
+# THE SOFTWARE.
+
+# ****************************************************************************
+
+
+# The first pulse of a frame is almost always the mark of a protocol's lead
+# in. Knowing that, we are able to throw away most of the decoders before
+# trying any of them. The first pulse gets quantized into a bucket and each
+# bucket holds the decoders that are able to accept a first pulse that falls
+# into it. Decoders that are not able to tell us what their first pulse
+# looks like get added to every bucket.
+#
+# The carrier frequency works the same way. The frequency ranges of the
+# decoders cut the frequencies into slots where the same decoders match and
+# the candidates of a bucket get filtered once for each slot.
+
+import bisect
+import collections
+import itertools
+import threading
+
+from . import code_wrapper
+
+
+# width of a bucket in microseconds
+QUANTUM = 100
+
+# cap on the number of bucket and frequency slot pairs the candidates are
+# kept for, past it they get worked out every time
+MAX_FREQUENCY_SLOTS = 4096
+
+# longest pulse in microseconds that is given any meaning when working out
+# which decoders are able to handle a frame
+MAX_PULSE = 65000
+
+
+# a lead in or lead out pulse is able to run into the burst next to it
+# even when the two have different signs, each of those spots is allowed
+# one pulse less than the signs of the timings say
+SHAPE_SLACK = 3
+
+# what a frame has to look like for a decoder to be able to accept it.
+# durations are the sum of every pulse but the last one, the last pulse is
+# the gap after the frame and that is never reliable.
+# first_pulse is the (low, high) ranges the first pulse has to land in.
+Shape = collections.namedtuple(
+    'Shape',
+    ['min_pulses', 'max_pulses', 'min_duration', 'max_duration', 'first_pulse']
+)
+
+
+def _runs(timings, sign=0):
+    # number of pulses the timings make when the ones next to each other
+    # that have the same sign get joined
+    runs = 0
+    for timing in timings:
+        if (timing > 0) != (sign > 0) or sign == 0:
+            runs += 1
+        sign = timing
+
+    return runs, sign
+
+
+def _template_shape(lead_in, bursts, lead_out, bit_count):
+    if not lead_out or -999999999999 in lead_out:
+        return None
+
+    # a positive last timing is the length of the whole frame, what it
+    # stands for is the space that pads the frame out to that length
+    lead_out = lead_out[:-1] + [-abs(lead_out[-1])]
+
+    if bursts:
+        if not all(isinstance(burst, list) and burst for burst in bursts):
+            return None
+
+        if len(bursts) == 2:
+            bit_width = 1
+        elif len(bursts) == 4:
+            bit_width = 2
+        else:
+            bit_width = 4
+
+        if bit_count <= 0 or bit_count % bit_width:
+            return None
+
+        num_bursts = bit_count // bit_width
+    else:
+        num_bursts = 0
+
+    # the fewest pulses the frame is able to be made of, every burst can
+    # end with a different sign so both get carried along
+    runs, sign = _runs(lead_in)
+    fewest = {sign > 0: runs} if lead_in else {None: 0}
+
+    for _ in range(num_bursts):
+        next_fewest = {}
+        for last, count in fewest.items():
+            for burst in bursts:
+                if last is None:
+                    added, end = _runs(burst)
+                else:
+                    added, end = _runs(burst, 1 if last else -1)
+
+                key = end > 0
+                if key not in next_fewest or count + added < next_fewest[key]:
+                    next_fewest[key] = count + added
+
+        fewest = next_fewest
+
+    min_pulses = min(
+        count + _runs(lead_out, 0 if last is None else (1 if last else -1))[0]
+        for last, count in fewest.items()
+    )
+
+    max_burst = max(len(burst) for burst in bursts) if bursts else 0
+    max_pulses = len(lead_in) + num_bursts * max_burst + len(lead_out)
+
+    fixed = sum(abs(timing) for timing in lead_in + lead_out[:-1])
+
+    if bursts:
+        burst_times = [
+            sum(abs(timing) for timing in burst) for burst in bursts
+        ]
+    else:
+        burst_times = [0]
+
+    # the last pulse is able to hold the timing that comes before the lead
+    # out's last timing if the two run into each other
+    if len(lead_out) > 1:
+        joined = abs(lead_out[-2])
+    elif num_bursts:
+        joined = max(abs(burst[-1]) for burst in bursts)
+    elif lead_in:
+        joined = abs(lead_in[-1])
+    else:
+        joined = 0
+
+    return Shape(
+        max(min_pulses - SHAPE_SLACK, 1),
+        max_pulses,
+        max(fixed + num_bursts * min(burst_times) - joined, 0),
+        fixed + num_bursts * max(burst_times),
+        None
+    )
+
+
+def build_shapes(cls):
+    """
+    Works out the shapes of the frames a protocol's decoder accepts.
+
+    A frame has to fit one of the shapes, protocols that have a repeat
+    frame get a shape for it. None gets returned for protocols that decode
+    frames their own way or have frames that no shape is able to be worked
+    out for.
+    """
+    # noinspection PyProtectedMember
+    if not cls._static_shape or cls._middle_timings:
+        return None
+
+    # noinspection PyProtectedMember
+    shapes = [
+        _template_shape(
+            cls._lead_in[:],
+            cls._bursts,
+            cls._lead_out[:],
+            cls.bit_count
+        )
+    ]
+
+    # noinspection PyProtectedMember
+    if cls._repeat_lead_in or cls._repeat_lead_out:
+        # the number of bits in a repeat frame is not checked
+        # noinspection PyProtectedMember
+        if cls._repeat_bursts:
+            return None
+
+        # noinspection PyProtectedMember
+        shapes.append(
+            _template_shape(
+                cls._repeat_lead_in[:],
+                [],
+                cls._repeat_lead_out[:],
+                0
+            )
+        )
+
+    if None in shapes:
+        return None
+
+    return tuple(shapes)
+
+
+def _bucket(pulse):
+    if pulse > MAX_PULSE:
+        pulse = MAX_PULSE
+    elif pulse < -MAX_PULSE:
+        pulse = -MAX_PULSE
+
+    return pulse // QUANTUM
+
+
+class LeadInIndex(object):
+
+    def __init__(self, decoders=()):
+        self._lock = threading.RLock()
+        self._order = {}
+        self._keys = {}
+        self._buckets = {}
+        self._wildcards = set()
+        self._candidates = {}
+        self._frequencies = None
+        self._frequency_candidates = {}
+
+        for decoder in decoders:
+            self.add(decoder)
+
+    def add(self, decoder):
+        with self._lock:
+            if decoder not in self._order:
+                self._order[decoder] = len(self._order)
+
+            self.update(decoder)
+
+    def update(self, decoder):
+        """
+        Re-evaluates the buckets a decoder belongs to.
+
+        This gets called when the enabled state, the tolerance or the
+        frequency tolerance of a decoder changes.
+        """
+        with self._lock:
+            if decoder not in self._order:
+                return
+
+            self._frequencies = None
+            self._frequency_candidates.clear()
+
+            old_keys = self._keys.pop(decoder, ())
+            was_wildcard = decoder in self._wildcards
+
+            if old_keys is None:
+                self._wildcards.discard(decoder)
+            else:
+                for key in old_keys:
+                    bucket = self._buckets[key]
+                    bucket.discard(decoder)
+                    if not bucket:
+                        del self._buckets[key]
+
+            if not decoder.enabled:
+                keys = ()
+            else:
+                # noinspection PyProtectedMember
+                bounds = decoder._first_pulse_bounds()
+
+                if bounds is None:
+                    keys = None
+                else:
+                    keys = set()
+                    for low, high in bounds:
+                        keys.update(range(_bucket(low), _bucket(high) + 1))
+
+            self._keys[decoder] = keys
+
+            if keys is None:
+                self._wildcards.add(decoder)
+            else:
+                for key in keys:
+                    self._buckets.setdefault(key, set()).add(decoder)
+
+            if was_wildcard or keys is None:
+                self._candidates.clear()
+            else:
+                for key in old_keys:
+                    self._candidates.pop(key, None)
+                for key in keys:
+                    self._candidates.pop(key, None)
+
+    def candidates(self, pulse, frequency=0):
+        """
+        Decoders able to accept a frame that starts with the given pulse.
+
+        :param frequency: only the decoders that match the frequency are
+            handed back if it is not 0.
+        :return: tuple of decoders in the order they were added.
+        """
+        key = _bucket(pulse)
+
+        if frequency:
+            return self._frequency_slot(key, pulse, frequency)
+
+        try:
+            return self._candidates[key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            decoders = self._wildcards.union(self._buckets.get(key, ()))
+            res = tuple(sorted(decoders, key=self._order.get))
+            self._candidates[key] = res
+
+        return res
+
+    def _frequency_slot(self, key, pulse, frequency):
+        frequencies = self._frequencies
+
+        if frequencies is None:
+            with self._lock:
+                bounds = set()
+                for decoder in self._order:
+                    bounds.update(
+                        code_wrapper.timing_bounds(
+                            decoder.frequency,
+                            decoder.frequency_tolerance
+                        )
+                    )
+
+                frequencies = self._frequencies = sorted(bounds)
+
+        # a frequency that is one of the bounds gets a slot of its own, the
+        # frequencies between two bounds share one
+        index = bisect.bisect_left(frequencies, frequency)
+        slot = index * 2
+
+        if index < len(frequencies) and frequencies[index] == frequency:
+            slot += 1
+
+        try:
+            return self._frequency_candidates[key, slot]
+        except KeyError:
+            pass
+
+        with self._lock:
+            res = tuple(
+                decoder for decoder in self.candidates(pulse)
+                if decoder.frequency_match(frequency)
+            )
+
+            if len(self._frequency_candidates) < MAX_FREQUENCY_SLOTS:
+                self._frequency_candidates[key, slot] = res
+
+        return res
+
+    def reorder(self, decoders):
+        """
+        Changes the order candidates hands back the decoders in.
+
+        :param decoders: the decoders in the order they should be tried.
+        """
+        with self._lock:
+            order = dict((decoder, i) for i, decoder in enumerate(decoders))
+
+            # decoders that are not in the list keep their place behind the
+            # ones that are
+            for decoder in sorted(self._order, key=self._order.get):
+                if decoder not in order:
+                    order[decoder] = len(order)
+
+            self._order = order
+            self._candidates.clear()
+            self._frequency_candidates.clear()
+
+
+# The decoder scan tries the candidates for a frame one after the other
+# until one of them accepts it. Most installations only ever see a handful
+# of protocols, so the decoders that have accepted frames lately are able
+# to be moved to the front. Every decoder has a score. The hits since the
+# last reorder get added to it and the score is decayed every time the
+# order is worked out again. Ties keep the order the decoders were added in.
+#
+# Some frames are accepted by more than one decoder and the first one that
+# is tried wins. Moving decoders around changes which one that is, so the
+# order only gets used when it is turned on.
+
+# the order gets worked out again after this many frames have gone through
+# the decoder scan
+REORDER_INTERVAL = 64
+
+# what is left of a score every time the order is worked out again
+HIT_DECAY = 0.5
+
+
+class DecoderStats(object):
+    """
+    Hit and attempt counters of the decoders.
+
+    None of the methods lock anything, the caller holds the lock that
+    guards the decoder scan.
+    """
+
+    def __init__(self, decoders=()):
+        self._decoders = list(decoders)
+        self._hits = dict.fromkeys(self._decoders, 0)
+        self._attempts = dict.fromkeys(self._decoders, 0)
+        self._scores = dict.fromkeys(self._decoders, 0.0)
+        self._recent = {}
+        self._order = self._decoders[:]
+        self._frames = 0
+
+    @property
+    def order(self):
+        return self._order[:]
+
+    def attempt(self, decoder):
+        self._attempts[decoder] += 1
+
+    def hit(self, decoder):
+        self._hits[decoder] += 1
+        self._recent[decoder] = self._recent.get(decoder, 0) + 1
+
+    def frame_done(self):
+        """
+        Counts a frame that went through the decoder scan.
+
+        :return: the decoders in the order they should be tried when that
+            has changed, otherwise None.
+        """
+        self._frames += 1
+
+        if self._frames % REORDER_INTERVAL:
+            return None
+
+        scores = self._scores
+        recent = self._recent
+        self._recent = {}
+
+        for decoder in self._decoders:
+            scores[decoder] = (
+                scores[decoder] * HIT_DECAY + recent.get(decoder, 0)
+            )
+
+        position = dict(
+            (decoder, i) for i, decoder in enumerate(self._decoders)
+        )
+        order = sorted(
+            self._decoders,
+            key=lambda item: (-scores[item], position[item])
+        )
+
+        if order == self._order:
+            return None
+
+        self._order = order
+        return order
+
+    @property
+    def stats(self):
+        """
+        :return: dict of decoder name -> dict(hits, attempts, score, rank).
+        """
+        rank = dict((decoder, i) for i, decoder in enumerate(self._order))
+
+        return dict(
+            (
+                decoder.name,
+                dict(
+                    hits=self._hits[decoder],
+                    attempts=self._attempts[decoder],
+                    score=self._scores[decoder],
+                    rank=rank[decoder]
+                )
+            )
+            for decoder in self._decoders
+        )
+
+
+# Saved codes get looked up by a fingerprint. The fingerprint of a saved code
+# is the normalized rlc itself. When a frame comes in every pulse gets
+# quantized into the normalized timing it is within the tolerance of, that
+# gives us the fingerprint of the saved code the frame belongs to. Only the
+# codes that are found that way get compared pulse by pulse.
+
+# a frame that has this many possible fingerprints or more (because of
+# timings overlapping each other) gets compared against every saved code
+MAX_PROBES = 64
+
+
+class SavedCodeIndex(object):
+
+    def __init__(self, decoder, codes):
+        self._decoder = decoder
+        self._codes = codes
+        self._lock = threading.RLock()
+        self._names = {}
+        self._fingerprints = {}
+        self._timing_counts = {}
+        self._count = 0
+        self._tolerance = None
+        self._boundaries = []
+        self._points = []
+        self._gaps = []
+
+    def add(self, code):
+        """
+        Saves a code unless a code equal to it has already been saved.
+        """
+        with self._lock:
+            name = str(code)
+
+            if name in self._names:
+                return
+
+            # only codes made up of a single frame are able to match a
+            # frame, the rest are saved without a fingerprint
+            rlc = code._normalized_rlc
+            if len(rlc) == 1:
+                fingerprint = tuple(rlc[0])
+            else:
+                fingerprint = None
+
+            self._names[name] = (code, fingerprint)
+            self._codes.append(code)
+
+            if fingerprint is not None:
+                self._fingerprints.setdefault(fingerprint, []).append(
+                    (self._count, code)
+                )
+
+                for timing in fingerprint:
+                    if timing not in self._timing_counts:
+                        self._timing_counts[timing] = 0
+                        # a new timing means rebuilding the quantizer
+                        self._tolerance = None
+
+                    self._timing_counts[timing] += 1
+
+            self._count += 1
+
+    def remove(self, code):
+        with self._lock:
+            code, fingerprint = self._names.pop(str(code), (None, None))
+
+            if code is None:
+                return
+
+            for i, saved_code in enumerate(self._codes):
+                if saved_code is code:
+                    del self._codes[i]
+                    break
+
+            if fingerprint is not None:
+                codes = self._fingerprints[fingerprint]
+
+                for i, (_, saved_code) in enumerate(codes):
+                    if saved_code is code:
+                        del codes[i]
+                        break
+
+                if not codes:
+                    self._fingerprints.pop(fingerprint, None)
+
+                for timing in fingerprint:
+                    self._timing_counts[timing] -= 1
+
+                    if not self._timing_counts[timing]:
+                        del self._timing_counts[timing]
+                        self._tolerance = None
+
+    def get(self, name):
+        """
+        Returns the saved code that goes by name or None.
+        """
+        with self._lock:
+            entry = self._names.get(name)
+
+        if entry is None:
+            return None
+
+        return entry[0]
+
+    def rename(self, code, name):
+        """
+        Changes the name of a code, the name is what a saved code is
+        looked up by.
+        """
+        with self._lock:
+            old_name = str(code)
+            code._name = name
+
+            entry = self._names.get(old_name)
+
+            if entry is not None and entry[0] is code:
+                del self._names[old_name]
+                self._names.setdefault(str(code), entry)
+
+    def _build(self, tolerance):
+        # the bounds of every timing get turned into points on a line.
+        # a pulse either lands on one of those points or in the gap
+        # between two of them and each point and gap knows the timings
+        # that a pulse landing there is a match for.
+        # noinspection PyProtectedMember
+        bounds = {
+            timing: self._decoder._bounds(timing)
+            for timing in self._timing_counts
+        }
+
+        boundaries = sorted(
+            set(low for low, _ in bounds.values()) |
+            set(high for _, high in bounds.values())
+        )
+
+        points = []
+        for point in boundaries:
+            points.append(tuple(
+                timing for timing, (low, high) in bounds.items()
+                if low <= point <= high
+            ))
+
+        gaps = [()]
+        for low_point, high_point in zip(boundaries, boundaries[1:]):
+            gaps.append(tuple(
+                timing for timing, (low, high) in bounds.items()
+                if low <= low_point and high_point <= high
+            ))
+        gaps.append(())
+
+        self._boundaries = boundaries
+        self._points = points
+        self._gaps = gaps
+        self._tolerance = tolerance
+
+    def _timings(self, pulse):
+        boundaries = self._boundaries
+        i = bisect.bisect_left(boundaries, pulse)
+
+        if i < len(boundaries) and boundaries[i] == pulse:
+            return self._points[i]
+
+        return self._gaps[i]
+
+    def find(self, data):
+        """
+        Locates the first saved code that matches a frame.
+
+        :return: the saved code or None.
+        """
+        if not self._codes:
+            return None
+
+        if not data or isinstance(data[0], list):
+            for code in self._codes:
+                if code == data:
+                    return code
+
+            return None
+
+        with self._lock:
+            if not self._fingerprints:
+                return None
+
+            # noinspection PyProtectedMember
+            tolerance = self._decoder._tolerance
+            if self._tolerance != tolerance:
+                self._build(tolerance)
+
+            choices = []
+            num_probes = 1
+
+            for pulse in data:
+                timings = self._timings(pulse)
+                if not timings:
+                    return None
+
+                choices.append(timings)
+                num_probes *= len(timings)
+
+            if num_probes == 1:
+                found = self._fingerprints.get(
+                    tuple(timings[0] for timings in choices),
+                    []
+                )
+            elif num_probes < MAX_PROBES:
+                found = []
+                for fingerprint in itertools.product(*choices):
+                    found.extend(self._fingerprints.get(fingerprint, []))
+            else:
+                found = list(
+                    itertools.chain.from_iterable(self._fingerprints.values())
+                )
+
+            for _, code in sorted(found, key=lambda item: item[0]):
+                if code == data:
+                    return code
+
+        return None
+
+
+class RepeatMatcher(object):
+    """
+    Recognizes the frames that repeat the last decoded code.
+
+    A frame is a repeat when it is the same as the only frame of the code
+    or when it is the repeat frame of the code's protocol. The bounds of
+    every pulse get worked out once when the matcher is made so matching
+    a frame is a single pass over it.
+    """
+
+    def __init__(self, code):
+        # noinspection PyProtectedMember
+        decoder = code._decoder
+
+        self.code = code
+        self.tolerance = decoder.tolerance
+        self._decoder = decoder
+
+        # noinspection PyProtectedMember
+        rlc = code._normalized_rlc
+
+        # some decoders add the frames that follow to the code they
+        # handed back, the matcher is only good for as many frames as the
+        # code had when it was made
+        self._rlc = rlc
+        self._num_frames = len(rlc)
+
+        if len(rlc) == 1:
+            self._frame = self._compile(rlc[0])
+        else:
+            self._frame = None
+
+        self._repeat = None
+        self._total_time = None
+
+        # noinspection PyProtectedMember
+        if (
+            decoder._static_repeat and
+            not decoder._repeat_bursts and
+            (decoder._repeat_lead_in or decoder._repeat_lead_out)
+        ):
+            # noinspection PyProtectedMember
+            template = decoder._repeat_lead_in + decoder._repeat_lead_out
+
+            # a positive last timing is the length of the whole frame
+            if template[-1] > 0:
+                self._total_time = template[-1]
+
+            self._repeat = self._compile(template)
+
+    def _compile(self, rlc):
+        # noinspection PyProtectedMember
+        bounds = [self._decoder._bounds(timing) for timing in rlc]
+        return (
+            tuple(low for low, _ in bounds),
+            tuple(high for _, high in bounds)
+        )
+
+    def is_current(self, code):
+        # noinspection PyProtectedMember
+        return (
+            code is self.code and
+            code._normalized_rlc is self._rlc and
+            len(self._rlc) == self._num_frames and
+            self._decoder.tolerance == self.tolerance
+        )
+
+    def match_frame(self, data):
+        """
+        Same result as comparing the frame to the code with ==.
+        """
+        if self._frame is None:
+            return False
+
+        lows, highs = self._frame
+
+        if len(data) != len(lows):
+            return False
+
+        for pulse, low, high in zip(data, lows, highs):
+            if not low <= pulse <= high:
+                return False
+
+        return True
+
+    def match_repeat(self, data):
+        """
+        Checks a frame against the repeat frame of the code's protocol.
+
+        Only frames that match every timing of the repeat frame get
+        accepted, a frame that is not a clean match is left for the
+        decoder to sort out.
+        """
+        if self._repeat is None:
+            return False
+
+        lows, highs = self._repeat
+
+        if len(data) != len(lows):
+            return False
+
+        last = len(data) - 1
+
+        for i, (pulse, low, high) in enumerate(zip(data, lows, highs)):
+            if low <= pulse <= high:
+                continue
+
+            if i != last or self._total_time is None:
+                return False
+
+            # the frame gets padded out to a fixed length, the last pulse
+            # is the rest of that length
+            total_time = 0
+            for item in itertools.islice(data, last):
+                total_time += abs(item)
+
+            # noinspection PyProtectedMember
+            low, high = self._decoder._bounds(total_time + abs(pulse))
+
+            if not low <= self._total_time <= high:
+                return False
+
+        return True
+
+
+def _freeze(timings):
+    if isinstance(timings, (list, tuple)):
+        return tuple(_freeze(timing) for timing in timings)
+
+    if isinstance(timings, dict):
+        return tuple(
+            sorted((key, _freeze(value)) for key, value in timings.items())
+        )
+
+    return timings
+
+
+class WrapCache(object):
+    """
+    Holds the frame being scanned wrapped for protocols that share their
+    framing.
+
+    Protocols with the same encoding, lead in, lead out, middle timings and
+    bursts turn a frame into the same bits, they only differ in the bit
+    count, the parameters or the checksum. While a frame goes through the
+    decoder scan the wrapped frame, or the class and arguments of the error
+    wrapping it raised, is kept so the next protocol in the group is able
+    to use it instead of wrapping the frame again.
+
+    Every set of decoders has a cache of its own and the scan it belongs to
+    holds the lock that guards it. Nothing is kept once the scan is done.
+    """
+
+    _groups = {}
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self._frame = None
+        self._wrapped = {}
+
+    @classmethod
+    def group(cls, protocol):
+        """
+        Number that is the same for protocols that share their framing.
+        """
+        key = _freeze((
+            protocol.encoding,
+            protocol._lead_in,
+            protocol._lead_out,
+            protocol._middle_timings,
+            protocol._bursts
+        ))
+
+        with cls._lock:
+            return cls._groups.setdefault(key, len(cls._groups))
+
+    def scan(self, data):
+        """
+        Starts the scan of a frame, used as a context manager.
+
+        The frame is held on to by identity, it must not be changed until
+        the scan is done.
+        """
+        self._frame = data
+        self._wrapped = {}
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._frame = None
+        self._wrapped = {}
+
+    def get(self, data, key):
+        """
+        :return: the wrapped frame, an (error class, arguments) tuple or
+            None if the frame is not the one being scanned or has not been
+            wrapped for the key.
+        """
+        if data is not self._frame:
+            return None
+
+        return self._wrapped.get(key, None)
+
+    def put(self, data, key, wrapped):
+        if data is self._frame:
+            self._wrapped[key] = wrapped
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in 
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN 
+# THE SOFTWARE.
+
+# ****************************************************************************
+
+
+# Every pulse of a frame gets turned into a character once. The characters
+# are the spaces between the edges of the tolerance bands of every timing
+# the protocols use, so a timing of a protocol is a range of characters.
+# The frames a protocol's template describes are then a regular expression
+# over those characters and checking a frame against a protocol is done by
+# the re module instead of matching one pulse at a time in python.
+#
+# A pattern only ever rules a frame out when the protocol's decoder would
+# reject it as well, it does not decode anything. Protocols where pulses are
+# able to run into each other do not get a pattern, frames that have pulses
+# of the same sign next to each other get handed to the decoders as is and
+# the pulses of the lead out are not checked.
+
+import bisect
+import re
+import threading
+
+from . import code_wrapper
+
+
+# the characters start here so none of them have a meaning in a pattern
+_FIRST_CHAR = 0x100
+
+# cap on the number of pulses the character map of a set of patterns will
+# remember, pulses past it get looked up every time they come in
+MAX_SYMBOLS = 4096
+
+
+def _alternates(timings):
+    return all(
+        (timing > 0) != (next_timing > 0)
+        for timing, next_timing in zip(timings, timings[1:])
+    )
+
+
+def build_template(cls):
+    """
+    Works out the template a protocol's frames follow pulse by pulse.
+
+    :return: None for protocols that have no template or a tuple of
+        (lead_in, bursts, num_bursts, num_lead_out) templates. lead_in holds
+        the timings each lead in pulse is able to be, there is a second
+        template for the repeat frame if the protocol has one.
+    """
+    # noinspection PyProtectedMember
+    bursts = cls._bursts
+
+    # noinspection PyProtectedMember
+    if (
+        cls._shapes is None or
+        cls.bit_count <= 0 or
+        not bursts or
+        not all(
+            isinstance(burst, list) and
+            len(burst) == 2 and
+            burst[0] > 0 > burst[1]
+            for burst in bursts
+        )
+    ):
+        return None
+
+    if len(bursts) == 2:
+        bit_width = 1
+    elif len(bursts) == 4:
+        bit_width = 2
+    else:
+        bit_width = 4
+
+    if cls.bit_count % bit_width:
+        return None
+
+    def lead_out_ok(lead_out):
+        # a positive last timing is the length of the whole frame, the
+        # pulse it stands for is the gap after the frame. the gap runs into
+        # the space of the last burst when it is all there is
+        return (
+            len(lead_out) > 1 and
+            lead_out[0] > 0 and
+            lead_out[-2] > 0 and
+            -999999999999 not in lead_out and
+            _alternates(lead_out[:-1])
+        )
+
+    # noinspection PyProtectedMember
+    lead_in = cls._lead_in
+    # noinspection PyProtectedMember
+    lead_out = cls._lead_out
+
+    if (
+        lead_in and (lead_in[0] < 0 or lead_in[-1] > 0) or
+        not _alternates(lead_in) or
+        not lead_out_ok(lead_out)
+    ):
+        return None
+
+    # a lead in timing is able to run into the mark of the first burst
+    marks = [mark for mark, _ in bursts]
+    templates = [(
+        tuple(
+            (timing,) + tuple(timing + mark for mark in marks)
+            for timing in lead_in
+        ),
+        bursts,
+        cls.bit_count // bit_width,
+        len(lead_out)
+    )]
+
+    # noinspection PyProtectedMember
+    repeat_lead_in = cls._repeat_lead_in
+    # noinspection PyProtectedMember
+    repeat_lead_out = cls._repeat_lead_out
+
+    if repeat_lead_in or repeat_lead_out:
+        if (
+            not repeat_lead_in or
+            repeat_lead_in[0] < 0 or
+            not _alternates(repeat_lead_in) or
+            not lead_out_ok(repeat_lead_out) or
+            (repeat_lead_in[-1] > 0) == (repeat_lead_out[0] > 0)
+        ):
+            return None
+
+        templates.append((
+            tuple((timing,) for timing in repeat_lead_in),
+            [],
+            0,
+            len(repeat_lead_out)
+        ))
+
+    return tuple(templates)
+
+
+class FramePatterns(object):
+    """
+    Compiled patterns of the decoders that have a template.
+
+    The patterns and the characters get built again the first time they
+    are needed after a decoder's tolerance or enabled state changes.
+    """
+
+    def __init__(self, decoders=()):
+        self._lock = threading.Lock()
+        self._decoders = list(decoders)
+        self._compiled = None
+
+    def update(self, _=None):
+        self._compiled = None
+
+    def _compile(self):
+        compiled = self._compiled
+        if compiled is not None:
+            return compiled
+
+        with self._lock:
+            compiled = self._compiled
+            if compiled is not None:
+                return compiled
+
+            bands = {}
+            for decoder in self._decoders:
+                # noinspection PyProtectedMember
+                templates = decoder._frame_template
+                if templates is None or not decoder.enabled:
+                    continue
+
+                # noinspection PyProtectedMember
+                timings = decoder._timings
+                decoder_bands = []
+
+                for lead_in, bursts, num_bursts, num_lead_out in templates:
+                    lead_in = [
+                        [
+                            code_wrapper._signed_bounds(timings, timing)
+                            for timing in position
+                        ]
+                        for position in lead_in
+                    ]
+                    bursts = [
+                        [
+                            [code_wrapper._signed_bounds(timings, timing)]
+                            for timing in burst
+                        ]
+                        for burst in bursts
+                    ]
+                    decoder_bands.append(
+                        (lead_in, bursts, num_bursts, num_lead_out)
+                    )
+
+                bands[decoder] = decoder_bands
+
+            # 0 and 1 are always edges so the sign of a pulse can be told
+            # from its character
+            edges = {0, 1}
+            for decoder_bands in bands.values():
+                for lead_in, bursts, _, _ in decoder_bands:
+                    for position in lead_in + sum(bursts, []):
+                        for low, high in position:
+                            edges.add(low)
+                            edges.add(high + 1)
+
+            edges = sorted(edges)
+
+            def char_class(position):
+                ranges = []
+                for low, high in position:
+                    first = bisect.bisect_right(edges, low)
+                    last = bisect.bisect_right(edges, high)
+                    ranges.append(
+                        chr(_FIRST_CHAR + first) + '-' +
+                        chr(_FIRST_CHAR + last)
+                    )
+
+                return '[' + ''.join(ranges) + ']'
+
+            patterns = {}
+            for decoder, decoder_bands in bands.items():
+                alternatives = []
+
+                for lead_in, bursts, num_bursts, num_lead_out in decoder_bands:
+                    pattern = ''.join(
+                        char_class(position) for position in lead_in
+                    )
+
+                    if num_bursts:
+                        pattern += '(?:%s){%d}' % (
+                            '|'.join(
+                                ''.join(char_class(timing) for timing in burst)
+                                for burst in bursts
+                            ),
+                            num_bursts
+                        )
+
+                    pattern += '.{%d}' % num_lead_out
+                    alternatives.append(pattern)
+
+                patterns[decoder] = re.compile(
+                    '|'.join('(?:%s)' % item for item in alternatives),
+                    re.DOTALL
+                ).fullmatch
+
+            symbol_map = SymbolMap(edges)
+            compiled = self._compiled = (symbol_map, patterns)
+            return compiled
+
+    def frame(self, data):
+        """
+        Wraps a frame so the decoders can be checked against it one by one.
+
+        The frame is turned into characters the first time a decoder that
+        has a pattern gets checked.
+        """
+        return FrameSymbols(self._compile(), data)
+
+
+class SymbolMap(dict):
+    """
+    Pulse -> character lookup for one set of band edges.
+    """
+
+    def __init__(self, edges):
+        dict.__init__(self)
+        self.edges = edges
+        self.chars = [
+            chr(_FIRST_CHAR + index) for index in range(len(edges) + 1)
+        ]
+
+        # characters below this one are negative pulses, the ones above it
+        # are positive pulses
+        self.zero = self.chars[bisect.bisect_right(edges, 0)]
+
+    def __missing__(self, pulse):
+        char = self.chars[bisect.bisect_right(self.edges, pulse)]
+
+        if len(self) < MAX_SYMBOLS:
+            self[pulse] = char
+
+        return char
+
+
+class FrameSymbols(object):
+
+    def __init__(self, compiled, data):
+        self._compiled = compiled
+        self._data = data
+        self._symbols = None
+
+    def _symbolize(self):
+        symbol_map = self._compiled[0]
+        symbols = ''.join(map(symbol_map.__getitem__, self._data))
+
+        if not symbols:
+            return symbols
+
+        zero = symbol_map.zero
+        marks = symbols[::2]
+        spaces = symbols[1::2]
+
+        if marks[0] < zero:
+            marks, spaces = spaces, marks
+
+        # the frame has to be mark, space, mark, space and so on
+        if (marks and min(marks) <= zero) or (spaces and max(spaces) >= zero):
+            return ''
+
+        return symbols
+
+    def allows(self, decoder):
+        """
+        False if the decoder is going to reject the frame.
+        """
+        match = self._compiled[1].get(decoder, None)
+        if match is None:
+            return True
+
+        symbols = self._symbols
+        if symbols is None:
+            symbols = self._symbols = self._symbolize()
+
+        # an empty string is a frame the patterns do not say anything about
+        return not symbols or match(symbols) is not None
@@ -1,7 +1,47 @@
 from typing import Union, Optional
 
 
+def _mask(value, num_bits):
+    # keeps the lower num_bits bits of a positive value, negative values
+    # are left alone
+    if value < 0:
+        return value
+
+    if num_bits <= 0:
+        return 0
+
+    return value & ((1 << num_bits) - 1)
+
+
+# every byte value with the order of its bits reversed
+_BYTE_REVERSE = tuple(int('{0:08b}'.format(i)[::-1], 2) for i in range(256))
+
+
+def _reverse(value, num_bits):
+    # reverses the order of the lower num_bits bits
+    if num_bits <= 0:
+        return 0
+
+    value &= (1 << num_bits) - 1
+
+    if num_bits <= 8:
+        return _BYTE_REVERSE[value] >> (8 - num_bits)
+
+    # the bytes get reversed starting with the lowest one, the padding that
+    # rounds num_bits up to whole bytes is shifted back out at the end
+    num_bytes = (num_bits + 7) >> 3
+    res = 0
+    for _ in range(num_bytes):
+        res = res << 8 | _BYTE_REVERSE[value & 0xFF]
+        value >>= 8
+
+    return res >> ((num_bytes << 3) - num_bits)
+
+
 class IntegerWrapper(object):
+    # the timings are the burst table of the decoder and get shared by every
+    # wrapper made from the same decoder, they are never copied
+    __slots__ = ('_value', '_num_bits', '_timings', 'encoding')
 
     def __init__(
             self,
@@ -12,29 +52,19 @@ class IntegerWrapper(object):
     ):
         if isinstance(value, IntegerWrapper):
             if num_bits is None:
-                num_bits = value.num_bits
-                value = int(value)
+                num_bits = value._num_bits
+                value = value._value
             else:
-                value = int(value)
-                if value >= 0:
-                    val = 0
-                    for i in range(num_bits):
-                        val |= ((value >> i) & 1) << i
+                value = _mask(value._value, num_bits)
 
-                    value = val
-        else:
-            if num_bits is None:
-                if value == 0:
-                    num_bits = 1
-                else:
-                    num_bits = value.bit_length()
+        elif num_bits is None:
+            if value == 0:
+                num_bits = 1
             else:
-                if value >= 0:
-                    val = 0
-                    for i in range(num_bits):
-                        val |= ((value >> i) & 1) << i
+                num_bits = value.bit_length()
 
-                    value = val
+        else:
+            value = _mask(value, num_bits)
 
         self._num_bits = num_bits
         self._value = value
@@ -43,37 +73,37 @@ class IntegerWrapper(object):
 
     def __eq__(self, other: Union[int, "IntegerWrapper"]):  # self ==
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return self._value == other
 
     def __ne__(self, other: Union[int, "IntegerWrapper"]):  # self !=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return self._value != other
 
     def __lt__(self, other: Union[int, "IntegerWrapper"]):  # self <
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return self._value < other
 
     def __gt__(self, other: Union[int, "IntegerWrapper"]):  # self >
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return self._value > other
 
     def __le__(self, other: Union[int, "IntegerWrapper"]):  # self <=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return self._value <= other
 
     def __ge__(self, other: Union[int, "IntegerWrapper"]):  # self >=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return self._value >= other
 
@@ -110,8 +140,8 @@ class IntegerWrapper(object):
 
     def __add__(self, other: Union[int, "IntegerWrapper"]):  # self +
         if isinstance(other, IntegerWrapper):
-            other_num_bits = other.num_bits
-            other = int(other)
+            other_num_bits = other._num_bits
+            other = other._value
         else:
             other_num_bits = other.bit_length()
 
@@ -123,7 +153,7 @@ class IntegerWrapper(object):
 
     def __sub__(self, other: Union[int, "IntegerWrapper"]):  # self -
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value - other,
@@ -133,7 +163,7 @@ class IntegerWrapper(object):
 
     def __mul__(self, other: Union[int, "IntegerWrapper"]):  # self *
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value * other,
@@ -143,7 +173,7 @@ class IntegerWrapper(object):
 
     def __floordiv__(self, other: Union[int, "IntegerWrapper"]):  # self //
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value // other,
@@ -153,7 +183,7 @@ class IntegerWrapper(object):
 
     def __div__(self, other: Union[int, "IntegerWrapper"]):  # self /
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value // other,
@@ -163,7 +193,7 @@ class IntegerWrapper(object):
 
     def __truediv__(self, other: Union[int, "IntegerWrapper"]):  # self /
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value // other,
@@ -173,7 +203,7 @@ class IntegerWrapper(object):
 
     def __mod__(self, other: Union[int, "IntegerWrapper"]):  # self %
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value % other,
@@ -183,7 +213,7 @@ class IntegerWrapper(object):
 
     def __lshift__(self, other: Union[int, "IntegerWrapper"]):  # self <<
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value << other,
@@ -194,7 +224,7 @@ class IntegerWrapper(object):
 
     def __rshift__(self, other: Union[int, "IntegerWrapper"]):  # self >>
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value >> other,
@@ -205,7 +235,7 @@ class IntegerWrapper(object):
 
     def __and__(self, other: Union[int, "IntegerWrapper"]):  # self &
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value & other,
@@ -215,7 +245,7 @@ class IntegerWrapper(object):
 
     def __or__(self, other: Union[int, "IntegerWrapper"]):  # self |
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value | other,
@@ -225,7 +255,7 @@ class IntegerWrapper(object):
 
     def __xor__(self, other: Union[int, "IntegerWrapper"]):  # self ^
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             self._value ^ other,
@@ -235,7 +265,7 @@ class IntegerWrapper(object):
 
     def __radd__(self, other: Union[int, "IntegerWrapper"]):  # + self
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             other + self._value,
@@ -245,7 +275,7 @@ class IntegerWrapper(object):
 
     def __rsub__(self, other: Union[int, "IntegerWrapper"]):  # - self
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             other - self._value,
@@ -255,7 +285,7 @@ class IntegerWrapper(object):
 
     def __rmul__(self, other: Union[int, "IntegerWrapper"]):  # * self
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             other * self._value,
@@ -265,7 +295,7 @@ class IntegerWrapper(object):
 
     def __rfloordiv__(self, other: Union[int, "IntegerWrapper"]):  # // self
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             other // self._value,
@@ -275,7 +305,7 @@ class IntegerWrapper(object):
 
     def __rdiv__(self, other: Union[int, "IntegerWrapper"]):  # / self
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             other // self._value,
@@ -285,7 +315,7 @@ class IntegerWrapper(object):
 
     def __rtruediv__(self, other: Union[int, "IntegerWrapper"]):  # / self
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             other // self._value,
@@ -295,7 +325,7 @@ class IntegerWrapper(object):
 
     def __rmod__(self, other: Union[int, "IntegerWrapper"]):  # % self
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         return IntegerWrapper(
             other % self._value,
@@ -305,8 +335,8 @@ class IntegerWrapper(object):
 
     def __rlshift__(self, other: Union[int, "IntegerWrapper"]):  # << self
         if isinstance(other, IntegerWrapper):
-            other_num_bits = other.num_bits
-            other = int(other)
+            other_num_bits = other._num_bits
+            other = other._value
         else:
             other_num_bits = other.bit_length()
 
@@ -319,8 +349,8 @@ class IntegerWrapper(object):
 
     def __rrshift__(self, other: Union[int, "IntegerWrapper"]):  # >> self
         if isinstance(other, IntegerWrapper):
-            other_num_bits = other.num_bits
-            other = int(other)
+            other_num_bits = other._num_bits
+            other = other._value
         else:
             other_num_bits = other.bit_length()
 
@@ -333,8 +363,8 @@ class IntegerWrapper(object):
 
     def __rand__(self, other: Union[int, "IntegerWrapper"]):  # & self
         if isinstance(other, IntegerWrapper):
-            other_num_bits = other.num_bits
-            other = int(other)
+            other_num_bits = other._num_bits
+            other = other._value
         else:
             other_num_bits = other.bit_length()
 
@@ -347,8 +377,8 @@ class IntegerWrapper(object):
 
     def __ror__(self, other: Union[int, "IntegerWrapper"]):  # | self
         if isinstance(other, IntegerWrapper):
-            other_num_bits = other.num_bits
-            other = int(other)
+            other_num_bits = other._num_bits
+            other = other._value
         else:
             other_num_bits = other.bit_length()
 
@@ -361,8 +391,8 @@ class IntegerWrapper(object):
 
     def __rxor__(self, other: Union[int, "IntegerWrapper"]):  # ^ self
         if isinstance(other, IntegerWrapper):
-            other_num_bits = other.num_bits
-            other = int(other)
+            other_num_bits = other._num_bits
+            other = other._value
         else:
             other_num_bits = other.bit_length()
 
@@ -375,7 +405,7 @@ class IntegerWrapper(object):
 
     def __iadd__(self, other: Union[int, "IntegerWrapper"]):  # self +=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         self._value += other
         self._num_bits = self._value.bit_length()
@@ -383,7 +413,7 @@ class IntegerWrapper(object):
 
     def __isub__(self, other: Union[int, "IntegerWrapper"]):  # self -=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         self._value -= other
         self._num_bits = min(self._num_bits, self._value.bit_length())
@@ -391,7 +421,7 @@ class IntegerWrapper(object):
 
     def __imul__(self, other: Union[int, "IntegerWrapper"]):  # self *=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         self._value *= other
         self._num_bits = max(self._num_bits, self._value.bit_length())
@@ -399,7 +429,7 @@ class IntegerWrapper(object):
 
     def __ifloordiv__(self, other: Union[int, "IntegerWrapper"]):  # self //=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         self._value //= other
         self._num_bits = max(self._num_bits, self._value.bit_length())
@@ -407,7 +437,7 @@ class IntegerWrapper(object):
 
     def __idiv__(self, other: Union[int, "IntegerWrapper"]):  # self /=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         self._value //= other
         self._num_bits = max(self._num_bits, self._value.bit_length())
@@ -415,7 +445,7 @@ class IntegerWrapper(object):
 
     def __itruediv__(self, other: Union[int, "IntegerWrapper"]):  # self /=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         self._value //= other
         self._num_bits = max(self._num_bits, self._value.bit_length())
@@ -423,7 +453,7 @@ class IntegerWrapper(object):
 
     def __imod__(self, other: Union[int, "IntegerWrapper"]):  # self %=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         self._value %= other
         self._num_bits = max(self._num_bits, self._value.bit_length())
@@ -431,7 +461,7 @@ class IntegerWrapper(object):
 
     def __ilshift__(self, other: Union[int, "IntegerWrapper"]):  # self <<=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         self._value <<= other
         self._num_bits += other
@@ -439,7 +469,7 @@ class IntegerWrapper(object):
 
     def __irshift__(self, other: Union[int, "IntegerWrapper"]):  # self >>=
         if isinstance(other, IntegerWrapper):
-            other = int(other)
+            other = other._value
 
         self._value >>= other
         self._num_bits -= other
@@ -447,8 +477,8 @@ class IntegerWrapper(object):
 
     def __iand__(self, other: Union[int, "IntegerWrapper"]):  # self &=
         if isinstance(other, IntegerWrapper):
-            other_num_bits = other.num_bits
-            other = int(other)
+            other_num_bits = other._num_bits
+            other = other._value
         else:
             other_num_bits = other.bit_length()
 
@@ -459,8 +489,8 @@ class IntegerWrapper(object):
     def __ior__(self, other: Union[int, "IntegerWrapper"]):  # self |=
 
         if isinstance(other, IntegerWrapper):
-            other_num_bits = other.num_bits
-            other = int(other)
+            other_num_bits = other._num_bits
+            other = other._value
         else:
             other_num_bits = other.bit_length()
 
@@ -470,8 +500,8 @@ class IntegerWrapper(object):
 
     def __ixor__(self, other: Union[int, "IntegerWrapper"]):  # self ^=
         if isinstance(other, IntegerWrapper):
-            other_num_bits = other.num_bits
-            other = int(other)
+            other_num_bits = other._num_bits
+            other = other._value
         else:
             other_num_bits = other.bit_length()
 
@@ -513,93 +543,85 @@ class IntegerWrapper(object):
     def __getitem__(self, item):
         if not isinstance(item, slice):
             if isinstance(item, IntegerWrapper):
-                item = int(item)
+                item = item._value
 
             return list(self)[item]
 
+        value = self._value
+        start = item.start
+        stop = item.stop
+        step = item.step
+
+        # the bits get pulled out with shifts and masks, the bit by bit
+        # loops this replaces made a wrapper for every bit
         if (
-                item.stop is not None is not item.step and
-                item.step != 0 <= item.stop
+                stop is not None is not step and
+                step != 0 <= stop
         ):
-            val = IntegerWrapper(0)
-            for i in range(item.step, item.step + item.stop + 1):
-                val |= ((self >> i) & 0x1) << (i - item.step)
-
             val = IntegerWrapper(
-                val,
-                item.stop,
+                (value >> step) & ((1 << stop) - 1),
+                stop,
                 self._timings,
                 self.encoding
             )
 
-        elif item.stop is not None and item.stop > 0:
-            val = IntegerWrapper(0)
-            for i in range(item.stop):
-                val |= ((self >> i) & 0x1) << i
-
+        elif stop is not None and stop > 0:
             val = IntegerWrapper(
-                val,
-                item.stop,
+                value & ((1 << stop) - 1),
+                stop,
                 self._timings,
                 self.encoding
             )
 
-        elif item.stop is not None and item.stop < 0:
-            val = IntegerWrapper(0)
-            if item.step is not None and item.step > 0:
-                for i in range(item.step, item.step - item.stop + 1):
-                    val |= ((self >> i) & 0x1) << (i - item.step)
-            else:
-                for i in range(-item.stop):
-                    val |= ((self >> i) & 0x1) << i
+        elif stop is not None and stop < 0:
+            if step is not None and step > 0:
+                value >>= step
 
-            val = reversed(IntegerWrapper(
-                val,
-                -item.stop,
+            val = IntegerWrapper(
+                _reverse(value, -stop),
+                -stop,
                 self._timings,
                 self.encoding
-            ))
+            )
 
-        elif item.stop is None and item.step is not None:
-            val = IntegerWrapper(0)
-            for i in range(item.step, len(self), 1):
-                val |= ((self >> i) & 0x1) << i
+        elif stop is None and step is not None:
+            num_bits = self._num_bits
+
+            if num_bits > step:
+                value &= ((1 << num_bits) - 1) ^ ((1 << step) - 1)
+            else:
+                value = 0
 
             val = IntegerWrapper(
-                val,
-                len(self) - item.step,
+                value,
+                num_bits - step,
                 self._timings,
                 self.encoding
             )
         else:
             val = self
 
-        if item.start is True:
+        if start is True:
             return val.invert_bits()
 
-        if item.start is not None:
-            if item.start < 0:
-                return item.start == ~val
+        if start is not None:
+            if start < 0:
+                return start == ~val
             else:
-                return item.start == val
+                return start == val
 
         return val
 
     def __iter__(self):  # iterate over bits
+        value = self._value
+
         for i in range(self._num_bits):
-            yield int((self >> i) & 1)
+            yield (value >> i) & 1
 
     def __reversed__(self):  # reverse bit order
-        num_bits = self._num_bits
-
-        val = 0
-
-        for i in range(num_bits):
-            val |= (int(self >> i) & 1) << (~i + num_bits)
-
         return IntegerWrapper(
-            val,
-            num_bits,
+            _reverse(self._value, self._num_bits),
+            self._num_bits,
             self._timings,
             self.encoding
         )
@@ -621,12 +643,12 @@ class IntegerWrapper(object):
         if num_bits is None:
             num_bits = self._num_bits
         elif isinstance(num_bits, IntegerWrapper):
-            num_bits = int(num_bits)
-
-        val = 0
+            num_bits = num_bits._value
 
-        for i in range(num_bits):
-            val |= (1 - (int(self >> i) & 1)) << i
+        if num_bits > 0:
+            val = ~self._value & ((1 << num_bits) - 1)
+        else:
+            val = 0
 
         return IntegerWrapper(
             val,
@@ -639,15 +661,10 @@ class IntegerWrapper(object):
         if num_bits is None:
             num_bits = self._num_bits
         elif isinstance(num_bits, IntegerWrapper):
-            num_bits = int(num_bits)
-
-        val = 0
-
-        for i in range(num_bits):
-            val |= (int(self >> i) & 1) << (~i + num_bits)
+            num_bits = num_bits._value
 
         return IntegerWrapper(
-            val,
+            _reverse(self._value, num_bits),
             num_bits,
             self._timings,
             self.encoding
@@ -655,10 +672,10 @@ class IntegerWrapper(object):
 
     @property
     def num_one_bits(self):
-        count = 0
-
-        for i in range(self._num_bits):
-            count += self._value >> i & 1
+        if self._num_bits > 0:
+            count = bin(self._value & ((1 << self._num_bits) - 1)).count('1')
+        else:
+            count = 0
 
         count = IntegerWrapper(
             count,
@@ -731,9 +748,8 @@ class IntegerWrapper(object):
 
     @property
     def bits(self):
-        bits = []
-        for bit in self:
-            bits.insert(0, bit)
+        bits = list(self)
+        bits.reverse()
 
         return bits
 
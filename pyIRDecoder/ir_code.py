@@ -31,18 +31,50 @@ from . import pronto
 from . import utils
 from . import xml_handler
 from . import integer_wrapper
+from . import code_wrapper
 
 
 _timer_thread_worker = thread_worker.TimerThreadWorker()
 _process_thread_worker = thread_worker.ProcessThreadWorker()
 
 
+class _Parameters(dict):
+    # some decoders change the parameters of a code after the code has been
+    # made. every change gets counted so the code knows when the things it
+    # has built from the parameters are out of date
+
+    version = 0
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.version += 1
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self.version += 1
+
+
+def _truncate(value, num_bits):
+    # keeps the num_bits most significant bits of the value
+    extra = value.bit_length() - num_bits
+    if extra > 0:
+        value >>= extra
+
+    return value
+
+
 class Timer(object):
     def __init__(self, func, duration):
         self.func = func
         self._duration = duration
         self._adjusted_duration = duration
-        self.timer = high_precision_timers.TimerUS()
+        # the timer gets made when it gets started, stopping a timer that
+        # has never been started has nothing to release
+        self.timer = None
 
     @property
     def duration(self):
@@ -53,10 +85,12 @@ class Timer(object):
         return self._adjusted_duration
 
     def run_func(self):
-        if self.timer is None:
+        # stop gets called from other threads
+        timer = self.timer
+        if timer is None:
             return True
 
-        if self.timer.elapsed() >= self.adjusted_duration:
+        if timer.elapsed() >= self.adjusted_duration:
             _process_thread_worker.add(self.func)
             return True
 
@@ -84,11 +118,33 @@ class Timer(object):
 
     @property
     def is_running(self):
-        return self.timer.elapsed() < self.adjusted_duration
+        timer = self.timer
+        if timer is None:
+            return False
+
+        return timer.elapsed() < self.adjusted_duration
 
 
 # noinspection PyProtectedMember
 class IRCode(object):
+    # the repeat timer, the released callbacks and the xml element only get
+    # made when something asks for them. most codes never need them.
+    __slots__ = (
+        '_decoder',
+        '_original_rlc',
+        '_normalized_rlc',
+        '_code',
+        '_name',
+        '_xml',
+        '_key',
+        '_key_version',
+        '_str',
+        '_hex',
+        '_callbacks',
+        '_repeat_count',
+        '_repeat_timer',
+        '_data'
+    )
 
     def __init__(
         self,
@@ -108,12 +164,15 @@ class IRCode(object):
         self._code = None
         self._name = name
         self._xml = None
-        self._int = None
+        self._key = None
+        self._key_version = -1
+        self._str = None
         self._hex = None
-        self._callbacks = []
+        self._callbacks = None
+        self._repeat_timer = None
         self._repeat_count = repeat_count
 
-        self._data = {}
+        self._data = _Parameters()
 
         for key, value in data.items():
             if (
@@ -130,16 +189,12 @@ class IRCode(object):
                         )
             self._data[key] = value
 
-        if decoder.repeat_timeout == 0:
-            repeat_timeout = sum(
-                abs(item) for rlc in normalized_rlc for item in rlc
-            )
-        else:
-            repeat_timeout = decoder.repeat_timeout
-
-        self._repeat_timer = Timer(self.__repeat_reset, repeat_timeout)
-        self._repeat_duration = repeat_timeout
-        self.bind_released_callback(decoder.reset)
+        try:
+            self._load_key()
+        except (KeyError, TypeError, ValueError):
+            # codes that are a piece of a sequence may not have all of the
+            # parameters until they get added together
+            pass
 
         #if self._name is None:
             #_process_thread_worker.add(self.__set_name)
@@ -174,24 +229,32 @@ class IRCode(object):
         self._repeat_count = value
 
     def __repeat_reset(self):
-        for callback in self._callbacks[:]:
+        for callback in self.__load_callbacks()[:]:
             callback(self)
 
+    def __load_callbacks(self):
+        if self._callbacks is None:
+            self._callbacks = [self._decoder.reset]
+
+        return self._callbacks
+
     def bind_released_callback(self, callback):
-        if callback not in self._callbacks:
-            self._callbacks.append(callback)
+        callbacks = self.__load_callbacks()
+
+        if callback not in callbacks:
+            callbacks.append(callback)
 
     def unbind_released_callback(self, callback):
-        if callback in self._callbacks:
-            self._callbacks.remove(callback)
+        callbacks = self.__load_callbacks()
+
+        if callback in callbacks:
+            callbacks.remove(callback)
 
     def save(self):
-        if self not in self.decoder._saved_codes:
-            self.decoder._saved_codes.append(self)
+        self.decoder._saved_code_index.add(self)
 
     def delete(self):
-        if self in self.decoder._saved_codes:
-            self.decoder._saved_codes.remove(self)
+        self.decoder._saved_code_index.remove(self)
 
     def __set_name(self):
         config = self.decoder.config
@@ -291,6 +354,16 @@ class IRCode(object):
 
     @property
     def repeat_timer(self):
+        if self._repeat_timer is None:
+            if self._decoder.repeat_timeout == 0:
+                repeat_timeout = sum(
+                    abs(item) for rlc in self._normalized_rlc for item in rlc
+                )
+            else:
+                repeat_timeout = self._decoder.repeat_timeout
+
+            self._repeat_timer = Timer(self.__repeat_reset, repeat_timeout)
+
         return self._repeat_timer
 
     @property
@@ -366,7 +439,7 @@ class IRCode(object):
 
     @property
     def original_mce_pronto(self):
-        code = [abs(item) for item in self.original_mce_rlc]
+        code = [abs(item) for item in self.original_rlc_mce]
         return pronto.rlc_to_pronto(self.frequency, code)
 
     @property
@@ -379,7 +452,7 @@ class IRCode(object):
 
     @property
     def normalized_mce_pronto(self):
-        code = [abs(item) for item in self.normalized_rlc_mcs]
+        code = [abs(item) for item in self.normalized_rlc_mce]
         return pronto.rlc_to_pronto(self.frequency, code)
 
     @property
@@ -470,34 +543,80 @@ class IRCode(object):
         return self
 
     def __getattr__(self, item):
-        if item in self.__dict__:
-            return self.__dict__[item]
+        # only gets called for names that are not attributes, which are
+        # looked up in the parameters. the private names are skipped so a
+        # slot that has not been set does not send us in circles
+        if item.startswith('_'):
+            raise AttributeError(item)
 
         if item.upper() in self._data:
             return self._data[item.upper()]
 
         raise AttributeError(item)
 
-    def __int__(self):
-        if self._int is None:
-            bits = ''
+    def _build_key(self):
+        # the protocol, the number of bits and the bits of the code packed
+        # into an int. this is what codes are compared and hashed by
+        data = self._data
+        value = 0
+        num_bits = 0
 
-            if 'CODE' in self._data:
-                if 'M' in self._data:
-                    bits += bin(self.mode)[2:].zfill(3)[:3]
+        if 'CODE' in data:
+            if 'M' in data:
+                value = _truncate(int(data['M']), 3)
+                num_bits = 3
 
-                bits += bin(self.code)[2:]
-            else:
-                for param, num_bits in self._decoder._code_order:
-                    bts = bin(int(self._data[param]))[2:].zfill(num_bits)[:num_bits]
-                    if self._decoder.encoding == 'msb':
-                        bits += bts
-                    else:
-                        for i in range(num_bits - 1, -1, -1):
-                            bits += bts[i]
+            code = int(data['CODE'])
+            code_bits = max(code.bit_length(), 1)
+
+            value = (value << code_bits) | code
+            num_bits += code_bits
+        else:
+            msb = self._decoder.encoding == 'msb'
+
+            for param, param_bits in self._decoder._code_order:
+                param_value = _truncate(int(data[param]), param_bits)
+
+                if not msb:
+                    param_value = code_wrapper._reverse_bits(
+                        param_value,
+                        param_bits
+                    )
+
+                value = (value << param_bits) | param_value
+                num_bits += param_bits
+
+        return self._decoder.__class__, num_bits, value
+
+    def _check_version(self):
+        # throws away what has been built from the parameters when the
+        # parameters have changed
+        if self._key_version != self._data.version:
+            self._key = None
+            self._str = None
+            self._hex = None
+            self._key_version = self._data.version
+
+    def _load_key(self):
+        self._check_version()
+
+        if self._key is None:
+            self._key = self._build_key()
 
-            self._int = int(bits, 2)
-        return self._int
+        return self._key
+
+    @property
+    def key(self):
+        """
+        Hashable identity of the code.
+        """
+        return self._load_key()
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __int__(self):
+        return self.key[2]
 
     @property
     def name(self):
@@ -505,10 +624,13 @@ class IRCode(object):
 
     @name.setter
     def name(self, value):
-        self._name = value
+        # saved codes are indexed by name
+        self._decoder._saved_code_index.rename(self, value)
 
     @property
     def hexadecimal(self):
+        self._check_version()
+
         if self._hex is None:
             res = hex(int(self))[2:].upper().rstrip('L')
             self._hex = '0x' + res.zfill(len(res) + (len(res) % 2))
@@ -546,10 +668,7 @@ class IRCode(object):
             return True
 
         if isinstance(other, IRCode):
-            if other.decoder.__class__ != self.decoder.__class__:
-                return False
-
-            return str(other) == str(self)
+            return other.key == self.key
 
         return False
 
@@ -557,7 +676,12 @@ class IRCode(object):
         return not self.__eq__(other)
 
     def __str__(self):
-        if self._name is None:
+        if self._name is not None:
+            return self._name
+
+        self._check_version()
+
+        if self._str is None:
             res = []
 
             if 'CODE' in self._data:
@@ -577,6 +701,6 @@ class IRCode(object):
 
                     res += [(('%X' % (value,)).zfill(fill)).rstrip('L')]
 
-            return self.decoder.name + '.' + ':'.join(res)
+            self._str = self.decoder.name + '.' + ':'.join(res)
 
-        return self._name
+        return self._str
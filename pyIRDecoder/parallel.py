@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in 
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN 
+# THE SOFTWARE.
+
+# ****************************************************************************
+
+
+# Decoding a large corpus of frames is bound to a single core when it is
+# done through the protocols module. This module splits the frames into
+# chunks and hands the chunks to a pool of processes. Every process builds
+# its decoders a single time when it starts and decodes its chunks using
+# protocols.decode_many. The results are handed back in the same order
+# the frames were given in.
+
+import collections
+import concurrent.futures
+import itertools
+import operator
+import os
+from typing import Iterable, Iterator, Optional
+
+from . import protocols
+from . import protocol_base
+
+# number of frames that get sent to a process in one go
+DEFAULT_CHUNK_SIZE = 256
+
+# number of chunks per process that are allowed to be waiting on a result
+# before we stop handing out more chunks
+CHUNKS_PER_WORKER = 2
+
+
+def _config():
+    res = {}
+
+    for decoder in protocols:
+        res[decoder.name] = (
+            decoder.enabled,
+            decoder.tolerance,
+            decoder.frequency_tolerance
+        )
+
+    return res
+
+
+def _init_worker(config):
+    for decoder in protocols:
+        if decoder.name not in config:
+            continue
+
+        enabled, tolerance, frequency_tolerance = config[decoder.name]
+
+        decoder.enabled = enabled
+        decoder.frequency_tolerance = frequency_tolerance
+
+        if decoder.tolerance != tolerance:
+            decoder.tolerance = tolerance
+
+    # builds the decoders decode_many uses
+    protocols.decode_many([])
+
+
+def _decode_chunk(chunk):
+    res = []
+
+    for frequency, frames in itertools.groupby(
+        chunk,
+        key=operator.itemgetter(1)
+    ):
+        frames = [data for data, _ in frames]
+
+        for code in protocols.decode_many(frames, frequency):
+            if code is None:
+                res.append(None)
+                continue
+
+            decoder = code.decoder
+            name = str(code)
+
+            # saved codes get looked up by name when the result gets
+            # back so the caller ends up with the saved instance
+            # noinspection PyProtectedMember
+            if decoder._saved_code_index.get(name) is not code:
+                name = None
+
+            # noinspection PyProtectedMember
+            res.append((
+                decoder.name,
+                name,
+                code.original_rlc,
+                code.normalized_rlc,
+                code._data
+            ))
+
+    return res
+
+
+def _build_code(result):
+    if result is None:
+        return None
+
+    decoder_name, name, original_rlc, normalized_rlc, data = result
+    decoder = getattr(protocols, decoder_name)
+
+    if name is not None:
+        # noinspection PyProtectedMember
+        code = decoder._saved_code_index.get(name)
+
+        if code is not None:
+            return code
+
+    return protocol_base.IRCode(decoder, original_rlc, normalized_rlc, data)
+
+
+class CorpusDecoder(object):
+    """
+    Decodes frames using a pool of processes.
+
+    The processes get started the first time decode is called and the
+    enabled state, tolerance and frequency tolerance of every decoder get
+    copied to them at that time. Changes made to the decoders after that
+    are not seen by the processes until shutdown gets called.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def _load_executor(self):
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                initializer=_init_worker,
+                initargs=(_config(),)
+            )
+
+        return self._executor
+
+    def _chunks(self, frames, frequency):
+        chunk = []
+
+        for data in frames:
+            if data:
+                # IRCode instances and pronto codes get turned into rlc
+                # here so only lists of ints get sent to the processes
+                # noinspection PyProtectedMember
+                data, frame_frequency = protocols._to_rlc(data, frequency)
+            else:
+                data, frame_frequency = [], frequency
+
+            chunk.append((data, frame_frequency))
+
+            if len(chunk) == self._chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    def decode(
+        self,
+        frames: Iterable,
+        frequency: int = 0
+    ) -> Iterator[Optional[protocol_base.IRCode]]:
+        """
+        Decodes frames in the processes of the pool.
+
+        This is a generator, it yields the decoded IRCode or None for every
+        frame in the order the frames were given in. The frames get decoded
+        the same way protocols.decode_many decodes them.
+
+        :param frames: iterable of frames, each frame can be anything that
+            protocols.decode accepts.
+        :param frequency: frequency of the frames, frames that are IRCode
+            instances or pronto codes use their own frequency.
+        """
+        executor = self._load_executor()
+        # the pool starts os.cpu_count() processes when max_workers is None
+        max_workers = self._max_workers or os.cpu_count() or 1
+        max_pending = max_workers * CHUNKS_PER_WORKER
+
+        chunks = self._chunks(frames, frequency)
+        pending = collections.deque()
+
+        try:
+            for chunk in itertools.islice(chunks, max_pending):
+                pending.append(executor.submit(_decode_chunk, chunk))
+
+            while pending:
+                results = pending.popleft().result()
+
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append(executor.submit(_decode_chunk, chunk))
+
+                for result in results:
+                    yield _build_code(result)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def decode(
+    frames: Iterable,
+    frequency: int = 0,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Optional[protocol_base.IRCode]]:
+    """
+    Decodes frames using a pool of processes that only lives as long as
+    the decoding does.
+
+    See CorpusDecoder.decode.
+    """
+    with CorpusDecoder(max_workers, chunk_size) as decoder:
+        for code in decoder.decode(frames, frequency):
+            yield code
@@ -26,10 +26,10 @@
 # ****************************************************************************
 
 from __future__ import print_function
-import math
 import six
 from typing import Sequence, Optional
 
+from . import checksum
 from . import code_wrapper
 from . import xml_handler
 
@@ -37,6 +37,7 @@ from . import (
     DecodeError,
     RepeatLeadInError,
     RepeatLeadOutError,
+    RepeatTimeoutExpired,
     TooManyBitsError,
     NotEnoughBitsError,
     IRStreamError,
@@ -46,6 +47,26 @@ from . import (
 from .config import Config
 from .integer_wrapper import IntegerWrapper
 from .ir_code import IRCode
+from .decoder_index import (
+    MAX_PULSE,
+    SavedCodeIndex,
+    Shape,
+    WrapCache,
+    build_shapes
+)
+from .frame_pattern import build_template
+
+
+# what _try_decode hands back along with the code. anything other then
+# DECODED means the frame was not decoded.
+DECODED = 0
+REJECT_FRAME = 1
+REJECT_TOO_MANY_BITS = 2
+REJECT_NOT_ENOUGH_BITS = 3
+REJECT_CHECKSUM = 4
+REJECT_DECODE = 5
+REPEAT_LEAD_IN = 6
+REPEAT_LEAD_OUT = 7
 
 
 class ProtocolBaseMeta(type):
@@ -57,6 +78,21 @@ class ProtocolBaseMeta(type):
         if cls not in ProtocolBaseMeta._classes:
             ProtocolBaseMeta._classes += [cls]
 
+        # protocols that switch between sets of parameters while decoding
+        # keep them in _parameters1, _parameters2 and so on
+        cls._shapes = build_shapes(cls)
+        cls._frame_template = build_template(cls)
+        cls._wrap_group = WrapCache.group(cls)
+
+        cls._compiled_parameters = [
+            (value, code_wrapper.compile_parameters(value))
+            for key, value in (
+                (key, getattr(cls, key)) for key in dir(cls)
+                if key.startswith('_parameters')
+            )
+            if key[11:].isdigit() or key == '_parameters'
+        ]
+
     def __call__(cls, parent=None, xml=None):
         if xml is not None and cls == IrProtocolBase:
             for protocol in ProtocolBaseMeta._classes:
@@ -91,8 +127,28 @@ class IrProtocolBase(object):
     encode_parameters = []
     repeat_timeout = 0
 
+    # see checksum.py, these get checked before a code gets built
+    _checksum_rules = ()
+
+    # set by the decoder scan that owns the decoder, see WrapCache
+    _wrap_cache = None
+
     _enabled = True
 
+    # set to False by protocols that swap their lead in while decoding, the
+    # lead in index can't make any assumptions about the first pulse of
+    # a frame for those protocols.
+    _static_lead_in = True
+
+    # set to False by protocols that do more with a repeat frame than hand
+    # back the last code, the repeat matcher leaves those frames to the
+    # decoder.
+    _static_repeat = True
+
+    # set to False by protocols that decode frames that do not have the
+    # shape their lead in, bursts and lead out describe.
+    _static_shape = True
+
     def __init__(self, parent=None, xml=None):
         import threading
         self.__last_code = None
@@ -100,6 +156,7 @@ class IrProtocolBase(object):
         self._tolerance = 20
         self._frequency_tolerance = 2
         self._saved_codes = []
+        self._saved_code_index = SavedCodeIndex(self, self._saved_codes)
         self._sequence = []
         self._parent = parent
 
@@ -111,10 +168,41 @@ class IrProtocolBase(object):
         self._middle_timings = self._middle_timings[:]
         self._repeat_bursts = self._repeat_bursts[:]
 
+        # the wrap cache is only used while the protocol still has the
+        # framing it was made with, some protocols swap these out while
+        # decoding
+        self._wrap_framing = (
+            self.encoding,
+            self._lead_in,
+            self._lead_out,
+            self._middle_timings,
+            self._bursts
+        )
+
         self._parameters = self._parameters[:]
         self.encode_parameters = self.encode_parameters[:]
         self.repeat_timeout = self.repeat_timeout
 
+        self._timing_tables = {}
+        self._checksum_checks = {}
+        self._shape_bounds = {}
+
+        # bursts that are not made up of mark/space pairs are left for
+        # CodeWrapper to sort out when decoding
+        try:
+            self._stream_encoding = code_wrapper.get_stream_encoding(
+                self._bursts
+            )
+        except ValueError:
+            self._stream_encoding = None
+
+        try:
+            self._repeat_stream_encoding = code_wrapper.get_stream_encoding(
+                self._repeat_bursts
+            )
+        except ValueError:
+            self._repeat_stream_encoding = None
+
         if self.repeat_timeout == 0:
             if self._repeat_lead_out and self._repeat_lead_out[-1] > 0:
                 self.repeat_timeout = self._repeat_lead_out[-1]
@@ -268,6 +356,7 @@ class IrProtocolBase(object):
     @enabled.setter
     def enabled(self, value: bool):
         self._enabled = value
+        self._decoder_changed()
 
     @property
     def tolerance(self) -> float:
@@ -275,7 +364,141 @@ class IrProtocolBase(object):
 
     @tolerance.setter
     def tolerance(self, value: float):
+        if value == self._tolerance:
+            return
+
         self._tolerance = value
+        self._timing_tables.clear()
+        self._decoder_changed()
+
+    @property
+    def _timings(self) -> code_wrapper.TimingTable:
+        tolerance = self._tolerance
+
+        try:
+            return self._timing_tables[tolerance]
+        except KeyError:
+            pass
+
+        table = code_wrapper.TimingTable(tolerance, self._expected_timings())
+        self._timing_tables[tolerance] = table
+        return table
+
+    def _expected_timings(self) -> set:
+        """
+        Every timing the decoder is able to compare a pulse against.
+
+        This includes the sums that get made when a lead in, middle timing or
+        lead out runs into a burst so the bounds for all of them can be
+        computed ahead of time.
+        """
+        def flatten(lst):
+            for item in lst:
+                if isinstance(item, dict):
+                    for timing in flatten(item['bursts']):
+                        yield timing
+                elif isinstance(item, (list, tuple)):
+                    for timing in flatten(item):
+                        yield timing
+                elif isinstance(item, int):
+                    yield item
+
+        res = set()
+
+        for lead_in, lead_out, middle_timings, bursts in (
+            (
+                self._lead_in,
+                self._lead_out,
+                self._middle_timings,
+                self._bursts
+            ),
+            (
+                self._repeat_lead_in,
+                self._repeat_lead_out,
+                [],
+                self._repeat_bursts
+            )
+        ):
+            timings = set(flatten(lead_in + lead_out + middle_timings))
+            burst_timings = set(flatten(bursts))
+
+            for timing in list(timings):
+                for burst in burst_timings:
+                    if (timing > 0) == (burst > 0):
+                        timings.add(timing + burst)
+
+            for burst in list(burst_timings):
+                for other in list(burst_timings):
+                    if (burst > 0) == (other > 0):
+                        timings.add(burst + other)
+
+            res.update(timings)
+            res.update(burst_timings)
+
+        res.discard(0)
+        return res
+
+    @property
+    def shapes(self) -> Optional[Sequence[Shape]]:
+        """
+        What a frame has to look like for this decoder to accept it.
+
+        A frame has to fit one of the shapes. The durations are in
+        microseconds and take the tolerance into account, the last pulse of
+        a frame is not part of the duration.
+
+        :return: tuple of Shape or None if frames are not checked.
+        """
+        if self._shapes is None:
+            return None
+
+        tolerance = self._tolerance / 100.0
+        first_pulse = self._first_pulse_bounds()
+        res = []
+
+        for shape in self._shapes:
+            # the bounds of every pulse get rounded down
+            slack = shape.max_pulses
+            min_duration = int(shape.min_duration * (1.0 - tolerance))
+            max_duration = int(shape.max_duration * (1.0 + tolerance))
+
+            res.append(
+                Shape(
+                    shape.min_pulses,
+                    shape.max_pulses,
+                    max(min_duration - slack, 0),
+                    max_duration + slack,
+                    first_pulse
+                )
+            )
+
+        return tuple(res)
+
+    def _fits_shape(self, num_pulses: int, duration: int) -> bool:
+        if self._shapes is None:
+            return True
+
+        try:
+            shapes = self._shape_bounds[self._tolerance]
+        except KeyError:
+            shapes = self.shapes
+            self._shape_bounds[self._tolerance] = shapes
+
+        for shape in shapes:
+            if (
+                shape.min_pulses <= num_pulses <= shape.max_pulses and
+                shape.min_duration <= duration <= shape.max_duration
+            ):
+                return True
+
+        return False
+
+    def _decoder_changed(self) -> None:
+        # lets the parent rebuild anything it has derived from the
+        # enabled state or the tolerance of this decoder
+        parent = self._parent
+        if parent is not None and hasattr(parent, '_decoder_changed'):
+            parent._decoder_changed(self)
 
     @property
     def frequency_tolerance(self) -> float:
@@ -283,7 +506,11 @@ class IrProtocolBase(object):
 
     @frequency_tolerance.setter
     def frequency_tolerance(self, value: float):
+        if value == self._frequency_tolerance:
+            return
+
         self._frequency_tolerance = value
+        self._decoder_changed()
 
     @property
     def name(self) -> str:
@@ -360,69 +587,174 @@ class IrProtocolBase(object):
         return packet[:]
 
     def decode(self, data: list, frequency: int = 0) -> IRCode:
+        c = self._decode_repeat(data)
+        if c is not None:
+            return c
+
+        code = self._wrap_frame(data)
+        reason = self._check_frame(code)
+
+        if reason == REJECT_TOO_MANY_BITS:
+            raise TooManyBitsError(self.bit_count, ':', code.stream_pairs)
+        elif reason == REJECT_NOT_ENOUGH_BITS:
+            raise NotEnoughBitsError(self.bit_count, ':', code.stream_pairs)
+        elif reason == REJECT_CHECKSUM:
+            raise DecodeError('Checksum failed')
+
+        return self._build_code(code)
+
+    def _try_decode(self, data: list, frequency: int = 0) -> tuple:
+        """
+        Decodes a frame without raising an exception when it is rejected.
+
+        Returns (code, DECODED) when the frame decodes and (None, reason)
+        when it does not. Protocols that supply their own decode get called
+        through it and the exception it raises is turned into a reason.
+        """
+        if self.__class__.decode != IrProtocolBase.decode:
+            try:
+                return self.decode(data, frequency), DECODED
+            except RepeatLeadInError:
+                return None, REPEAT_LEAD_IN
+            except (RepeatLeadOutError, RepeatTimeoutExpired):
+                return None, REPEAT_LEAD_OUT
+            except TooManyBitsError:
+                return None, REJECT_TOO_MANY_BITS
+            except NotEnoughBitsError:
+                return None, REJECT_NOT_ENOUGH_BITS
+            except IRException:
+                return None, REJECT_DECODE
+
+        c = self._decode_repeat(data)
+        if c is not None:
+            return c, DECODED
+
+        try:
+            code = self._wrap_frame(data)
+        except IRException:
+            return None, REJECT_FRAME
+
+        reason = self._check_frame(code)
+        if reason != DECODED:
+            return None, reason
+
+        return self._build_code(code), DECODED
+
+    def _decode_repeat(self, data: list) -> Optional[IRCode]:
         with self.__code_lock:
-            if self._last_code is not None and (
+            if self._last_code is None or not (
                 self._repeat_lead_in or
                 self._repeat_lead_out
             ):
-                try:
-                    code = code_wrapper.CodeWrapper(
-                        self.encoding,
-                        self._repeat_lead_in[:],
-                        self._repeat_lead_out[:],
-                        [],
-                        self._repeat_bursts[:],
-                        self.tolerance,
-                        data[:]
-                    )
+                return None
+
+            try:
+                code = code_wrapper.CodeWrapper(
+                    self.encoding,
+                    self._repeat_lead_in,
+                    self._repeat_lead_out,
+                    [],
+                    self._repeat_bursts,
+                    self.tolerance,
+                    data,
+                    self._timings,
+                    self._repeat_stream_encoding
+                )
+            except IRException:
+                return None
+
+            # protocols with their own decode usually carry only a bit or
+            # two in the repeat frame. a frame that has the bits of a whole
+            # frame is able to be a different code that starts the same way
+            if self._repeat_bursts and (
+                self.__class__.decode == IrProtocolBase.decode or
+                code.num_bits >= self.bit_count
+            ):
+                params = code.get_values(
+                    self._parameter_extractors(),
+                    dict(frequency=self.frequency)
+                )
+
+                c = IRCode(
+                    self,
+                    code.original_code,
+                    list(code),
+                    params
+                )
+                c._code = code
+
+                if c != self._last_code:
+                    self._last_code.repeat_timer.stop()
+                    return None
+
+            self._last_code._code = code
+            return self._last_code
+
+    def _wrap_frame(self, data: list) -> code_wrapper.CodeWrapper:
+        encoding, lead_in, lead_out, middle_timings, bursts = (
+            self._wrap_framing
+        )
+
+        if (
+            self._lead_in is not lead_in or
+            self._lead_out is not lead_out or
+            self._middle_timings is not middle_timings or
+            self._bursts is not bursts or
+            self.encoding != encoding
+        ):
+            return self._new_wrap(data)
+
+        wrap_cache = self._wrap_cache
+        if wrap_cache is None:
+            return self._new_wrap(data)
+
+        key = (self._wrap_group, self.tolerance)
+        code = wrap_cache.get(data, key)
+
+        if code is None:
+            try:
+                code = self._new_wrap(data)
+            except IRException as err:
+                # the class and not the error itself, raising the same
+                # error again would keep adding to its traceback
+                code = (err.__class__, err.args)
 
-                    if (
-                        self._repeat_bursts and
-                        self.__class__.decode == IrProtocolBase.decode
-                    ):
-                        params = dict(frequency=self.frequency)
-                        for name, start, stop in self._parameters:
-                            params[name] = code.get_value(start, stop)
-
-                        c = IRCode(
-                            self,
-                            code.original_code,
-                            list(code),
-                            params
-                        )
-                        c._code = code
-
-                        if c == self._last_code:
-                            self._last_code._code = code
-                            return self._last_code
-                        else:
-                            self._last_code.repeat_timer.stop()
-                            raise DecodeError
-
-                    self._last_code._code = code
-                    return self._last_code
-
-                except IRException:
-                    pass
-
-        code = code_wrapper.CodeWrapper(
+            wrap_cache.put(data, key, code)
+
+        if isinstance(code, tuple):
+            raise code[0](*code[1])
+
+        return code
+
+    def _new_wrap(self, data: list) -> code_wrapper.CodeWrapper:
+        return code_wrapper.CodeWrapper(
             self.encoding,
-            self._lead_in[:],
-            self._lead_out[:],
-            self._middle_timings[:],
-            self._bursts[:],
+            self._lead_in,
+            self._lead_out,
+            self._middle_timings,
+            self._bursts,
             self.tolerance,
-            data[:]
+            data,
+            self._timings,
+            self._stream_encoding
         )
 
+    def _check_frame(self, code: code_wrapper.CodeWrapper) -> int:
         if code.num_bits > self.bit_count:
-            raise TooManyBitsError(self.bit_count, ':', code.stream_pairs)
+            return REJECT_TOO_MANY_BITS
         elif code.num_bits < self.bit_count:
-            raise NotEnoughBitsError(self.bit_count, ':', code.stream_pairs)
+            return REJECT_NOT_ENOUGH_BITS
+
+        if self._checksum_rules and not self._checksum_ok(code.value):
+            return REJECT_CHECKSUM
 
-        params = dict(frequency=self.frequency)
-        for name, start, stop in self._parameters:
-            params[name] = code.get_value(start, stop)
+        return DECODED
+
+    def _build_code(self, code: code_wrapper.CodeWrapper) -> IRCode:
+        params = code.get_values(
+            self._parameter_extractors(),
+            dict(frequency=self.frequency)
+        )
 
         c = IRCode(self, code.original_code, list(code), params)
         c._code = code
@@ -439,6 +771,62 @@ class IrProtocolBase(object):
 
         return c
 
+    def _symbol_table(self, symbols=None) -> code_wrapper.SymbolTable:
+        """
+        Symbol table for protocols that match pulses against their bursts
+        themselves.
+
+        symbols defaults to the bursts. The table matches the same way
+        _match does at the current tolerance.
+        """
+        if symbols is None:
+            symbols = self._bursts
+
+        return code_wrapper.get_symbol_table(
+            self._timings,
+            symbols,
+            signed=False
+        )
+
+    def _parameter_extractors(self) -> tuple:
+        parameters = self._parameters
+
+        for compiled, extractors in self._compiled_parameters:
+            if compiled is parameters or compiled == parameters:
+                return extractors
+
+        return code_wrapper.compile_parameters(parameters)
+
+    def _verify_checksum(self, value: int) -> None:
+        if not self._checksum_ok(value):
+            raise DecodeError('Checksum failed')
+
+    def _checksum_ok(self, value: int) -> bool:
+        """
+        Checks the raw decoded bits of a frame against the checksum rules.
+
+        The first bit received is the most significant bit of value. The
+        rules get compiled the first time they are used and again if the
+        parameters, encoding or bit count they were compiled for change.
+        """
+        rules = self._checksum_rules
+        checks = self._checksum_checks.get(id(rules), None)
+
+        if checks is None or not checks.matches(
+            self._parameters,
+            self.encoding,
+            self.bit_count
+        ):
+            checks = checksum.ChecksumRules(
+                rules,
+                self._parameters,
+                self.encoding,
+                self.bit_count
+            )
+            self._checksum_checks[id(rules)] = checks
+
+        return checks(value)
+
     @classmethod
     def _build_repeat_packet(cls, repeat_count=0):
         timings = cls._repeat_lead_in[:] + cls._repeat_lead_out[:]
@@ -449,22 +837,68 @@ class IrProtocolBase(object):
         packet = [timings] * repeat_count
         return packet
 
-    def _match(self, value, expected_timing_value, tolerance=None):
+    def _bounds(self, expected_timing_value, tolerance=None):
         if tolerance is None:
-            tolerance = self.tolerance
+            return self._timings[expected_timing_value]
 
-        high = math.floor(
-            expected_timing_value +
-            (expected_timing_value * (tolerance / 100.0))
-        )
-        low = math.floor(
-            expected_timing_value -
-            (expected_timing_value * (tolerance / 100.0))
+        return code_wrapper.timing_bounds(expected_timing_value, tolerance)
+
+    def _lead_in_bounds(self, lead_in, bursts, middle_timings):
+        e_burst = lead_in[0]
+
+        if bursts and isinstance(bursts[0], int):
+            # bit streams fold any multiple of a burst into the lead in so
+            # the only thing that can be checked is the sign of the pulse
+            if e_burst > 0:
+                return [(1, MAX_PULSE)]
+            return [(-MAX_PULSE, -1)]
+
+        res = [self._bounds(e_burst)]
+
+        for burst in bursts:
+            res += [self._bounds(e_burst + burst[0])]
+
+        for timing in middle_timings:
+            if isinstance(timing, list):
+                res += [self._bounds(e_burst + timing[0])]
+
+        return res
+
+    def _first_pulse_bounds(self) -> Optional[list]:
+        """
+        Ranges the first pulse of a frame has to fall in for this decoder to
+        be able to accept the frame.
+
+        :return: list of (low, high) tuples or None if the first pulse can
+            be anything.
+        """
+        if not self._static_lead_in or not self._lead_in:
+            return None
+
+        res = self._lead_in_bounds(
+            self._lead_in,
+            self._bursts,
+            self._middle_timings
         )
 
-        # do a flip flop of the high and low so the same expression can
-        # be used when evaluating a raw timing
-        if expected_timing_value < 0:
-            low, high = high, low
+        if self._repeat_lead_in:
+            res += self._lead_in_bounds(
+                self._repeat_lead_in,
+                self._repeat_bursts,
+                []
+            )
+        elif self._repeat_lead_out:
+            return None
+
+        return res
+
+    def _match(self, value, expected_timing_value, tolerance=None):
+        if tolerance is None:
+            low, high = self._timings[expected_timing_value]
+        else:
+            low, high = code_wrapper.timing_bounds(
+                expected_timing_value,
+                tolerance
+            )
 
         return low <= value <= high
@@ -191,11 +191,14 @@ from .zaptor56 import Zaptor56 as _Zaptor56  # NOQA
 
 from .. import high_precision_timers
 from .. import thread_worker
+from .. import decoder_index
+from .. import frame_pattern
+from .. import pulse_buffer
 from ..config import Config
 
 import threading
 from collections import deque
-from typing import Optional
+from typing import Optional, List, Tuple
 
 AdNotham: protocol_base.IrProtocolBase
 Aiwa: protocol_base.IrProtocolBase
@@ -377,6 +380,9 @@ config: Config
 enabled_decoders: list
 disabled_decoders: list
 last_used_decoder: protocol_base.IrProtocolBase
+decoder_stats: dict
+adaptive_order: bool
+stream_buffer: pulse_buffer.PulseBuffer
 
 
 # noinspection PyUnusedLocal
@@ -397,11 +403,37 @@ def stream_decode(data: list, frequency: int = 0):
     pass
 
 
+# noinspection PyUnusedLocal
+def feed(pulse: int, frequency: int = 0):
+    pass
+
+
+# noinspection PyUnusedLocal
+def feed_many(pulses: list, frequency: int = 0) -> list:
+    pass
+
+
 # noinspection PyUnusedLocal
 def decode(data: list, frequency: int = 0) -> Optional[protocol_base.IRCode]:
     pass
 
 
+# noinspection PyUnusedLocal
+def decode_many(
+    frames: list,
+    frequency: int = 0
+) -> List[Optional[protocol_base.IRCode]]:
+    pass
+
+
+# noinspection PyUnusedLocal
+def decode_all(
+    data: list,
+    frequency: int = 0
+) -> List[Tuple[protocol_base.IRCode, float]]:
+    pass
+
+
 def __iter__():
     pass
 
@@ -420,92 +452,239 @@ def load_config(config_data):
     pass
 
 
+# a stream gets handed to the decoders every time a space longer than this
+# comes in, that space could be the gap after a frame
+STREAM_GAP = 2000
+
+# most pulses the decode thread takes out of the buffer at one time, it
+# checks if it has been stopped in between
+STREAM_CHUNK = 1024
+
+# most pulses a stream holds on to, no frame is anywhere near this long
+MAX_STREAM_PULSES = 1024
+
+# most places a stream remembers a frame is able to start at, each one
+# costs a decode every time a gap comes in. the first pulse that is held is
+# always one of them, the rest are the pulses after the newest gaps that
+# did not end a frame. a frame is able to have long spaces inside of it,
+# one with more of them than this only decodes if it is the first thing
+# held.
+MAX_STREAM_STARTS = 5
+
+
+class StreamDecoder(object):
+    """
+    Decodes a stream of pulses as the pulses come in.
+
+    The pulses are held until a space longer than STREAM_GAP comes in, then
+    the held pulses get decoded. When they do not decode, the pulses after
+    the newest of the earlier gaps get tried as well, a frame is able to
+    come after noise and is able to have long spaces inside of it.
+    Everything that is held gets dropped once a code comes out of it.
+
+    The number of pulses and gaps that are held is capped, so a gap never
+    costs more than MAX_STREAM_STARTS decodes however long the stream is.
+
+    This is not thread safe, every stream needs a decoder of its own.
+    """
+
+    def __init__(self, decoder, frequency=0):
+        self._decoder = decoder
+        self._pulses = []
+        # where in the held pulses a frame is able to start, the oldest
+        # first. the held pulses always start at the first one.
+        self._starts = deque([0])
+        self.frequency = frequency
+
+    @property
+    def pending(self):
+        """
+        Pulses that have come in since the last code.
+        """
+        return self._pulses[:]
+
+    def flush(self):
+        """
+        Drops the pulses that are being held.
+
+        :return: the pulses that were being held.
+        """
+        pulses = self._pulses
+        self._pulses = []
+        self._starts = deque([0])
+        return pulses
+
+    def _drop(self, count):
+        # drops the oldest pulses
+        del self._pulses[:count]
+
+        starts = self._starts
+        while starts and starts[0] <= count:
+            starts.popleft()
+
+        for i in range(len(starts)):
+            starts[i] -= count
+
+        starts.appendleft(0)
+
+    def feed(self, pulse):
+        """
+        Adds a pulse to the stream.
+
+        :return: what decode returned for the frame that ended with the
+            pulse, None if no frame ended with it.
+        """
+        pulses = self._pulses
+        pulses.append(pulse)
+
+        if len(pulses) > MAX_STREAM_PULSES:
+            if len(self._starts) > 1:
+                self._drop(self._starts[1])
+            else:
+                self._drop(len(pulses) - MAX_STREAM_PULSES)
+
+        if pulse >= -STREAM_GAP:
+            return None
+
+        count = len(pulses)
+
+        for start in self._starts:
+            if count - start <= 3:
+                break
+
+            # noinspection PyProtectedMember
+            res = self._decoder._decode(pulses[start:], self.frequency)
+
+            if res:
+                self.flush()
+                return res
+
+        if count - self._starts[-1] > 3:
+            self._starts.append(count)
+
+            if len(self._starts) > MAX_STREAM_STARTS:
+                # the first held pulse stays a start
+                del self._starts[1]
+
+        return None
+
+    def feed_many(self, pulses):
+        """
+        Adds pulses to the stream.
+
+        :return: list of what decode returned for every frame that ended
+            in the pulses.
+        """
+        res = []
+
+        for pulse in pulses:
+            code = self.feed(pulse)
+            if code is not None:
+                res.append(code)
+
+        return res
+
+
 class DecodeThread(threading.Thread):
 
-    def __init__(self, decoder):
+    def __init__(self, decoder, buffer=None):
+        if buffer is None:
+            buffer = pulse_buffer.PulseBuffer()
+
+        buffer.open()
+
         self.decoder = decoder
         self.stop_event = threading.Event()
-        self.buffer_event = threading.Event()
-        self.buffer_lock = threading.Lock()
-        self.decode_universal = False
-        self.buffer = deque()
+        self.buffer = buffer
+        self.stream = StreamDecoder(decoder)
         self.my_timer = high_precision_timers.TimerUS()
 
         threading.Thread.__init__(self)
 
     def append(self, data, frequency):
         self.my_timer.reset()
+        self.buffer.put(data, frequency)
 
-        with self.buffer_lock:
-            self.buffer.append((data, frequency))
+    def _decode_universal(self):
+        pulses = self.stream.flush()
 
-        self.buffer_event.set()
+        if len(pulses) > 6:
+            # noinspection PyProtectedMember
+            self.decoder._decode_universal(pulses, self.stream.frequency)
 
     def run(self):
+        stream = self.stream
+        buffer = self.buffer
+
         while not self.stop_event.is_set():
-            if self.decode_universal:
-                self.buffer_event.wait(0.1)
-                if not self.buffer_event.is_set():
-                    with self.buffer_lock:
-                        buf = []
-                        frequency = 0
-                        while self.buffer:
-                            b, f = self.buffer.popleft()
-                            if frequency != 0:
-                                if f != frequency:
-                                    self.buffer.appendleft((b, f))
-                                    break
-
-                            frequency = f
-                            buf += b
-
-                    if len(buf) > 6:
-                        # noinspection PyProtectedMember
-                        self.decoder._decode_universal(buf, frequency)
-                    self.decode_universal = False
+            if stream.pending:
+                # the pulses that are left over get handed to Universal
+                # when nothing else comes in for a bit
+                if not buffer.wait(0.1):
+                    if not self.stop_event.is_set():
+                        self._decode_universal()
                     continue
-            else:
-                self.buffer_event.wait()
-
-            self.buffer_event.clear()
-            buf = []
-            frequency = 0
 
-            while self.buffer:
-                b, f = self.buffer.popleft()
-                if frequency != 0:
-                    if f != frequency:
-                        self.buffer.appendleft((b, f))
-                        break
+            elif not buffer.wait():
+                continue
 
-                frequency = f
-                buf += b
+            while not self.stop_event.is_set():
+                item = buffer.get(STREAM_CHUNK)
+                if item is None:
+                    break
 
-            tmp_buf = []
-            while buf:
-                tmp_buf += [buf.pop(0)]
+                data, frequency = item
 
-                if len(tmp_buf) > 3 and tmp_buf[-1] < -2000:
-                    # noinspection PyProtectedMember
-                    if self.decoder._decode(tmp_buf[:], frequency):
-                        del tmp_buf[:]
+                if frequency != stream.frequency:
+                    self._decode_universal()
+                    stream.frequency = frequency
 
-            if tmp_buf:
-                self.buffer.appendleft((tmp_buf, frequency))
-                self.decode_universal = True
-            else:
-                self.decode_universal = False
+                stream.feed_many(data)
 
     def stop(self):
         if self.is_alive():
             self.stop_event.set()
-            self.buffer_event.set()
+            # wakes up the thread and anything waiting for room
+            self.buffer.close()
             self.join()
-            
+
 
 _process_threadworker = thread_worker.ProcessThreadWorker()
 _timer_threadworker = thread_worker.TimerThreadWorker()
 
+# decoder attributes that get copied from the live decoders to the ones
+# decode_many uses instead of being reset after each frame
+_BATCH_CONFIG = ('_enabled', '_tolerance', '_frequency_tolerance')
+
+
+def _frame_shape(data):
+    # the pulse count and duration decoders get checked against, the last
+    # pulse is left out of the duration
+    duration = 0
+    for pulse in data[:-1]:
+        duration += abs(pulse)
+
+    return len(data), duration
+
+
+def _match_score(code):
+    original_rlc = code.original_rlc
+    if original_rlc and isinstance(original_rlc[0], list):
+        original_rlc = [item for rlc in original_rlc for item in rlc]
+
+    normalized_rlc = [item for rlc in code.normalized_rlc for item in rlc]
+
+    errors = [
+        abs(abs(original) - abs(normalized)) / float(abs(normalized))
+        for original, normalized in zip(original_rlc, normalized_rlc)
+        if normalized
+    ]
+
+    if not errors:
+        return 0.0
+
+    return max(0.0, 1.0 - sum(errors) / len(errors))
+
 
 class FakeModule(object):
     _instance = None
@@ -540,11 +719,21 @@ class FakeModule(object):
         self._decoders = deque()
         self._last_code = None
         self._last_decoder = None
+        self._repeat_matcher = None
         self._timer = high_precision_timers.TimerUS()
         self._running = False
         self._repeat_code_lock = threading.Lock()
         self._decode_thread = None
         self._decode_callback = None
+        self._batch_lock = threading.Lock()
+        self._stream_lock = threading.Lock()
+        self._stream = None
+        self._stream_buffer = pulse_buffer.PulseBuffer()
+        self._batch_decoders = None
+        self._batch_index = None
+        self._batch_patterns = None
+        self._wrap_cache = decoder_index.WrapCache()
+        self._batch_wrap_cache = decoder_index.WrapCache()
 
         import inspect
 
@@ -567,6 +756,14 @@ class FakeModule(object):
                 decoder_xml = decoder.xml
                 self._config.append(decoder_xml)
 
+        for decoder in self._decoders:
+            decoder._wrap_cache = self._wrap_cache
+
+        self._lead_in_index = decoder_index.LeadInIndex(self._decoders)
+        self._frame_patterns = frame_pattern.FramePatterns(self._decoders)
+        self._decoder_stats = decoder_index.DecoderStats(self._decoders)
+        self._adaptive_order = False
+
         if FakeModule._instance is None:
             FakeModule._instance = self
         else:
@@ -585,6 +782,15 @@ class FakeModule(object):
             
         raise AttributeError(item)
     
+    def _decoder_changed(self, decoder):
+        index = self.__dict__.get('_lead_in_index', None)
+        if index is not None:
+            index.update(decoder)
+
+        patterns = self.__dict__.get('_frame_patterns', None)
+        if patterns is not None:
+            patterns.update(decoder)
+
     def bind_callback(self, callback):
         self._decode_callback = callback
 
@@ -597,7 +803,11 @@ class FakeModule(object):
 
         self._timer.reset()
         with self._repeat_code_lock:
-            code = Universal.decode(rlc, frequency)
+            # noinspection PyProtectedMember
+            code, reason = self.Universal._try_decode(rlc, frequency)
+            if reason != protocol_base.DECODED:
+                return False
+
             if self._last_code is not None:
                 if self._last_code == code:
                     self._last_code.repeat_timer.start(self._timer)
@@ -663,6 +873,54 @@ class FakeModule(object):
     def last_used_decoder(self):
         return self._last_decoder
 
+    @property
+    def decoder_stats(self):
+        """
+        Hits and attempts of every decoder.
+
+        A hit is a frame the decoder decoded and an attempt is a frame the
+        decoder scan handed to it. The score is the decayed hit count the
+        order of the decoder scan is worked out from and rank is the place
+        the decoder has in that order.
+
+        :return: dict of decoder name -> dict(hits, attempts, score, rank).
+        """
+        with self._repeat_code_lock:
+            return self._decoder_stats.stats
+
+    @property
+    def adaptive_order(self) -> bool:
+        """
+        Try the decoders that have been decoding frames lately first.
+
+        This is off by default. When a frame is accepted by more than one
+        decoder the one that has been used the most lately wins instead of
+        the one that comes first by name.
+        """
+        return self._adaptive_order
+
+    @adaptive_order.setter
+    def adaptive_order(self, value: bool):
+        with self._repeat_code_lock:
+            self._adaptive_order = bool(value)
+
+            if self._adaptive_order:
+                self._lead_in_index.reorder(self._decoder_stats.order)
+            else:
+                self._lead_in_index.reorder(self._decoders)
+
+    @property
+    def stream_buffer(self) -> pulse_buffer.PulseBuffer:
+        """
+        Buffer the pulses handed to stream_decode wait in.
+
+        The buffer holds a fixed number of pulses, its policy decides what
+        happens when pulses come in faster than they get decoded. The
+        number of pulses that got dropped and the most pulses the buffer
+        has held are kept track of as well.
+        """
+        return self._stream_buffer
+
     def __reset_last_code(self, code):
         with self._repeat_code_lock:
             if code == self._last_code:
@@ -674,36 +932,75 @@ class FakeModule(object):
 
             code.unbind_released_callback(self.__reset_last_code)
 
+    def _match_repeat(self, data, possible_decoders, frequency):
+        # a repeat of the last code gets picked up here without going
+        # through the decoder. this is checked before the decoders get
+        # filtered by frequency, a held button is most of what comes in.
+        last_code = self._last_code
+
+        if last_code is None or last_code.decoder not in possible_decoders:
+            return None
+
+        if frequency != 0 and not last_code.decoder.frequency_match(frequency):
+            return None
+
+        matcher = self._repeat_matcher
+        if matcher is None or not matcher.is_current(last_code):
+            matcher = decoder_index.RepeatMatcher(last_code)
+            self._repeat_matcher = matcher
+
+        if matcher.match_frame(data):
+            result = True
+
+        # the decoder hands back its last code for a repeat frame, that only
+        # holds while it is the same code
+        # noinspection PyProtectedMember
+        elif (
+            last_code.decoder._last_code is last_code and
+            matcher.match_repeat(data)
+        ):
+            result = last_code
+
+        else:
+            return None
+
+        last_code.repeat_timer.start(self._timer)
+        if self._decode_callback is not None:
+            _process_threadworker.add(self._decode_callback, last_code)
+
+        return result
+
     def _decode(self, data, frequency):
         self._timer.reset()
 
-        if frequency == 0:
-            possible_decoders = list(
-                decoder for decoder in self._decoders if decoder.enabled
-            )
-        else:
-            possible_decoders = list(
-                decoder for decoder in self._decoders
-                if decoder.enabled and decoder.frequency_match(frequency)
-            )
+        possible_decoders = self._lead_in_index.candidates(data[0])
 
         with self._repeat_code_lock:
+            result = self._match_repeat(data, possible_decoders, frequency)
+
+        if result is not None:
+            return result
+
+        if frequency != 0:
+            possible_decoders = self._lead_in_index.candidates(
+                data[0],
+                frequency
+            )
+
+        with self._repeat_code_lock, self._wrap_cache.scan(data):
             if (
                 self._last_code is not None and
                 self._last_code.decoder in possible_decoders
             ):
-                if data == self._last_code:
-                    self._last_code.repeat_timer.start(self._timer)
-                    if self._decode_callback is not None:
-                        _process_threadworker.add(
-                            self._decode_callback,
-                            self._last_code
-                        )
+                # noinspection PyProtectedMember
+                code, reason = self._last_code.decoder._try_decode(
+                    data,
+                    frequency
+                )
 
-                    return True
+                if reason == protocol_base.DECODED:
+                    self._decoder_stats.hit(code.decoder)
 
-                try:
-                    code = self._last_code.decoder.decode(data, frequency)
                     if code != self._last_code:
                         self._last_code = code
 
@@ -717,21 +1014,26 @@ class FakeModule(object):
 
                     return code
 
-                except DecodeError:
-                    pass
-                except RepeatLeadInError:
+                if reason == protocol_base.REPEAT_LEAD_IN:
                     self._last_decoder = self._last_code.decoder
                     return True
 
-                except (RepeatLeadOutError, RepeatTimeoutExpired):
+                if reason == protocol_base.REPEAT_LEAD_OUT:
                     return True
 
             elif (
                 self._last_decoder is not None and
                 self._last_decoder in possible_decoders
             ):
-                try:
-                    code = self._last_decoder.decode(data, frequency)
+                # noinspection PyProtectedMember
+                code, reason = self._last_decoder._try_decode(
+                    data,
+                    frequency
+                )
+
+                if reason == protocol_base.DECODED:
+                    self._decoder_stats.hit(self._last_decoder)
+
                     if code != self._last_code:
                         self._last_code = code
 
@@ -745,36 +1047,58 @@ class FakeModule(object):
 
                     return True
 
-                except DecodeError:
-                    pass
-                except RepeatLeadInError:
-                    self._last_decoder = self._last_code.decoder
-                    return True
-                except (RepeatLeadOutError, RepeatTimeoutExpired):
+                if reason in (
+                    protocol_base.REPEAT_LEAD_IN,
+                    protocol_base.REPEAT_LEAD_OUT
+                ):
+                    # the last code is able to have been released already,
+                    # the last decoder stays the same either way
                     return True
 
+            num_pulses, duration = _frame_shape(data)
+            frame = self._frame_patterns.frame(data)
+
+            # the new order is used starting with the next frame
+            order = self._decoder_stats.frame_done()
+            if order is not None and self._adaptive_order:
+                self._lead_in_index.reorder(order)
+
             for decoder in possible_decoders:
-                for code in decoder:
-                    if code == data:
+                # noinspection PyProtectedMember
+                code = decoder._saved_code_index.find(data)
+
+                if code is not None:
+                    # noinspection PyProtectedMember
+                    if decoder._last_code is not None:
                         # noinspection PyProtectedMember
-                        if decoder._last_code is not None:
-                            # noinspection PyProtectedMember
-                            decoder._last_code.repeat_timer.stop()
-                        break
+                        decoder._last_code.repeat_timer.stop()
+
+                # noinspection PyProtectedMember
+                elif not decoder._fits_shape(num_pulses, duration):
+                    continue
+
+                elif not frame.allows(decoder):
+                    continue
 
                 else:
-                    try:
-                        code = decoder.decode(data, frequency)
-                    except DecodeError:
-                        continue
+                    self._decoder_stats.attempt(decoder)
 
-                    except RepeatLeadInError:
+                    # noinspection PyProtectedMember
+                    code, reason = decoder._try_decode(data, frequency)
+
+                    if reason == protocol_base.REPEAT_LEAD_IN:
                         self._last_decoder = decoder
                         return True
 
-                    except (RepeatLeadOutError, RepeatTimeoutExpired):
+                    if reason == protocol_base.REPEAT_LEAD_OUT:
                         return True
 
+                    if reason != protocol_base.DECODED:
+                        # the decoder rejected the frame, move on to the
+                        # next one
+                        continue
+
+                self._decoder_stats.hit(decoder)
                 code.bind_released_callback(self.__reset_last_code)
                 self._last_decoder = decoder
                 self._last_code = code
@@ -788,17 +1112,11 @@ class FakeModule(object):
 
                 return code
 
-    def decode(
-        self,
-        data: list,
-        frequency: int = 0
-    ) -> Optional[protocol_base.IRCode]:
-        if not data:
-            return
-
+    @staticmethod
+    def _to_rlc(data, frequency):
         if isinstance(data, protocol_base.IRCode):
             frequency = data.frequency
-            data = data.normalized_rlc
+            data = [item for sublist in data for item in sublist]
 
         elif isinstance(data, tuple):
             data = list(data)
@@ -814,18 +1132,230 @@ class FakeModule(object):
                 except:  # NOQA
                     data = [int(x) for x in data]
 
+        return data, frequency
+
+    def decode(
+        self,
+        data: list,
+        frequency: int = 0
+    ) -> Optional[protocol_base.IRCode]:
+        if not data:
+            return
+
+        data, frequency = self._to_rlc(data, frequency)
+
         code = self._decode(data, frequency)
         if code is True:
             return None
 
         return code
 
+    def _load_batch_decoders(self):
+        # decode_many uses its own copy of every decoder so it is not able
+        # to touch any of the state the live decoders keep between frames.
+        # the copies share the compiled timing tables of the live decoders.
+        if self._batch_decoders is None:
+            batch_decoders = {}
+
+            for decoder in self._decoders:
+                batch_decoder = decoder.__class__()
+                # noinspection PyProtectedMember
+                batch_decoder._timing_tables = decoder._timing_tables
+                # noinspection PyProtectedMember
+                batch_decoder._wrap_cache = self._batch_wrap_cache
+
+                # some decoders keep their state in lists that are class
+                # attributes, the copies get lists of their own so that
+                # state is not shared with the live decoders
+                for key, value in decoder.__class__.__dict__.items():
+                    if (
+                        isinstance(value, list) and
+                        key not in batch_decoder.__dict__
+                    ):
+                        batch_decoder.__dict__[key] = value[:]
+
+                state = {}
+                for key, value in batch_decoder.__dict__.items():
+                    if key in _BATCH_CONFIG:
+                        continue
+
+                    if isinstance(value, list):
+                        value = value[:]
+
+                    state[key] = value
+
+                batch_decoders[batch_decoder] = (decoder, state)
+
+            self._batch_decoders = batch_decoders
+            self._batch_index = decoder_index.LeadInIndex(batch_decoders)
+            self._batch_patterns = frame_pattern.FramePatterns(
+                batch_decoders
+            )
+
+        # the live decoders may have been enabled, disabled or had their
+        # tolerances changed since the last batch
+        for batch_decoder, (decoder, _) in self._batch_decoders.items():
+            config = (
+                decoder.enabled,
+                decoder.tolerance,
+                decoder.frequency_tolerance
+            )
+
+            if config != (
+                batch_decoder.enabled,
+                batch_decoder.tolerance,
+                batch_decoder.frequency_tolerance
+            ):
+                batch_decoder._enabled = decoder.enabled
+                # not the setter, it clears the timing tables the copy
+                # shares with the live decoder
+                # noinspection PyProtectedMember
+                batch_decoder._tolerance = decoder._tolerance
+                # noinspection PyProtectedMember
+                batch_decoder._frequency_tolerance = (
+                    decoder._frequency_tolerance
+                )
+                self._batch_index.update(batch_decoder)
+                self._batch_patterns.update(batch_decoder)
+
+    def _reset_batch_decoder(self, batch_decoder):
+        _, state = self._batch_decoders[batch_decoder]
+
+        # attributes that did not exist when the state was taken shadow the
+        # class attributes of the same name
+        for key in list(batch_decoder.__dict__.keys()):
+            if key not in state and key not in _BATCH_CONFIG:
+                del batch_decoder.__dict__[key]
+
+        for key, value in state.items():
+            if isinstance(value, list):
+                value = value[:]
+
+            batch_decoder.__dict__[key] = value
+
+    def _batch_codes(self, data, frequency):
+        # yields the code of every decoder that accepts the frame. None gets
+        # yielded for a decoder that says the frame is a repeat or the
+        # start of a sequence
+        num_pulses, duration = _frame_shape(data)
+        frame = self._batch_patterns.frame(data)
+
+        for decoder in self._batch_index.candidates(data[0], frequency):
+            live_decoder, _ = self._batch_decoders[decoder]
+            # noinspection PyProtectedMember
+            code = live_decoder._saved_code_index.find(data)
+
+            if code is not None:
+                yield code
+                continue
+
+            # noinspection PyProtectedMember
+            if not decoder._fits_shape(num_pulses, duration):
+                continue
+
+            if not frame.allows(decoder):
+                continue
+
+            # noinspection PyProtectedMember
+            code, reason = decoder._try_decode(data, frequency)
+
+            if reason in (
+                protocol_base.REPEAT_LEAD_IN,
+                protocol_base.REPEAT_LEAD_OUT
+            ):
+                self._reset_batch_decoder(decoder)
+                yield None
+                continue
+
+            if reason != protocol_base.DECODED:
+                continue
+
+            self._reset_batch_decoder(decoder)
+            code._decoder = live_decoder
+            yield code
+
+    def decode_many(
+        self,
+        frames: list,
+        frequency: int = 0
+    ) -> List[Optional[protocol_base.IRCode]]:
+        """
+        Decodes a batch of frames.
+
+        Every frame is decoded on its own. There are no repeat timers or
+        callbacks and nothing is carried over from one frame to the next,
+        so repeat frames and the first frame of a sequence decode to None.
+        The state used by decode and stream_decode is left alone.
+
+        :param frames: iterable of frames, each frame can be anything that
+            decode accepts.
+        :param frequency: frequency of the frames, frames that are IRCode
+            instances or pronto codes use their own frequency.
+
+        :return: list holding the decoded IRCode or None for every frame.
+        """
+        res = []
+
+        with self._batch_lock:
+            self._load_batch_decoders()
+
+            for data in frames:
+                if not data:
+                    res.append(None)
+                    continue
+
+                data, frame_frequency = self._to_rlc(data, frequency)
+                codes = self._batch_codes(data, frame_frequency)
+
+                with self._batch_wrap_cache.scan(data):
+                    # same as decode, the first decoder to answer wins
+                    res.append(next(codes, None))
+
+        return res
+
+    def decode_all(
+        self,
+        data: list,
+        frequency: int = 0
+    ) -> List[Tuple[protocol_base.IRCode, float]]:
+        """
+        Decodes a frame using every decoder that is able to.
+
+        The frame is decoded the same way decode_many decodes a frame
+        except all of the decoders get a chance to decode it. Decoders
+        that say the frame is a repeat or the start of a sequence are left
+        out.
+
+        :param data: frame, can be anything that decode accepts.
+        :param frequency: frequency of the frame.
+
+        :return: list of (code, score) tuples in the order decode tries
+            the decoders, so the first code is the one decode_many returns
+            for the frame. The score is how closely the frame matches the
+            timings of the code, 1.0 being a perfect match.
+        """
+        if not data:
+            return []
+
+        data, frequency = self._to_rlc(data, frequency)
+
+        with self._batch_lock:
+            self._load_batch_decoders()
+
+            with self._batch_wrap_cache.scan(data):
+                codes = [
+                    code for code in self._batch_codes(data, frequency)
+                    if code is not None
+                ]
+
+        return [(code, _match_score(code)) for code in codes]
+
     def stream_decode(self, data: list, frequency: int = 0):
         if not data:
             return
 
         if self._decode_thread is None:
-            self._decode_thread = DecodeThread(self)
+            self._decode_thread = DecodeThread(self, self._stream_buffer)
             self._decode_thread.start()
 
         if isinstance(data, protocol_base.IRCode):
@@ -848,6 +1378,52 @@ class FakeModule(object):
 
         self._decode_thread.append(data, frequency)
 
+    def _feed_stream(self, frequency):
+        stream = self._stream
+
+        if stream is None:
+            stream = self._stream = StreamDecoder(self, frequency)
+
+        elif stream.frequency != frequency:
+            # a different frequency is a different remote, what was left
+            # over of the last one is not going to turn into a frame
+            stream.flush()
+            stream.frequency = frequency
+
+        return stream
+
+    def feed(self, pulse: int, frequency: int = 0):
+        """
+        Decodes a stream one pulse at a time.
+
+        Same as stream_decode except the pulses get decoded in the thread
+        that hands them over. A frame is decoded as soon as the gap after
+        it comes in. Pulses that do not turn into a frame are dropped when
+        the frequency changes, Universal is not used.
+
+        :param pulse: mark (positive) or space (negative) in microseconds.
+        :param frequency: frequency of the stream.
+
+        :return: what decode returned for the frame that ended with the
+            pulse or None if no frame ended with it.
+        """
+        with self._stream_lock:
+            return self._feed_stream(frequency).feed(pulse)
+
+    def feed_many(self, pulses: list, frequency: int = 0) -> list:
+        """
+        Decodes a stream a chunk of pulses at a time.
+
+        :param pulses: marks (positive) and spaces (negative) in
+            microseconds, where a chunk starts or ends does not matter.
+        :param frequency: frequency of the stream.
+
+        :return: list of what decode returned for every frame that ended in
+            the pulses.
+        """
+        with self._stream_lock:
+            return self._feed_stream(frequency).feed_many(pulses)
+
     @property
     def enabled_decoders(self):
         res = []
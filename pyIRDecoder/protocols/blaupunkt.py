@@ -81,28 +81,26 @@ class Blaupunkt(protocol_base.IrProtocolBase):
         sum(abs(item) for item in _lead_in) + abs(_lead_out2[0])
     )
 
-    _saved_codes = []
-
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
         self._lead_out = self._lead_out1
 
         try:
             code = protocol_base.IrProtocolBase.decode(self, data, frequency)
             if code.c0 != 1:
-                del self._saved_codes[:]
+                del self._sequence[:]
                 raise DecodeError
             if code.device != 7:
-                del self._saved_codes[:]
+                del self._sequence[:]
                 raise DecodeError
             if code.function != 63:
-                del self._saved_codes[:]
+                del self._sequence[:]
                 raise DecodeError
 
-            if len(self._saved_codes) == 2:
+            if len(self._sequence) == 2:
                 device = self._last_code.device
                 function = self._last_code.function
 
-                del self._saved_codes[:]
+                del self._sequence[:]
                 self._last_code += code
                 # noinspection PyProtectedMember
                 self._last_code._data['F'] = function
@@ -110,23 +108,23 @@ class Blaupunkt(protocol_base.IrProtocolBase):
                 self._last_code._data['D'] = device
                 raise RepeatLeadOutError
 
-            elif not self._saved_codes:
-                self._saved_codes.append(code)
+            elif not self._sequence:
+                self._sequence.append(code)
                 raise RepeatLeadInError
             else:
-                del self._daved_codes[:]
+                del self._sequence[:]
                 raise DecodeError
         except LeadOutError:
             self._lead_out = self._lead_out2
             code = protocol_base.IrProtocolBase.decode(self, data, frequency)
 
             if code.c0 != 1:
-                del self._saved_codes[:]
+                del self._sequence[:]
                 raise DecodeError
 
-            if len(self._saved_codes) == 1:
-                code += self._saved_codes[0]
-                self._saved_codes.append(code)
+            if len(self._sequence) == 1:
+                code += self._sequence[0]
+                self._sequence.append(code)
 
         if self._last_code is not None:
             if self._last_code == code:
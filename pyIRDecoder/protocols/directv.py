@@ -52,6 +52,7 @@ class DirecTV(protocol_base.IrProtocolBase):
     frequency = 38000
     bit_count = 16
     encoding = 'msb'
+    _static_shape = False
 
     _lead_in1 = [TIMING * 10, -TIMING * 2]
     _lead_in2 = []
@@ -97,6 +98,9 @@ class DirecTV(protocol_base.IrProtocolBase):
     _saved_code = None
 
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
+        if len(data) < 2:
+            raise DecodeError('code not long enough')
+
         cleaned_code = []
         original_code = data[:]
         code = data[:]
@@ -129,6 +133,9 @@ class DirecTV(protocol_base.IrProtocolBase):
             original_code = self._saved_code[0][:] + original_code[:]
             self._saved_code = None
 
+        if len(code) % 2:
+            raise DecodeError('frame has to be made of mark and space pairs')
+
         decoded = []
 
         for i in range(0, len(code), 2):
@@ -52,6 +52,8 @@ class DirecTV0(protocol_base.IrProtocolBase):
     frequency = 40000
     bit_count = 16
     encoding = 'msb'
+    _static_lead_in = False
+    _static_shape = False
 
     _lead_in = []
     _lead_in1 = [TIMING * 10, -TIMING * 2]
@@ -131,6 +133,9 @@ class DirecTV0(protocol_base.IrProtocolBase):
             else:
                 raise LeadOutError
 
+        if len(code) % 2:
+            raise DecodeError('frame has to be made of mark and space pairs')
+
         decoded = []
         for i in range(0, len(code), 2):
             mark = code[i]
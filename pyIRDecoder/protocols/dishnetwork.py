@@ -41,6 +41,8 @@ class DishNetwork(protocol_base.IrProtocolBase):
     frequency = 57600
     bit_count = 16
     encoding = 'lsb'
+    _static_lead_in = False
+    _static_shape = False
 
     _lead_in = [TIMING, -TIMING * 15]
     _lead_out = [TIMING, -TIMING * 15]
@@ -53,6 +53,7 @@ class Epson(protocol_base.IrProtocolBase):
     frequency = 38400
     bit_count = 26
     encoding = 'msb'
+    _static_repeat = False
     _enabled = False
 
     _lead_in = [TIMING * 4, -TIMING]
@@ -155,6 +156,9 @@ class Epson(protocol_base.IrProtocolBase):
         else:
             raise LeadOutError
 
+        if len(code) % 2:
+            raise DecodeError('frame has to be made of mark and space pairs')
+
         code_bits = []
         second_code_bits = []
 
@@ -302,6 +306,8 @@ class Epson(protocol_base.IrProtocolBase):
                     params
                 )
                 self._partial_code = None
+            else:
+                raise DecodeError('second frame without the first frame')
 
         else:
             self._partial_code = code
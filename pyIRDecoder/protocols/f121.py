@@ -84,6 +84,9 @@ class F121(protocol_base.IrProtocolBase):
             for mb in self._middle_timings1:
                 middle_bursts[mb + space] = space
 
+        if len(data) % 2:
+            raise DecodeError('frame has to end with a space')
+
         new_code = []
 
         for i in range(0, len(data), 2):
@@ -44,6 +44,8 @@ class GICable(protocol_base.IrProtocolBase):
     frequency = 38700
     bit_count = 16
     encoding = 'lsb'
+    _static_repeat = False
+    _static_shape = False
 
     _lead_in = [TIMING * 18, -TIMING * 9]
     _lead_out = [TIMING, -TIMING * 84]
@@ -98,6 +100,9 @@ class GICable(protocol_base.IrProtocolBase):
             return True
 
         for i in range(start, -1, -1):
+            if not data:
+                return False
+
             timing = lead_out[i]
             burst = data.pop(len(data) - 1)
             if not self._match(burst, timing):
@@ -128,6 +133,9 @@ class GICable(protocol_base.IrProtocolBase):
 
     def _c_lead_in(self, data: list, lead_in: list, bursts: list) -> bool:
         for i, timing in enumerate(lead_in):
+            if not data:
+                return False
+
             burst = data.pop(0)
             if not self._match(burst, timing):
                 if (
@@ -49,6 +49,8 @@ class Grundig16(protocol_base.IrProtocolBase):
     frequency = 35700
     bit_count = 16
     encoding = 'msb'
+    _static_repeat = False
+    _static_shape = False
 
     _lead_in = [806, -2960, 1346]
     _lead_out = [-TIMING * 100]
@@ -80,6 +82,9 @@ class Grundig16(protocol_base.IrProtocolBase):
     ]
 
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
+        if len(data) <= len(self._lead_in):
+            raise DecodeError('code not long enough')
+
         normalized_code = []
         code = data[:]
         original_code = data[:]
@@ -106,6 +111,9 @@ class Grundig16(protocol_base.IrProtocolBase):
                 except ValueError:
                     raise DecodeError
 
+                if len(timings) < len(bursts):
+                    continue
+
                 for j, burst in enumerate(bursts):
                     timing = timings[j]
                     if not self._match(timing, burst):
@@ -53,6 +53,7 @@ class Humax4Phase(protocol_base.IrProtocolBase):
     frequency = 56000
     bit_count = 22
     encoding = 'msb'
+    _static_shape = False
 
     _lead_in = [TIMING * 2, -TIMING * 2]
     _lead_out = [95000]
@@ -77,6 +78,10 @@ class Humax4Phase(protocol_base.IrProtocolBase):
         ['F', 14, 20],
         ['F_CHECKSUM', 21, 21]
     ]
+
+    _checksum_rules = (
+        ('F_CHECKSUM', '~', 'F'),
+    )
     # [D:0..63,S:0..63,F:0..127]
     encode_parameters = [
         ['device', 0, 63],
@@ -91,6 +96,9 @@ class Humax4Phase(protocol_base.IrProtocolBase):
         return function[True:1:0]
 
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
+        if len(data) < 3:
+            raise DecodeError('code not long enough')
+
         cleaned_code = []
         original_code = data[:]
         code = data[:]
@@ -142,6 +150,9 @@ class Humax4Phase(protocol_base.IrProtocolBase):
             except ValueError:
                 break
 
+            if len(timings) < 2:
+                raise DecodeError('frame ends with a mark')
+
             for bursts in self._bursts:
                 if (
                     self._match(timings[0], bursts[0]) and
@@ -173,32 +184,30 @@ class Humax4Phase(protocol_base.IrProtocolBase):
         if code:
             raise IRStreamError
 
-        decoded = []
+        # every pair is 2 bits
+        decoded_code = 0
+        num_bits = len(pairs) * 2
 
         for pair in pairs:
             num = self._bursts.index(pair)
-            decoded.extend([num >> 1 & 1, num & 1])
+            decoded_code = decoded_code << 2 | num
             cleaned_code.extend(pair)
 
-        if len(decoded) > self.bit_count:
+        if num_bits > self.bit_count:
             raise TooManyBitsError
-        if len(decoded) < self.bit_count:
+        if num_bits < self.bit_count:
             raise NotEnoughBitsError
 
-        params = dict(frequency=self.frequency)
-
-        for param, start_bit, stop_bit in self._parameters:
-            value = 0
+        self._verify_checksum(decoded_code)
 
-            for i in range(start_bit, stop_bit + 1):
-                value |= decoded[i] << (~i + stop_bit + 1)
-
-            params[param] = protocol_base.IntegerWrapper(
-                value,
-                stop_bit + 1 - start_bit,
-                self._bursts,
-                self.encoding
-            )
+        params = protocol_base.code_wrapper.extract_values(
+            self._parameter_extractors(),
+            decoded_code,
+            num_bits,
+            self.encoding,
+            self._bursts,
+            dict(frequency=self.frequency)
+        )
 
         normalized_code = []
 
@@ -225,11 +234,6 @@ class Humax4Phase(protocol_base.IrProtocolBase):
             params
         )
 
-        f_checksum = self._calc_checksum(code.function)
-
-        if f_checksum != code.f_checksum:
-            raise DecodeError('Invalid checksum')
-
         if code.toggle == 0:
             if self._last_code is not None:
                 self._last_code.repeat_timer.stop()
@@ -50,6 +50,7 @@ class Kathrein(protocol_base.IrProtocolBase):
     _bit_count2 = 8
 
     encoding = 'lsb'
+    _static_shape = False
 
     _lead_in = [TIMING * 16, -TIMING * 8]
     _lead_out = [TIMING, 105000]
@@ -27,7 +27,6 @@
 
 # Local imports
 from . import protocol_base
-from . import DecodeError
 
 
 TIMING = 564
@@ -66,6 +65,10 @@ class NEC(protocol_base.IrProtocolBase):
         ['F', 16, 23],
         ['F_CHECKSUM', 24, 31],
     ]
+
+    _checksum_rules = (
+        ('F_CHECKSUM', '~', 'F'),
+    )
     # [D:0..255,S:0..255=255-D,F:0..255]
     encode_parameters = [
         ['device', 0, 255],
@@ -81,10 +84,6 @@ class NEC(protocol_base.IrProtocolBase):
 
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
         code = protocol_base.IrProtocolBase.decode(self, data, frequency)
-        func_checksum = self._calc_checksum(code.function)
-
-        if func_checksum != code.f_checksum:
-            raise DecodeError('Checksum failed')
 
         if self._last_code is not None:
             if self._last_code == code:
@@ -28,6 +28,7 @@
 # Local imports
 from . import protocol_base
 from . import (
+    DecodeError,
     IRStreamError,
     LeadInError,
     LeadOutError,
@@ -50,6 +51,7 @@ class Nokia12(protocol_base.IrProtocolBase):
     frequency = 36000
     bit_count = 12
     encoding = 'msb'
+    _static_shape = False
 
     _lead_in = [int(TIMING * 15), int(-TIMING * 10)]
     _lead_out = [int(TIMING * 6), 100000]
@@ -77,6 +79,9 @@ class Nokia12(protocol_base.IrProtocolBase):
     ]
 
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
+        if len(data) < 4:
+            raise DecodeError('code not long enough')
+
         normalized_code = []
         code = data[:]
         decoded = []
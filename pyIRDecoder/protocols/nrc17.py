@@ -80,8 +80,9 @@ class NRC17(protocol_base.IrProtocolBase):
 
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
 
+        # temporary tolerance, see XMP.decode
         tolerance = self.tolerance
-        self.tolerance = 5
+        self._tolerance = 5
         lead_outs = (
             self._lead_out1[:], self._lead_out2[:], self._lead_out3[:]
         )
@@ -95,10 +96,10 @@ class NRC17(protocol_base.IrProtocolBase):
             except IRException:
                 continue
         else:
-            self.tolerance = tolerance
+            self._tolerance = tolerance
             raise DecodeError('Invalid code')
 
-        self.tolerance = tolerance
+        self._tolerance = tolerance
 
         if code.c0 != 1:
             raise DecodeError('Invalid checksum')
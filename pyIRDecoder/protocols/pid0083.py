@@ -47,6 +47,7 @@ class PID0083(protocol_base.IrProtocolBase):
     frequency = 42300
     bit_count = 5
     encoding = 'lsb'
+    _static_shape = False
 
     _lead_in = []
     _lead_out = [TIMING, -TIMING * 27]
@@ -69,6 +70,9 @@ class PID0083(protocol_base.IrProtocolBase):
     ]
 
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
+        if len(data) < 2:
+            raise DecodeError('code not long enough')
+
         mark, space = data[-2:]
 
         if (
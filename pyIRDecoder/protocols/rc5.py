@@ -27,7 +27,7 @@
 
 # Local imports
 from . import protocol_base
-from . import DecodeError, RepeatLeadOutError
+from . import RepeatLeadOutError
 
 
 TIMING = 889
@@ -60,6 +60,10 @@ class RC5(protocol_base.IrProtocolBase):
         ['D', 2, 6],
         ['F', 7, 12],
     ]
+
+    _checksum_rules = (
+        ('CHECKSUM', '~', ('F', 1, 6)),
+    )
     # [D:0..31,F:0..127,T@:0..1=0]
     encode_parameters = [
         ['device', 0, 31],
@@ -75,10 +79,6 @@ class RC5(protocol_base.IrProtocolBase):
     def decode(self, data, frequency=0):
         code = protocol_base.IrProtocolBase.decode(self, data, frequency)
 
-        checksum = self._calc_checksum(code.function)
-        if checksum != code.checksum:
-            raise DecodeError('Invalid checksum')
-
         if self._last_code is not None:
             if (
                 self._last_code == code and
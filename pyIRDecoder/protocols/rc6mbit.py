@@ -30,6 +30,7 @@ from . import protocol_base
 from . import (
     DecodeError,
     LeadInError,
+    NotEnoughBitsError,
     RepeatLeadOutError,
     EncodeError
 )
@@ -73,6 +74,9 @@ class RC6MBIT(protocol_base.IrProtocolBase):
     ]
 
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
+        if len(data) < 2:
+            raise DecodeError('code not long enough')
+
         code = data[:]
         normalized_code = []
         decoded = []
@@ -161,6 +165,10 @@ class RC6MBIT(protocol_base.IrProtocolBase):
                 else:
                     raise DecodeError
 
+        # the bits in front of the code have to be there
+        if len(decoded) <= self._parameters[-2][2]:
+            raise NotEnoughBitsError
+
         params = dict(frequency=self.frequency)
 
         for key, start_bit, stop_bit in self._parameters[:-1]:
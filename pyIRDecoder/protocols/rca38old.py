@@ -43,6 +43,8 @@ class RCA38Old(protocol_base.IrProtocolBase):
     frequency = 38700
     bit_count = 24
     encoding = 'msb'
+    _static_lead_in = False
+    _static_shape = False
 
     _lead_in = []
     _lead_in1 = [TIMING * 40, -TIMING * 8]
@@ -55,6 +55,7 @@ class Rs200(protocol_base.IrProtocolBase):
     frequency = 35700
     bit_count = 26
     encoding = 'msb'
+    _static_shape = False
 
     _lead_in = []
     _lead_out = [-35854]
@@ -129,6 +130,9 @@ class Rs200(protocol_base.IrProtocolBase):
 
         code += [self._bursts[0][1]]
 
+        if len(code) % 2:
+            raise DecodeError('frame has to be made of mark and space pairs')
+
         decoded = []
         for i in range(0, len(code), 2):
             mark = code[i]
@@ -42,6 +42,9 @@ class Universal(protocol_base.IrProtocolBase):
         bits = []
 
         bursts = norm_data[2:]
+        if len(bursts) < 2 or len(bursts) % 2:
+            raise DecodeError('frame has to be made of mark and space pairs')
+
         for i in range(0, len(bursts), 2):
             mark, space = bursts[i], bursts[i + 1]
 
@@ -245,6 +248,9 @@ class Universal(protocol_base.IrProtocolBase):
             if norm_data.count(item) == 1:
                 norm_data.remove(item)
 
+        if not norm_data:
+            raise DecodeError('code does not have any repeating timings')
+
         if norm_data[0] < 0:
             norm_data = norm_data[1:]
 
@@ -284,6 +290,9 @@ class Universal(protocol_base.IrProtocolBase):
 
         try:
             code = self.__decode_1(norm_data[:])
+        except DecodeError:
+            # the frame is not made of mark and space pairs
+            code = self.__decode_2(norm_data[:])
         except:  # NOQA
             import traceback
             traceback.print_exc()
@@ -46,6 +46,8 @@ class X10n(protocol_base.IrProtocolBase):
     _bit_count1 = 9
     _bit_count2 = 10
     encoding = 'lsb'
+    _static_lead_in = False
+    _static_repeat = False
 
     _lead_in = []
     _lead_out = [TIMING * 21, -TIMING * 7]
@@ -97,10 +99,15 @@ class X10n(protocol_base.IrProtocolBase):
 
             code = protocol_base.IrProtocolBase.decode(self, data, frequency)
 
-        if self._first_code is None and self._last_code is None:
+        if self._first_code is not None:
+            first_code = self._first_code
+        elif self._last_code is not None:
+            # the second frame repeating the code that was decoded last
+            first_code = self._last_code
+        else:
             raise DecodeError
 
-        if code.function != self._first_code.function:
+        if code.function != first_code.function:
             self._first_code = None
             raise DecodeError('Invalid checksum')
 
@@ -119,6 +126,9 @@ class X10n(protocol_base.IrProtocolBase):
             code = self._first_code
             self._first_code = None
 
+        else:
+            return self._last_code
+
         if self._last_code is not None:
 
             if self._last_code == code:
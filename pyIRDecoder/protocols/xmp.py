@@ -121,6 +121,29 @@ class XMP(protocol_base.IrProtocolBase):
         ['F', 16, 31]
     ]
 
+    # {C1=-(S+S::4+15+OEM+OEM::4+D+D::4),C2=-(S+S::4+T+F+F::4+F::8+F::12)}
+    # only the low 4 bits of the sums are kept so S+S::4 is S1+S2
+    _checksum_rules1 = (
+        ('C3', '=', 15),
+        ('S3', '=', 'S1'),
+        ('S4', '=', 'S2'),
+        ('C1', '-', 'S1', 'S2', 15, 'OEM', ('OEM', 4, 4), 'D', ('D', 4, 4)),
+        (
+            'C2', '-', 'S1', 'S2', 'T',
+            'F', ('F', 12, 4), ('F', 8, 8), ('F', 4, 12)
+        )
+    )
+    _checksum_rules2 = (
+        ('C3', '=', 15),
+        ('C1', '-', 'S1', 'S2', 15, 'OEM', ('OEM', 4, 4), 'D', ('D', 4, 4))
+    )
+    _checksum_rules3 = (
+        (
+            'C2', '-', 'S3', 'S4', 'T',
+            'F', ('F', 12, 4), ('F', 8, 8), ('F', 4, 12)
+        ),
+    )
+
     # [F:0..65535,D:0..255,S:0..255,OEM:0..255=68]
     _encode_params = [
         ['function', 0, 65535],
@@ -165,9 +188,13 @@ class XMP(protocol_base.IrProtocolBase):
         code: list,
         lead_out: list
     ) -> protocol_base.IRCode:
-        decoded = []
+        decoded_code = 0
+        num_bits = 0
         original_code = code[:]
 
+        if len(code) < 2:
+            raise DecodeError('code not long enough')
+
         e_mark, e_space = lead_out
         mark, space = code[-2:]
         code = code[:-2]
@@ -178,21 +205,26 @@ class XMP(protocol_base.IrProtocolBase):
         ):
             raise LeadOutError
 
+        if len(code) % 2:
+            raise DecodeError('frame has to be made of mark and space pairs')
+
         normalized_code = []
+        symbols = self._symbol_table()
 
         for i in range(0, len(code), 2):
             mark = code[i]
             space = code[i + 1]
-            for j, (e_mark, e_space) in enumerate(self._bursts):
-                if (
-                    self._match(mark, e_mark) and
-                    self._match(space, e_space)
-                ):
-                    normalized_code.extend([e_mark, e_space])
-                    for k in range(3, -1, -1):
-                        decoded.append((j >> k) & 1)
-                    break
+            j = symbols.find_pair(mark, space)
+
+            if j != -1:
+                e_mark, e_space = self._bursts[j]
+                normalized_code.extend([e_mark, e_space])
+                decoded_code = decoded_code << 4 | j
+                num_bits += 4
             else:
+                if not self._middle_timings:
+                    raise DecodeError('Invalid burst pair')
+
                 e_mark, e_space = self._middle_timings
                 if (
                     not self._match(mark, e_mark) or
@@ -202,26 +234,22 @@ class XMP(protocol_base.IrProtocolBase):
 
                 normalized_code.extend([e_mark, e_space])
 
-        if len(decoded) < self.bit_count:
+        if num_bits < self.bit_count:
             raise NotEnoughBitsError
-        elif len(decoded) > self.bit_count:
-            print(len(decoded), ':', self.bit_count)
+        elif num_bits > self.bit_count:
+            print(num_bits, ':', self.bit_count)
             raise TooManyBitsError(str(original_code))
 
-        params = dict(frequency=self.frequency)
-
-        for param, start, stop in self._parameters:
-            value = 0
-
-            for i in range(start, stop + 1):
-                value |= decoded[i] << (~i + stop + 1)
+        self._verify_checksum(decoded_code)
 
-            params[param] = protocol_base.IntegerWrapper(
-                value,
-                stop + 1 - start,
-                self._bursts,
-                self.encoding
-            )
+        params = protocol_base.code_wrapper.extract_values(
+            self._parameter_extractors(),
+            decoded_code,
+            num_bits,
+            self.encoding,
+            self._bursts,
+            dict(frequency=self.frequency)
+        )
 
         normalized_code.extend(lead_out[:])
 
@@ -234,76 +262,72 @@ class XMP(protocol_base.IrProtocolBase):
         return code
 
     def decode(self, data: list, frequency: int = 0) -> protocol_base.IRCode:
+        # this is only for the duration of the decode so the setter gets
+        # bypassed, going through it would re-index the decoder every frame
         tolerance = self.tolerance
-        self.tolerance = 2
+        self._tolerance = 2
 
         self.bit_count = self._bit_count1
-        self._parameters = self._parameters1[:]
+        self._parameters = self._parameters1
+        self._checksum_rules = self._checksum_rules1
         self._lead_out = self._lead_out1
         self._middle_timings = self._lead_out2
 
         try:
             code = self._process_code(data[:], self._lead_out[:])
-            self.tolerance = tolerance
+            self._tolerance = tolerance
         except LeadOutError:
             self.bit_count = self._bit_count2
-            self._parameters = self._parameters2[:]
+            self._parameters = self._parameters2
+            self._checksum_rules = self._checksum_rules2
             self._lead_out = self._lead_out2
             self._middle_timings = []
             try:
                 code = self._process_code(data[:], self._lead_out[:])
             except IRException:
-                self.tolerance = tolerance
+                self._tolerance = tolerance
                 raise
 
             self._prefix_code = code
-            self.tolerance = tolerance
+            self._tolerance = tolerance
             raise RepeatLeadInError
 
+        except (DecodeError, TooManyBitsError):
+            # a frame that fails its checksum rules ends up here
+            self._tolerance = tolerance
+            raise
+
         except NotEnoughBitsError:
             if self._prefix_code is None:
+                self._tolerance = tolerance
                 raise DecodeError('Invalid code')
 
             self.bit_count = self._bit_count2
-            self._parameters = self._parameters3[:]
+            self._parameters = self._parameters3
+            self._checksum_rules = self._checksum_rules3
             self._middle_timings = []
             try:
                 code = self._process_code(data[:], self._lead_out[:])
             except IRException:
-                self.tolerance = tolerance
+                self._tolerance = tolerance
                 raise
 
-            self.tolerance = tolerance
+            self._tolerance = tolerance
             self._prefix_code += code
             code = self._prefix_code
             self._prefix_code = None
 
-        if code.c3 != 15:
-            raise DecodeError('Invalid checksum')
+            # the checksum rules of each frame have been checked, the only
+            # thing left is the sub device being the same in both frames
+            if code.s1 != code.s3:
+                raise DecodeError('Invalid checksum')
 
-        if code.s1 != code.s3:
-            raise DecodeError('Invalid checksum')
-
-        if code.s2 != code.s4:
-            raise DecodeError('Invalid checksum')
+            if code.s2 != code.s4:
+                raise DecodeError('Invalid checksum')
 
         # noinspection PyProtectedMember
         code._data['S'] = code.s1 << 4 | code.s2
 
-        c1, c2 = self._calc_checksum(
-            code.function,
-            code.device,
-            code.sub_device,
-            code.oem,
-            code.toggle
-        )
-
-        if c1 != code.c1:
-            raise DecodeError('invalid checksum')
-
-        if c2 != code.c2:
-            raise DecodeError('Invalid checksum')
-
         if self._last_code is not None:
             if code.toggle == 0 and self._last_code == code:
                 return self._last_code
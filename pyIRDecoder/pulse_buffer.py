@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in 
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, 
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN 
+# THE SOFTWARE.
+
+# ****************************************************************************
+
+
+# The pulses handed to stream_decode wait here until the decode thread gets
+# to them. The buffer holds a fixed number of pulses in an array that gets
+# written to and read from in a circle, so the memory it uses does not grow
+# when pulses come in faster than they get decoded. What happens to pulses
+# that do not fit is up to the overflow policy.
+
+import array
+import collections
+import threading
+
+
+# the oldest pulses in the buffer make room for the new ones
+DROP_OLDEST = 'drop_oldest'
+# the new pulses that do not fit are thrown away
+DROP_NEWEST = 'drop_newest'
+# whoever is adding pulses waits until there is room for them
+BLOCK = 'block'
+
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+# number of pulses the buffer holds unless told otherwise
+DEFAULT_CAPACITY = 65536
+
+
+class PulseBuffer(object):
+    """
+    Fixed size buffer of pulses.
+
+    Every pulse is stored along with the frequency it came in with, pulses
+    come back out in the order they went in, grouped by frequency.
+
+    :param capacity: number of pulses the buffer is able to hold.
+    :param policy: what to do with pulses that do not fit, one of
+        DROP_OLDEST, DROP_NEWEST or BLOCK.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, policy=DROP_OLDEST):
+        if capacity < 1:
+            raise ValueError('capacity has to be at least 1')
+
+        self._lock = threading.Condition()
+        self._pulses = array.array('l', [0]) * capacity
+        self._capacity = capacity
+        self._start = 0
+        self._size = 0
+        # [frequency, number of pulses] of the pulses in the buffer
+        self._runs = collections.deque()
+        self._dropped = 0
+        self._high_water = 0
+        self._closed = False
+        self._policy = None
+
+        self.policy = policy
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @policy.setter
+    def policy(self, value: str):
+        if value not in POLICIES:
+            raise ValueError('unknown overflow policy: ' + repr(value))
+
+        with self._lock:
+            self._policy = value
+            # anyone waiting for room has to look at the new policy
+            self._lock.notify_all()
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of pulses that have been thrown away because they did not
+        fit.
+        """
+        return self._dropped
+
+    @property
+    def high_water(self) -> int:
+        """
+        Most pulses the buffer has held at one time.
+        """
+        return self._high_water
+
+    @property
+    def closed(self) -> bool:
+        """
+        A closed buffer does not take any pulses, nobody is going to read
+        them.
+        """
+        return self._closed
+
+    def open(self) -> None:
+        with self._lock:
+            self._closed = False
+
+    def close(self) -> None:
+        """
+        Closes the buffer and removes every pulse from it.
+
+        Anything waiting for room or for pulses returns right away.
+        """
+        with self._lock:
+            self._closed = True
+            self._start = 0
+            self._size = 0
+            self._runs.clear()
+            self._lock.notify_all()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self._dropped = 0
+            self._high_water = self._size
+
+    def __len__(self):
+        return self._size
+
+    def clear(self) -> None:
+        """
+        Removes every pulse from the buffer, they are not counted as dropped.
+        """
+        with self._lock:
+            self._start = 0
+            self._size = 0
+            self._runs.clear()
+            self._lock.notify_all()
+
+    def _write(self, pulses, frequency):
+        # the caller makes sure there is room for the pulses
+        count = len(pulses)
+        if not count:
+            return
+
+        end = (self._start + self._size) % self._capacity
+        first = min(count, self._capacity - end)
+
+        self._pulses[end:end + first] = pulses[:first]
+        if first < count:
+            self._pulses[:count - first] = pulses[first:]
+
+        self._size += count
+        self._high_water = max(self._high_water, self._size)
+
+        runs = self._runs
+        if runs and runs[-1][0] == frequency:
+            runs[-1][1] += count
+        else:
+            runs.append([frequency, count])
+
+    def _drop_oldest(self, count):
+        self._start = (self._start + count) % self._capacity
+        self._size -= count
+        self._dropped += count
+
+        runs = self._runs
+        while count:
+            run = runs[0]
+            if run[1] > count:
+                run[1] -= count
+                break
+
+            count -= run[1]
+            runs.popleft()
+
+    def put(self, pulses, frequency=0, timeout=None) -> int:
+        """
+        Adds pulses to the buffer.
+
+        :param pulses: marks and spaces in microseconds.
+        :param frequency: frequency the pulses came in with.
+        :param timeout: seconds to wait for room when the policy is BLOCK,
+            None waits for as long as it takes. The pulses that are still
+            waiting for room when the time is up are dropped.
+
+        :return: number of pulses that were added.
+        """
+        try:
+            pulses = array.array('l', pulses)
+        except TypeError:
+            pulses = array.array('l', (int(pulse) for pulse in pulses))
+
+        count = len(pulses)
+        capacity = self._capacity
+
+        with self._lock:
+            if self._closed:
+                return 0
+
+            if self._policy == DROP_OLDEST:
+                if count > capacity:
+                    self._dropped += count - capacity
+                    pulses = pulses[-capacity:]
+                    count = capacity
+
+                overflow = self._size + count - capacity
+                if overflow > 0:
+                    self._drop_oldest(overflow)
+
+                self._write(pulses, frequency)
+                stored = count
+
+            elif self._policy == DROP_NEWEST:
+                stored = min(count, capacity - self._size)
+                self._dropped += count - stored
+                self._write(pulses[:stored], frequency)
+
+            else:
+                stored = 0
+                while stored < count:
+                    if self._closed:
+                        # the buffer got closed while waiting, closing it
+                        # also emptied it so this has to come first
+                        break
+
+                    room = capacity - self._size
+
+                    if room:
+                        chunk = pulses[stored:stored + room]
+                        self._write(chunk, frequency)
+                        stored += len(chunk)
+                        # let the reader know there is something to read
+                        self._lock.notify_all()
+
+                    elif self._policy != BLOCK:
+                        # the policy got changed while waiting
+                        break
+
+                    elif not self._lock.wait(timeout):
+                        break
+
+                self._dropped += count - stored
+
+            self._lock.notify_all()
+
+        return stored
+
+    def wait(self, timeout=None) -> bool:
+        """
+        Waits for pulses to come in.
+
+        Returns early when the buffer gets cleared or closed so whoever is
+        waiting gets the chance to check if it should stop.
+
+        :param timeout: seconds to wait, None waits for as long as it takes.
+
+        :return: True if there are pulses in the buffer.
+        """
+        with self._lock:
+            if not self._size and not self._closed:
+                self._lock.wait(timeout)
+
+            return self._size > 0
+
+    def get(self, limit=None):
+        """
+        Takes the oldest pulses that share a frequency out of the buffer.
+
+        :param limit: most pulses to take, None takes all of them.
+
+        :return: (list of pulses, frequency) or None if the buffer is
+            empty.
+        """
+        with self._lock:
+            if not self._runs:
+                return None
+
+            run = self._runs[0]
+            frequency, count = run
+
+            if limit is not None and count > limit:
+                run[1] -= limit
+                count = limit
+            else:
+                self._runs.popleft()
+
+            start = self._start
+            end = start + count
+
+            if end <= self._capacity:
+                pulses = self._pulses[start:end].tolist()
+            else:
+                pulses = (
+                    self._pulses[start:].tolist() +
+                    self._pulses[:end - self._capacity].tolist()
+                )
+
+            self._start = end % self._capacity
+            self._size -= count
+            self._lock.notify_all()
+
+        return pulses, frequency
@@ -81,7 +81,12 @@ class TimerThreadWorker(object):
         while not self.stop_event.is_set():
             duration = 999999999999999999999
             for t in self.queue[:]:
-                wait_time = t.adjusted_duration - t.timer.elapsed() - 5000
+                timer = t.timer
+                # a stopped timer gets removed by run_func
+                if timer is None:
+                    break
+
+                wait_time = t.adjusted_duration - timer.elapsed() - 5000
                 if wait_time < 5000:
                     break
                 duration = min(wait_time, duration)
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+import importlib
+import os
+import pkgutil
+import random
+
+from pyIRDecoder import protocols
+
+NEC = protocols.NEC
+
+FRAME = NEC.encode(function=97, sub_device=52, device=46).normalized_rlc[0]
+REPEAT_FRAME = [9024, -2256, 564, -96156]
+
+# the three frames of an OrtekMCE code, the first two start the sequence
+ORTEK_MCE_FRAMES = [
+    protocols.OrtekMCE.encode(device=30, function=62).normalized_rlc[i]
+    for i in range(3)
+]
+
+
+def test_decode_many():
+    protocols._last_code = None
+    protocols._last_decoder = None
+    # noinspection PyProtectedMember
+    last_code = NEC._last_code
+
+    codes = protocols.decode_many(
+        [FRAME, [], REPEAT_FRAME, tuple(FRAME), FRAME],
+        NEC.frequency
+    )
+
+    assert len(codes) == 5
+    assert codes[1] is None
+    # nothing is carried over from one frame to the next
+    assert codes[2] is None
+
+    for code in (codes[0], codes[3], codes[4]):
+        assert code.decoder is NEC
+        assert (code.device, code.sub_device, code.function) == (46, 52, 97)
+
+    # every frame gets a code of its own
+    assert codes[0] is not codes[4]
+
+    # the state of the live decoders is left alone
+    assert protocols._last_code is None
+    assert protocols._last_decoder is None
+    # noinspection PyProtectedMember
+    assert NEC._last_code is last_code
+
+
+def test_decode_many_sequence():
+    ortek_mce = protocols.OrtekMCE
+    # noinspection PyProtectedMember
+    ortek_mce._last_code = None
+
+    # every frame of a sequence is decoded on its own
+    assert protocols.decode_many(
+        ORTEK_MCE_FRAMES,
+        ortek_mce.frequency
+    ) == [None, None, None]
+
+    # and the sequence is not started for the live decoder
+    # noinspection PyProtectedMember
+    assert ortek_mce._last_code is None
+
+    # noinspection PyProtectedMember
+    codes = [
+        ortek_mce._try_decode(frame[:], ortek_mce.frequency)[0]
+        for frame in ORTEK_MCE_FRAMES
+    ]
+    assert codes[:2] == [None, None]
+    assert codes[2].function == 62
+
+
+def test_decode_many_config():
+    NEC.enabled = False
+    try:
+        code, = protocols.decode_many([FRAME], NEC.frequency)
+        assert code is None or code.decoder is not NEC
+    finally:
+        NEC.enabled = True
+
+    code, = protocols.decode_many([FRAME], NEC.frequency)
+    assert code.decoder is NEC
+
+
+def test_decode_many_tolerance():
+    tolerance = NEC.tolerance
+    frame = [pulse + 150 if pulse > 0 else pulse - 150 for pulse in FRAME]
+
+    try:
+        NEC.tolerance = 30
+        # noinspection PyProtectedMember
+        timings = NEC._timings
+
+        code, = protocols.decode_many([frame], NEC.frequency)
+        assert code.decoder is NEC
+
+        # the copy picks up the tolerance without throwing away the timing
+        # tables the live decoder has built
+        # noinspection PyProtectedMember
+        assert NEC._timing_tables[30] is timings
+        # noinspection PyProtectedMember
+        assert NEC._timings is timings
+    finally:
+        NEC.tolerance = tolerance
+
+
+def test_decode_ir_code():
+    protocols._last_code = None
+    protocols._last_decoder = None
+
+    ir_code = NEC.encode(function=97, sub_device=52, device=46)
+
+    code, = protocols.decode_many([ir_code])
+    assert code.decoder is NEC
+    assert (code.device, code.sub_device, code.function) == (46, 52, 97)
+    assert code.frequency == ir_code.frequency
+
+    candidates = protocols.decode_all(ir_code)
+    assert candidates[0][0].decoder is NEC
+    assert candidates[0][0] == code
+
+    code = protocols.decode(ir_code)
+    assert code.decoder is NEC
+    assert (code.device, code.sub_device, code.function) == (46, 52, 97)
+
+    protocols._last_code = None
+    protocols._last_decoder = None
+
+
+def test_decode_all():
+    protocols._last_code = None
+    protocols._last_decoder = None
+
+    candidates = protocols.decode_all(FRAME, NEC.frequency)
+    decoders = [code.decoder for code, _ in candidates]
+
+    # the same decoder as decode_many comes first
+    assert decoders[0] is NEC
+    assert candidates[0][0] == protocols.decode_many([FRAME], NEC.frequency)[0]
+    assert protocols.NECf16 in decoders
+    assert len(set(decoders)) == len(decoders)
+
+    # a frame with the exact timings is a perfect match for all of them
+    assert [score for _, score in candidates] == [1.0] * len(candidates)
+
+    frame = [pulse + 50 if pulse > 0 else pulse - 50 for pulse in FRAME]
+    candidates = protocols.decode_all(frame)
+    scores = [score for _, score in candidates]
+    assert all(0.0 < score < 1.0 for score in scores)
+
+    # the candidates are in decoder order whatever their scores are
+    decoders = [code.decoder for code, _ in candidates]
+    assert decoders[0] is NEC
+    assert protocols.Universal in decoders
+    assert decoders.index(protocols.NECf16) < decoders.index(
+        protocols.Universal
+    )
+    assert scores[decoders.index(protocols.Universal)] > scores[0]
+
+    # decoders that see a repeat or the start of a sequence are left out
+    assert protocols.decode_all(REPEAT_FRAME, NEC.frequency) == []
+    assert protocols.OrtekMCE not in [
+        code.decoder for code, _ in protocols.decode_all(ORTEK_MCE_FRAMES[0])
+    ]
+    assert protocols.decode_all([]) == []
+
+    assert protocols._last_code is None
+    assert protocols._last_decoder is None
+
+
+def _fixture_frames():
+    # the frames of the fixture classes in the protocol test modules
+    path = os.path.dirname(__file__)
+
+    for name in sorted(info.name for info in pkgutil.iter_modules([path])):
+        module = importlib.import_module(__package__ + '.' + name)
+        decoder = getattr(module, 'protocol', None)
+
+        if decoder is None:
+            continue
+
+        for _, fixture in sorted(vars(module).items()):
+            if not isinstance(fixture, type) or not hasattr(fixture, 'rlc'):
+                continue
+
+            for rlc in fixture.rlc:
+                yield rlc, decoder.frequency
+
+
+def _decoder_state():
+    # decode changes the state the decoders keep between frames, that
+    # state gets changed in place in lists the decoders and their classes
+    # hold on to
+    state = {}
+
+    for decoder in protocols:
+        attributes = {
+            key: (value, value[:] if isinstance(value, list) else None)
+            for key, value in decoder.__dict__.items()
+        }
+        class_lists = {
+            key: value[:]
+            for key, value in decoder.__class__.__dict__.items()
+            if isinstance(value, list)
+        }
+        state[decoder] = (attributes, class_lists)
+
+    return state
+
+
+def _restore_decoder_state(state):
+    for decoder, (attributes, class_lists) in state.items():
+        decoder.__dict__.clear()
+
+        for key, (value, items) in attributes.items():
+            if items is not None:
+                value[:] = items
+
+            decoder.__dict__[key] = value
+
+        for key, value in class_lists.items():
+            getattr(decoder.__class__, key)[:] = value
+
+
+def test_decode_all_order():
+    rnd = random.Random(0)
+    count = 0
+    state = _decoder_state()
+
+    try:
+        for rlc, frequency in _fixture_frames():
+            frame = [int(pulse * rnd.uniform(0.92, 1.08)) for pulse in rlc]
+
+            protocols._last_code = None
+            protocols._last_decoder = None
+
+            candidates = protocols.decode_all(frame[:], frequency)
+            code = protocols.decode(frame[:], frequency)
+
+            # decode keeps the state of repeats and sequences between
+            # frames and decode_all does not, so only frames both of them
+            # decode on their own are able to be compared
+            if code is None or not candidates:
+                continue
+
+            assert candidates[0][0].decoder is code.decoder, rlc
+            assert candidates[0][0] == code, rlc
+            count += 1
+    finally:
+        _restore_decoder_state(state)
+        protocols._last_code = None
+        protocols._last_decoder = None
+
+    assert count > 150
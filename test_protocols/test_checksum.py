@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+from pyIRDecoder import DecodeError
+from pyIRDecoder import protocols
+from pyIRDecoder import checksum
+
+NEC = protocols.NEC
+
+PARAMETERS = [['A', 0, 3], ['B', 4, 11], ['C', 12, 15]]
+
+
+def _reverse(value, num_bits):
+    return int('{0:0{1}b}'.format(value, num_bits)[::-1], 2)
+
+
+def test_checksum_rules():
+    rules = (
+        ('A', '=', 5),
+        ('C', '-', 'A', 'B', ('B', 4, 4)),
+    )
+    check = checksum.ChecksumRules(rules, PARAMETERS, 'msb', 16)
+
+    c = -(5 + 0xA7 + 0xA) & 0xF
+    assert check(0x5A70 | c)
+    assert not check(0x5A70 | (c ^ 1))
+    assert not check(0x4A70 | c)
+
+    rules = (('C', '^', 'A', ('B', 4, 0), ('B', 4, 4)),)
+    check = checksum.ChecksumRules(rules, PARAMETERS, 'msb', 16)
+    assert check(0x5A70 | (5 ^ 0x7 ^ 0xA))
+    assert not check(0x5A70)
+
+    # the sum gets masked to the width of C
+    rules = (('C', '+', 'B', 0xF0),)
+    check = checksum.ChecksumRules(rules, PARAMETERS, 'msb', 16)
+    assert check(0x5A77)
+    assert not check(0x5A7F)
+
+    rules = (('C', '~', 'A'),)
+    check = checksum.ChecksumRules(rules, PARAMETERS, 'msb', 16)
+    assert check(0x5A7A)
+    assert not check(0x5A75)
+
+
+def test_checksum_rules_lsb():
+    # the NEC layout, every field is sent with its lowest bit first
+    parameters = [['D', 0, 7], ['S', 8, 15], ['F', 16, 23], ['FC', 24, 31]]
+    rules = (('FC', '~', 'F'), ('S', '-', 'D'))
+    check = checksum.ChecksumRules(rules, parameters, 'lsb', 32)
+
+    def raw(d, s, f, fc):
+        value = 0
+        for field in (d, s, f, fc):
+            value = value << 8 | _reverse(field, 8)
+        return value
+
+    assert check(raw(0x2E, -0x2E & 0xFF, 0x61, ~0x61 & 0xFF))
+    assert not check(raw(0x2E, -0x2E & 0xFF, 0x61, 0x61))
+    assert not check(raw(0x2E, 0x2E, 0x61, ~0x61 & 0xFF))
+
+    # the same bits read most significant bit first are different fields
+    check = checksum.ChecksumRules(rules, parameters, 'msb', 32)
+    assert not check(raw(0x2E, -0x2E & 0xFF, 0x61, ~0x61 & 0xFF))
+
+
+def test_checksum_rules_matches():
+    rules = (('A', '=', 5),)
+    check = checksum.ChecksumRules(rules, PARAMETERS, 'msb', 16)
+
+    assert check.matches(PARAMETERS, 'msb', 16)
+    assert check.matches([item[:] for item in PARAMETERS], 'msb', 16)
+    assert not check.matches(PARAMETERS, 'lsb', 16)
+    assert not check.matches(PARAMETERS, 'msb', 12)
+    assert not check.matches(PARAMETERS[:2], 'msb', 16)
+
+
+def test_checksum_rules_errors():
+    for rule in (
+        ('X', '=', 5),
+        ('A', '=', 'X'),
+        ('A', '*', 5),
+        ('A', '-'),
+        ('A', '=', 5, 6),
+        ('A', '~', 'B', 'C'),
+    ):
+        try:
+            checksum.ChecksumRules((rule,), PARAMETERS, 'msb', 16)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('rule was compiled ' + repr(rule))
+
+
+def test_checksum_decode():
+    rlc = NEC.encode(function=97, sub_device=52, device=46).normalized_rlc[0]
+    # flips the last bit of the inverted function
+    rlc[-3] = -564
+
+    try:
+        NEC.decode(rlc, NEC.frequency)
+    except DecodeError:
+        pass
+    else:
+        raise AssertionError('frame with a bad checksum was accepted')
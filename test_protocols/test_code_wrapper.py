@@ -0,0 +1,656 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+import pytest
+
+from pyIRDecoder import (
+    LeadInError,
+    LeadOutError,
+    IRStreamError
+)
+from pyIRDecoder import protocols
+from pyIRDecoder import code_wrapper
+
+NEC = protocols.NEC
+
+FRAME = NEC.encode(function=97, sub_device=52, device=46).normalized_rlc[0]
+
+
+def test_timing_bounds():
+    assert code_wrapper.timing_bounds(564, 0) == (564, 564)
+    assert code_wrapper.timing_bounds(-564, 0) == (-564, -564)
+
+    # the low and high swap places for spaces
+    assert code_wrapper.timing_bounds(1692, 25) == (1269, 2115)
+    assert code_wrapper.timing_bounds(-1692, 25) == (-2115, -1269)
+
+    # at 100% a pulse of nothing is in bounds but one of the other sign
+    # is not
+    assert code_wrapper.timing_bounds(9024, 100) == (0, 18048)
+    assert code_wrapper.timing_bounds(-1, 100) == (-2, 0)
+
+
+def test_timing_table():
+    table = code_wrapper.TimingTable(10, (564, -1692))
+    assert dict(table) == {564: (507, 620), -1692: (-1862, -1523)}
+
+    # timings that are not in the table get added when looked up
+    assert table[-40884] == code_wrapper.timing_bounds(-40884, 10)
+    assert -40884 in table
+
+    # past the limit they get worked out every time
+    for timing in range(code_wrapper.MAX_TABLE_SIZE):
+        assert table[timing + 100000] == code_wrapper.timing_bounds(
+            timing + 100000,
+            10
+        )
+
+    assert len(table) == code_wrapper.MAX_TABLE_SIZE
+    assert table[-1] == (-2, -1)
+    assert -1 not in table
+
+    assert code_wrapper.get_timing_table(10) is code_wrapper.get_timing_table(
+        10
+    )
+    assert code_wrapper.get_timing_table(10).tolerance == 10
+
+
+def test_decoder_tolerance():
+    tolerance = NEC.tolerance
+
+    try:
+        NEC.tolerance = 0
+        # noinspection PyProtectedMember
+        assert NEC._timings[564] == (564, 564)
+        # noinspection PyProtectedMember
+        assert NEC._match(564, 564)
+        # noinspection PyProtectedMember
+        assert not NEC._match(565, 564)
+        # noinspection PyProtectedMember
+        assert not NEC._match(-1693, -1692)
+        assert NEC.decode(FRAME[:], NEC.frequency).function == 97
+
+        frame = FRAME[:]
+        frame[2] += 1
+        # noinspection PyProtectedMember
+        assert NEC._try_decode(frame, NEC.frequency)[0] is None
+
+        NEC.tolerance = 100
+        # noinspection PyProtectedMember
+        assert NEC._timings[564] == (0, 1128)
+        # noinspection PyProtectedMember
+        assert NEC._match(0, 564)
+        # noinspection PyProtectedMember
+        assert NEC._match(1128, 564)
+        # noinspection PyProtectedMember
+        assert not NEC._match(-1, 564)
+        # noinspection PyProtectedMember
+        assert not NEC._match(1, -1692)
+        # noinspection PyProtectedMember
+        assert NEC._match(-3384, -1692)
+    finally:
+        NEC.tolerance = tolerance
+
+    # noinspection PyProtectedMember
+    assert NEC._timings[564] == code_wrapper.timing_bounds(564, tolerance)
+
+
+def wrap(decoder, frame):
+    # noinspection PyProtectedMember
+    return code_wrapper.CodeWrapper(
+        decoder.encoding,
+        decoder._lead_in,
+        decoder._lead_out,
+        decoder._middle_timings,
+        decoder._bursts,
+        decoder.tolerance,
+        frame
+    )
+
+
+def test_code_wrapper():
+    frame = [
+        pulse + 40 if pulse > 0 else pulse - 40
+        for pulse in FRAME
+    ]
+    noisy_frame = frame[:]
+
+    code = wrap(NEC, frame)
+
+    # the frame is read and left as it is
+    assert frame == noisy_frame
+    assert code.original_code == frame
+    # every pulse gets swapped for the timing it matched
+    assert list(code) == FRAME
+    assert code.lead_in == [9024, -4512]
+    assert code.lead_out == [564, -40884]
+
+    assert code.num_bits == 32
+    assert code.bits[:8] == [0, 1, 1, 1, 0, 1, 0, 0]
+    assert code.value == 0x742C8679
+    assert len(code.stream_pairs) == 32
+    assert code.stream_pairs[:2] == [[564, -564], [564, -1692]]
+
+    # the bits are lsb first
+    assert code.get_value(0, 7) == 46
+    assert code.get_value(8, 15) == 52
+    assert code.get_value(16, 23) == 97
+
+
+def test_code_wrapper_merged_pulses():
+    # the space of the last burst runs into the lead out
+    frame = protocols.Bryston.encode(device=5, function=9).normalized_rlc[0]
+    assert frame[-1] == -19890
+
+    code = wrap(protocols.Bryston, frame)
+    assert code.lead_in == []
+    assert code.lead_out == [-18000]
+    assert code.num_bits == 18
+    assert code.get_value(0, 9) == 5
+    assert code.get_value(10, 17) == 9
+
+    # the lead in runs into the mark of the first burst
+    frame = protocols.AdNotham.encode(device=5, function=9).normalized_rlc[0]
+    assert frame[:3] == [895, -1790, 1790]
+
+    code = wrap(protocols.AdNotham, frame)
+    assert code.lead_in == [895, -1790, 895]
+    assert code.lead_out == [-88940]
+    assert code.num_bits == 12
+    assert code.value == 329
+
+
+def test_code_wrapper_errors():
+    for frame, error in (
+        (FRAME[:1], LeadInError),
+        ([4000] + FRAME[1:], LeadInError),
+        (FRAME[:-1] + [-564], LeadOutError),
+        (FRAME[:-2], LeadOutError),
+        (FRAME[:7] + [-3000] + FRAME[8:], IRStreamError),
+    ):
+        original_frame = frame[:]
+
+        try:
+            wrap(NEC, frame)
+        except error:
+            pass
+        else:
+            raise AssertionError(frame)
+
+        assert frame == original_frame
+
+
+def test_extract_values():
+    parameters = [['A', 0, 3], ['B', 4, 11], ['C', 12, 15]]
+    extractors = code_wrapper.compile_parameters(parameters)
+    assert extractors == (
+        ('A', 0, 3, 0xF, 4),
+        ('B', 4, 11, 0xFF, 8),
+        ('C', 12, 15, 0xF, 4)
+    )
+
+    values = code_wrapper.extract_values(
+        extractors, 0x5A73, 16, 'msb', None, {}
+    )
+    assert values == dict(A=0x5, B=0xA7, C=0x3)
+    assert values['B'].num_bits == 8
+    assert values['B'].encoding == 'msb'
+
+    # each field is sent with its lowest bit first
+    values = code_wrapper.extract_values(
+        extractors, 0x5A73, 16, 'lsb', None, {}
+    )
+    assert values == dict(A=0xA, B=0xE5, C=0xC)
+
+    # fields that run past the end of the bits are cut short, ones that
+    # start after it are 0
+    extractors = code_wrapper.compile_parameters(
+        [['X', 4, 11], ['Y', 10, 12]]
+    )
+    values = code_wrapper.extract_values(extractors, 0xA5, 8, 'msb', None, {})
+    assert values == dict(X=0x5, Y=0)
+    assert values['X'].num_bits == 8
+
+
+def test_decoder_extract_values():
+    # noinspection PyProtectedMember
+    extractors = NEC._parameter_extractors()
+    # noinspection PyProtectedMember
+    assert extractors is NEC._compiled_parameters[0][1]
+
+    values = wrap(NEC, FRAME[:]).get_values(extractors, {})
+    assert values == dict(D=46, S=52, F=97, F_CHECKSUM=0x9E)
+    assert values['F'].num_bits == 8
+
+
+def test_biphase_slicer():
+    def slicer(decoder, middle_timings=None):
+        if middle_timings is None:
+            # noinspection PyProtectedMember
+            middle_timings = decoder._middle_timings
+
+        # noinspection PyProtectedMember
+        return code_wrapper.get_biphase_slicer(
+            decoder._timings,
+            decoder._bursts,
+            middle_timings
+        )
+
+    rc6 = protocols.RC6
+    assert slicer(rc6) is not None
+    assert slicer(rc6) is slicer(rc6)
+
+    # the middle timings that are not a bit get sliced as well
+    for decoder in (
+        protocols.RC5x,
+        protocols.MCE,
+        protocols.RC6632,
+        protocols.XBox360
+    ):
+        assert slicer(decoder) is not None, decoder.name
+
+    # noinspection PyProtectedMember
+    assert slicer(rc6, rc6._middle_timings * 2) is None
+    assert slicer(rc6, [[-888, 888]]) is None
+    assert slicer(NEC) is None
+    assert slicer(protocols.Humax4Phase) is None
+
+    frame = rc6.encode(device=5, function=9).normalized_rlc[0]
+    code = wrap(rc6, frame)
+    assert code.value == 0x100509
+    assert code.num_bits == 21
+    # the double width trailer bit
+    assert code.stream_pairs[4] == [-444, 444]
+    assert code.get_value(5, 12) == 5
+    assert code.get_value(13, 20) == 9
+
+    # the -2,2 that comes before the OEM bits
+    frame = protocols.MCE.encode(function=12).normalized_rlc[0]
+    assert frame[9:11] == [-888, 1332]
+
+    code = wrap(protocols.MCE, frame)
+    assert list(code) == frame
+    assert code.value == 0xE800F840C
+    assert code.num_bits == 36
+    assert code.get_value(28, 35) == 12
+
+    rc5x = protocols.RC5x
+    frame = rc5x.encode(device=5, sub_device=9, function=33).normalized_rlc[0]
+    assert frame[11] == -3556
+
+    code = wrap(rc5x, frame)
+    assert list(code) == frame
+    assert code.value == 0x45261
+    assert code.num_bits == 19
+
+    # the gap runs into the space of the bit before it
+    frame = rc5x.encode(device=4, sub_device=9, function=33).normalized_rlc[0]
+    assert frame[11] == -4445
+
+    code = wrap(rc5x, frame)
+    assert list(code) == frame
+    assert code.value == 0x44261
+    assert code.get_value(2, 6) == 4
+    assert code.get_value(7, 12) == 9
+    assert code.get_value(13, 18) == 33
+
+    frame[11] = -2600
+    try:
+        wrap(rc5x, frame)
+    except IRStreamError:
+        pass
+    else:
+        raise AssertionError('frame with a bad gap was accepted')
+
+
+def test_pulse_distance_slicer():
+    # noinspection PyProtectedMember
+    slicer = code_wrapper.get_pulse_distance_slicer(NEC._timings, NEC._bursts)
+    assert slicer is not None
+
+    pulses = [564, -564, 564, -1692, 600, -1700, 530, -520]
+    cleaned_code = []
+    assert slicer(pulses, cleaned_code) == (
+        [[564, -564], [564, -1692], [564, -1692], [564, -564]],
+        0x6,
+        4
+    )
+    assert cleaned_code == [564, -564, 564, -1692, 564, -1692, 564, -564]
+
+    # a lone mark at the end is the first burst that starts with it
+    assert slicer([564, -1692, 564], []) == (
+        [[564, -1692], [564, -564]],
+        0x2,
+        2
+    )
+
+    # frames the slicer is not able to handle are handed back untouched, a
+    # space between a short and a long space or a mark that is off
+    for pulses in (
+        [564, -1100],
+        [900, -564],
+        [564, 564],
+        [564, -564, -564],
+    ):
+        cleaned_code = []
+        assert slicer(pulses, cleaned_code) is None, pulses
+        assert cleaned_code == []
+
+    # pulse width, the space is the same for both bursts
+    sony = protocols.Sony12
+    # noinspection PyProtectedMember
+    slicer = code_wrapper.get_pulse_distance_slicer(
+        sony._timings,
+        sony._bursts
+    )
+    assert slicer([1200, -600, 600, -600, 1200], []) == (
+        [[1200, -600], [600, -600], [1200, -600]],
+        0x5,
+        3
+    )
+
+    # bounds that overlap and bursts that are not pulse distance
+    # noinspection PyProtectedMember
+    assert code_wrapper.get_pulse_distance_slicer(
+        code_wrapper.get_timing_table(100),
+        NEC._bursts
+    ) is None
+    # noinspection PyProtectedMember
+    assert code_wrapper.get_pulse_distance_slicer(
+        NEC._timings,
+        protocols.RC5._bursts
+    ) is None
+
+
+def test_symbol_table():
+    timings = code_wrapper.get_timing_table(10)
+    symbols = [[500, -500], [500, -1000], [500, -1500]]
+
+    table = code_wrapper.get_symbol_table(timings, symbols)
+    assert table is code_wrapper.get_symbol_table(timings, symbols)
+
+    assert table.find_pair(500, -500) == 0
+    assert table.find_pair(520, -1080) == 1
+    assert table.find_pair(500, -1200) == -1
+    assert table.find_pair(600, -500) == -1
+    assert table.find_pair(-500, -500) == -1
+    # outside of the buckets
+    assert table.find_pair(500, -1700) == -1
+    assert table.find_pair(500, 0) == -1
+
+    # when the bounds overlap the first symbol wins
+    table = code_wrapper.get_symbol_table(timings, [[-1000], [-1100]])
+    assert table.find(-1050) == 0
+    assert table.find(-950) == 0
+    assert table.find(-1150) == 1
+    assert table.find(1000) == -1
+
+    # the buckets get wider to stay under the limit
+    table = code_wrapper.get_symbol_table(timings, [[1], [100000]])
+    assert len(table.buckets) <= code_wrapper.MAX_SYMBOL_BUCKETS
+    assert table.find(1) == 0
+    assert table.find(100000) == 1
+    assert table.find(50000) == -1
+
+
+def test_decoder_symbol_table():
+    xmp = protocols.XMP
+    tolerance = xmp.tolerance
+
+    try:
+        xmp.tolerance = 20
+        # noinspection PyProtectedMember
+        table = xmp._symbol_table()
+
+        # at 20% the bounds of the bursts next to each other overlap
+        assert table.find_pair(210, -760) == 0
+        assert table.find_pair(210, -896) == 0
+        assert table.find_pair(210, -1449) == 4
+        assert table.find_pair(210, -2800) == 12
+        assert table.find_pair(210, -3500) == -1
+        assert table.find_pair(400, -760) == -1
+
+        xmp.tolerance = 5
+        # noinspection PyProtectedMember
+        table = xmp._symbol_table()
+        assert table.find_pair(210, -896) == 1
+        assert table.find_pair(210, -1449) == 5
+        assert table.find_pair(210, -2800) == 15
+    finally:
+        xmp.tolerance = tolerance
+
+
+def _jitter(rlc):
+    # every pulse off by up to 4%, the sign stays the same
+    return [
+        int(pulse * (1 + ((i % 5) - 2) / 50.0))
+        for i, pulse in enumerate(rlc)
+    ]
+
+
+def _numpy_wrappers(decoder, rlc, tolerance=None):
+    # the same frame wrapped with the numpy slicer and without it
+    if tolerance is None:
+        tolerance = decoder.tolerance
+
+    res = []
+    min_pulses = code_wrapper.NUMPY_MIN_PULSES
+
+    try:
+        for num_pulses in (1, 0):
+            code_wrapper.NUMPY_MIN_PULSES = num_pulses
+
+            try:
+                # noinspection PyProtectedMember
+                res.append(
+                    code_wrapper.CodeWrapper(
+                        decoder.encoding,
+                        decoder._lead_in,
+                        decoder._lead_out,
+                        [],
+                        decoder._bursts,
+                        tolerance,
+                        rlc[:]
+                    )
+                )
+            except IRStreamError as err:
+                res.append(err.__class__)
+    finally:
+        code_wrapper.NUMPY_MIN_PULSES = min_pulses
+
+    return res
+
+
+def _check_numpy_sliced(decoder, rlc, tolerance):
+    # the pulses between the lead in and the lead out get sliced by numpy
+    # noinspection PyProtectedMember
+    slicer = code_wrapper.get_numpy_slicer(
+        code_wrapper.get_timing_table(tolerance),
+        decoder._bursts
+    )
+    # noinspection PyProtectedMember
+    pulses = rlc[len(decoder._lead_in):len(rlc) - len(decoder._lead_out)]
+    assert slicer(pulses, []) is not None
+
+
+def _check_numpy_parity(decoder, rlc, parameters, tolerance=None):
+    numpy_code, python_code = _numpy_wrappers(decoder, rlc, tolerance)
+
+    if not isinstance(python_code, code_wrapper.CodeWrapper):
+        assert numpy_code is python_code
+        return
+
+    assert numpy_code.bits == python_code.bits
+    assert numpy_code.num_bits == python_code.num_bits
+    assert list(numpy_code) == list(python_code)
+    assert numpy_code.stream_pairs == python_code.stream_pairs
+
+    for _, start, stop in parameters:
+        assert (
+            numpy_code.get_value(start, stop) ==
+            python_code.get_value(start, stop)
+        ), (start, stop)
+
+
+def test_numpy_slicer():
+    pytest.importorskip('numpy')
+
+    timings = code_wrapper.get_timing_table(10)
+    bursts = [[500, -500], [500, -1000], [500, -1500], [500, -2000]]
+
+    slicer = code_wrapper.get_numpy_slicer(timings, bursts)
+    assert slicer is code_wrapper.get_numpy_slicer(timings, bursts)
+
+    pulses = [500, -1000, 520, -2080, 480, -500, 500, -1500, 510]
+    cleaned_code = []
+    res = slicer(pulses, cleaned_code)
+
+    assert res == (
+        [[500, -1000], [500, -2000], [500, -500], [500, -1500],
+         [500, -500]],
+        0b0111001000,
+        10
+    )
+    assert cleaned_code == [
+        500, -1000, 500, -2000, 500, -500, 500, -1500, 500, -500
+    ]
+
+    # same as the symbol slicer, the first timing a pulse matches wins
+    symbol_cleaned_code = []
+    assert code_wrapper.get_symbol_slicer(timings, bursts)(
+        pulses,
+        symbol_cleaned_code
+    ) == res
+    assert symbol_cleaned_code == cleaned_code
+
+    # frames the slicer is not able to handle are handed back untouched
+    for pulses in (
+        [500, -1250],
+        [500, 500],
+        [800, -500],
+        [500, -500, -500],
+    ):
+        cleaned_code = []
+        assert slicer(pulses, cleaned_code) is None, pulses
+        assert cleaned_code == []
+
+    assert code_wrapper.get_numpy_slicer(timings, [[500], [1000]]) is None
+
+
+def test_numpy_slicer_kaseikyo():
+    pytest.importorskip('numpy')
+
+    kaseikyo = protocols.Kaseikyo
+    rlc = kaseikyo.encode(
+        device=5,
+        sub_device=131,
+        function=192,
+        extended_function=14,
+        oem1=217,
+        oem2=244
+    ).normalized_rlc[0]
+
+    # noinspection PyProtectedMember
+    parameters = kaseikyo._parameters
+
+    for frame in (rlc, _jitter(rlc)):
+        _check_numpy_sliced(kaseikyo, frame, kaseikyo.tolerance)
+        _check_numpy_parity(kaseikyo, frame, parameters)
+        # bounds that overlap, the pulse distance slicer is not used
+        _check_numpy_parity(kaseikyo, frame, parameters, 60)
+
+    # a pulse that is off
+    frame = rlc[:]
+    frame[21] = -800
+    _check_numpy_parity(kaseikyo, frame, parameters)
+
+
+def test_numpy_slicer_xmp():
+    pytest.importorskip('numpy')
+
+    xmp = protocols.XMP
+    rlc = xmp.encode(
+        device=1,
+        sub_device=2,
+        oem=68,
+        function=3
+    ).normalized_rlc[0]
+
+    # both halves of the frame without the space between them
+    frame = rlc[:16] + rlc[18:]
+
+    class Decoder(object):
+        encoding = xmp.encoding
+        _lead_in = []
+        _lead_out = [210, -80400]
+        # noinspection PyProtectedMember
+        _bursts = xmp._bursts
+
+    parameters = [
+        ['NIBBLE', start, start + 3] for start in range(0, 64, 4)
+    ] + [['ALL', 0, 63]]
+
+    for tolerance in (5, 20):
+        _check_numpy_sliced(Decoder, frame, tolerance)
+        _check_numpy_parity(Decoder, frame, parameters, tolerance)
+        _check_numpy_parity(Decoder, _jitter(frame), parameters, tolerance)
+
+    # the space between the halves is not one of the bursts
+    _check_numpy_parity(Decoder, rlc, parameters, 5)
+
+
+def test_numpy_slicer_carrier():
+    pytest.importorskip('numpy')
+
+    from pyIRDecoder.air_conditioner import carrier
+
+    packet = (
+        0xAC, 0xF5, 0x48, 0x1A, 0x02, 0x00,
+        0x00, 0x00, 0x00, 0xA4, 0x02, 0x5C
+    )
+    bursts = carrier.Carrier._bursts
+
+    rlc = carrier.Carrier._lead_in[:]
+    for byte in packet:
+        for bit in range(7, -1, -1):
+            rlc.extend(bursts[byte >> bit & 1])
+
+    rlc.extend(carrier.Carrier._lead_out)
+
+    # noinspection PyProtectedMember
+    parameters = carrier.Carrier._parameters
+
+    for frame in (rlc, _jitter(rlc)):
+        _check_numpy_sliced(carrier.Carrier, frame, 25)
+        _check_numpy_parity(carrier.Carrier, frame, parameters, 25)
+
+    numpy_code, _ = _numpy_wrappers(carrier.Carrier, rlc, 25)
+    assert numpy_code.num_bits == 96
+    assert numpy_code.get_value(0, 95) == int(
+        ''.join('{0:08b}'.format(byte) for byte in packet),
+        2
+    )
@@ -0,0 +1,583 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+from pyIRDecoder import (
+    IRException,
+    LeadInError
+)
+from pyIRDecoder import protocols
+from pyIRDecoder import protocol_base
+from pyIRDecoder import decoder_index
+from pyIRDecoder import code_wrapper
+
+NEC = protocols.NEC
+
+FRAME = NEC.encode(function=97, sub_device=52, device=46).normalized_rlc[0]
+
+
+class Decoder(object):
+    # the parts of a decoder the lead in index looks at
+
+    def __init__(self, name, bounds, frequency=38000):
+        self.name = name
+        self.bounds = bounds
+        self.enabled = True
+        self.frequency = frequency
+        self.frequency_tolerance = 2
+
+    def _first_pulse_bounds(self):
+        return self.bounds
+
+    def frequency_match(self, frequency):
+        low, high = code_wrapper.timing_bounds(
+            self.frequency,
+            self.frequency_tolerance
+        )
+        return low <= frequency <= high
+
+
+class Protocol(object):
+    # the parts of a protocol build_shapes looks at
+    _static_shape = True
+    _middle_timings = []
+    _lead_in = [9000, -4500]
+    _bursts = [[500, -500], [500, -1500]]
+    _lead_out = [500, -40000]
+    bit_count = 8
+    _repeat_lead_in = []
+    _repeat_lead_out = []
+    _repeat_bursts = []
+
+
+def test_build_shapes():
+    assert decoder_index.build_shapes(Protocol) == (
+        decoder_index.Shape(17, 20, 21500, 30000, None),
+    )
+
+    class Repeat(Protocol):
+        # the lead out is the length of the whole frame
+        _lead_out = [500, 100000]
+        _repeat_lead_in = [9000, -2250]
+        _repeat_lead_out = [500, -96000]
+
+    assert decoder_index.build_shapes(Repeat) == (
+        decoder_index.Shape(17, 20, 21500, 30000, None),
+        decoder_index.Shape(1, 4, 11250, 11750, None)
+    )
+
+    class Merged(Protocol):
+        # the space of the last burst runs into the lead out
+        _lead_out = [-20000]
+
+    assert decoder_index.build_shapes(Merged) == (
+        decoder_index.Shape(15, 19, 20000, 29500, None),
+    )
+
+    # shapes are not worked out for frames that are not a fixed template or
+    # for repeat frames with bits in them
+    for attributes in (
+        dict(_static_shape=False),
+        dict(_middle_timings=[500, -5000]),
+        dict(_lead_out=[500, -999999999999]),
+        dict(_bursts=[[500, -500]] * 4, bit_count=7),
+        dict(_repeat_lead_in=[9000, -2250], _repeat_bursts=[[500, -500]]),
+    ):
+        protocol = type('Protocol', (Protocol,), attributes)
+        assert decoder_index.build_shapes(protocol) is None, attributes
+
+
+def test_lead_in_index():
+    lead_in = Decoder('lead_in', [(8500, 9549)])
+    negative = Decoder('negative', [(-3000, -2000)], 56000)
+    wildcard = Decoder('wildcard', None)
+
+    index = decoder_index.LeadInIndex([wildcard, lead_in, negative])
+
+    # the decoders come back in the order they were added, the ones that
+    # take any first pulse are always there
+    assert index.candidates(9000) == (wildcard, lead_in)
+    assert index.candidates(-2500) == (wildcard, negative)
+    assert index.candidates(2500) == (wildcard,)
+
+    # the pulses at the edges of the bounds
+    assert lead_in in index.candidates(8500)
+    assert lead_in in index.candidates(9549)
+    assert negative in index.candidates(-3000)
+    assert negative in index.candidates(-2000)
+
+    # a pulse that is out of bounds is only let through when it is in the
+    # same bucket as one of the edges, the decoder turns it down
+    assert lead_in in index.candidates(9599)
+    assert lead_in not in index.candidates(9600)
+    assert lead_in not in index.candidates(8499)
+    assert negative not in index.candidates(-3001)
+    assert negative not in index.candidates(-1900)
+
+    # pulses past MAX_PULSE share the last bucket
+    assert index.candidates(10 ** 6) == index.candidates(
+        decoder_index.MAX_PULSE
+    )
+
+    assert index.candidates(9000, 38000) == (wildcard, lead_in)
+    assert index.candidates(9000, 56000) == ()
+    assert index.candidates(-2500, 56000) == (negative,)
+
+
+def test_lead_in_index_update():
+    lead_in = Decoder('lead_in', [(8500, 9549)])
+    wildcard = Decoder('wildcard', None)
+    index = decoder_index.LeadInIndex([lead_in, wildcard])
+
+    assert index.candidates(9000, 38000) == (lead_in, wildcard)
+
+    lead_in.enabled = False
+    index.update(lead_in)
+    assert index.candidates(9000) == (wildcard,)
+
+    # a different tolerance moves the decoder to other buckets
+    lead_in.enabled = True
+    lead_in.bounds = [(4000, 5000)]
+    index.update(lead_in)
+    assert index.candidates(9000) == (wildcard,)
+    assert index.candidates(4500) == (lead_in, wildcard)
+
+    lead_in.frequency_tolerance = 50
+    index.update(lead_in)
+    assert index.candidates(4500, 56000) == (lead_in,)
+
+    # a decoder that starts taking any first pulse
+    lead_in.bounds = None
+    index.update(lead_in)
+    assert index.candidates(-123) == (lead_in, wildcard)
+
+
+def test_lead_in_index_protocols():
+    # every protocol is handed the frames that start at the edges of the
+    # bounds it works out for the first pulse
+    # noinspection PyProtectedMember
+    index = protocols._lead_in_index
+
+    for decoder in protocols:
+        if not decoder.enabled:
+            continue
+
+        # noinspection PyProtectedMember
+        bounds = decoder._first_pulse_bounds()
+        if bounds is None:
+            assert decoder in index.candidates(1)
+            continue
+
+        for low, high in bounds:
+            assert decoder in index.candidates(low), (decoder.name, low)
+            assert decoder in index.candidates(high), (decoder.name, high)
+
+
+def test_frequency_candidates():
+    ir38 = Decoder('ir38', None)
+    ir36 = Decoder('ir36', None, 36000)
+    ir56 = Decoder('ir56', None, 56000)
+    index = decoder_index.LeadInIndex([ir38, ir36, ir56])
+
+    # 38000 at 2% is 37240 to 38760
+    for frequency, expected in (
+        (38000, (ir38,)),
+        (37240, (ir38,)),
+        (38760, (ir38,)),
+        (38760.5, ()),
+        (37239.5, ()),
+        (37239, ()),
+        (37000, ()),
+        (36000, (ir36,)),
+        (56000, (ir56,)),
+        (1, ()),
+        (10 ** 6, ()),
+    ):
+        # asking a second time hands back what was stored for the slot
+        assert index.candidates(9000, frequency) == expected, frequency
+        assert index.candidates(9000, frequency) == expected, frequency
+
+    # 0 is no frequency
+    assert index.candidates(9000, 0) == (ir38, ir36, ir56)
+
+    # a wider frequency tolerance gets the slots worked out again
+    ir38.frequency_tolerance = 5
+    index.update(ir38)
+    assert index.candidates(9000, 37000) == (ir38,)
+    assert index.candidates(9000, 36500) == (ir38, ir36)
+    assert index.candidates(9000, 39900) == (ir38,)
+    assert index.candidates(9000, 39901) == ()
+
+
+def test_frequency_candidates_protocols():
+    # noinspection PyProtectedMember
+    index = protocols._lead_in_index
+    pulse = FRAME[0]
+
+    for frequency in (NEC.frequency, 36000, 37999.5, 56000, 1):
+        assert index.candidates(pulse, frequency) == tuple(
+            decoder for decoder in index.candidates(pulse)
+            if decoder.frequency_match(frequency)
+        )
+
+    frequency = NEC.frequency * 1.04
+    assert NEC not in index.candidates(pulse, frequency)
+
+    NEC.frequency_tolerance = 5
+    try:
+        assert NEC in index.candidates(pulse, frequency)
+    finally:
+        NEC.frequency_tolerance = 2
+
+    assert NEC not in index.candidates(pulse, frequency)
+
+
+def test_lead_in_index_reorder():
+    first = Decoder('first', [(8500, 9549)])
+    second = Decoder('second', [(8000, 9000)])
+    wildcard = Decoder('wildcard', None)
+    index = decoder_index.LeadInIndex([first, second, wildcard])
+
+    assert index.candidates(8600) == (first, second, wildcard)
+    assert index.candidates(8600, 38000) == (first, second, wildcard)
+
+    # the decoders that are left out keep their order behind the others
+    index.reorder([wildcard])
+    assert index.candidates(8600) == (wildcard, first, second)
+    assert index.candidates(8600, 38000) == (wildcard, first, second)
+
+    index.reorder([second, first, wildcard])
+    assert index.candidates(8600) == (second, first, wildcard)
+    assert index.candidates(9200) == (first, wildcard)
+
+
+def test_decoder_stats():
+    first = Decoder('first', None)
+    second = Decoder('second', None)
+    third = Decoder('third', None)
+
+    stats = decoder_index.DecoderStats([first, second, third])
+    assert stats.order == [first, second, third]
+
+    def frames(hits):
+        for decoder, count in hits:
+            for _ in range(count):
+                stats.attempt(decoder)
+                stats.hit(decoder)
+
+        for _ in range(decoder_index.REORDER_INTERVAL - 1):
+            assert stats.frame_done() is None
+
+        return stats.frame_done()
+
+    assert frames([(third, 3)]) == [third, first, second]
+    assert stats.stats['third'] == dict(
+        hits=3,
+        attempts=3,
+        score=3.0,
+        rank=0
+    )
+
+    # the old hits count for less every time
+    assert frames([(second, 2)]) == [second, third, first]
+    assert stats.stats['third']['score'] == 1.5
+    assert frames([]) is None
+    assert frames([(first, 1)]) == [first, second, third]
+    assert stats.stats['second']['score'] == 0.5
+
+    stats.attempt(third)
+    assert stats.stats['third']['attempts'] == 4
+    assert stats.stats['third']['hits'] == 3
+
+    # ties keep the order the decoders were added in
+    stats = decoder_index.DecoderStats([first, second, third])
+    assert frames([(third, 1), (second, 1)]) == [second, third, first]
+
+
+def test_decoder_stats_protocols():
+    nec_stats = protocols.decoder_stats['NEC']
+
+    protocols._last_code = None
+    protocols._last_decoder = None
+    protocols.decode(FRAME[:], NEC.frequency)
+
+    assert protocols.decoder_stats['NEC']['hits'] == nec_stats['hits'] + 1
+    assert (
+        protocols.decoder_stats['NEC']['attempts'] ==
+        nec_stats['attempts'] + 1
+    )
+
+    # noinspection PyProtectedMember
+    index = protocols._lead_in_index
+    candidates = index.candidates(FRAME[0])
+
+    assert not protocols.adaptive_order
+    try:
+        protocols.adaptive_order = True
+        index.reorder([NEC])
+        assert index.candidates(FRAME[0])[0] is NEC
+        assert sorted(candidates, key=id) == sorted(
+            index.candidates(FRAME[0]),
+            key=id
+        )
+    finally:
+        # turning the adaptive order off puts the decoders back in order
+        protocols.adaptive_order = False
+
+    assert index.candidates(FRAME[0]) == candidates
+
+
+def test_saved_code_index():
+    codes = []
+    index = decoder_index.SavedCodeIndex(NEC, codes)
+
+    code = NEC.encode(function=97, sub_device=52, device=46)
+    other_code = NEC.encode(function=98, sub_device=52, device=46)
+    held_code = NEC.encode(
+        function=99,
+        sub_device=52,
+        device=46,
+        repeat_count=1
+    )
+
+    for saved_code in (code, other_code, held_code, code):
+        index.add(saved_code)
+
+    # a code only gets saved once
+    assert [id(saved_code) for saved_code in codes] == [
+        id(code),
+        id(other_code),
+        id(held_code)
+    ]
+
+    # a frame finds the code it is within the tolerance of
+    rlc = [int(pulse * 1.1) for pulse in FRAME]
+    assert index.find(rlc) is code
+    assert index.find(other_code.normalized_rlc[0]) is other_code
+    assert index.find([int(pulse * 1.5) for pulse in FRAME]) is None
+    assert index.find(FRAME[:-2]) is None
+
+    # codes made up of more than one frame are found by all of their frames
+    assert index.find(held_code.normalized_rlc) is held_code
+    assert index.find(held_code.normalized_rlc[0]) is None
+
+    # the bounds get worked out again when the tolerance changes
+    tolerance = NEC.tolerance
+    NEC.tolerance = 5
+    try:
+        assert index.find(rlc) is None
+        assert index.find(FRAME) is code
+    finally:
+        NEC.tolerance = tolerance
+
+    assert index.find(rlc) is code
+
+    name = str(code)
+    assert index.get(name) is code
+    index.rename(code, 'power')
+    assert index.get('power') is code
+    assert index.get(name) is None
+
+    index.remove(code)
+    assert index.find(rlc) is None
+    assert index.get('power') is None
+    assert [id(saved_code) for saved_code in codes] == [
+        id(other_code),
+        id(held_code)
+    ]
+
+
+def test_saved_code_index_overlap():
+    codes = []
+    index = decoder_index.SavedCodeIndex(NEC, codes)
+
+    # the first pulse of the frame is in the bounds of both lead ins, the
+    # code that was saved first wins
+    frame = [9400] + FRAME[1:]
+    code = NEC.encode(function=97, sub_device=52, device=46)
+    other_code = protocol_base.IRCode(
+        NEC,
+        [frame],
+        [frame],
+        dict(D=46, S=52, F=98, frequency=NEC.frequency)
+    )
+
+    index.add(other_code)
+    index.add(code)
+    assert index.find([9200] + FRAME[1:]) is other_code
+    assert index.find([11000] + FRAME[1:]) is other_code
+    assert index.find([7300] + FRAME[1:]) is code
+
+    index.remove(other_code)
+    assert index.find([9200] + FRAME[1:]) is code
+    assert index.find([11000] + FRAME[1:]) is None
+
+
+def test_saved_codes():
+    code = NEC.encode(function=97, sub_device=52, device=46)
+
+    code.save()
+    try:
+        # noinspection PyProtectedMember
+        assert NEC._saved_code_index.get(str(code)) is code
+        # noinspection PyProtectedMember
+        assert NEC._saved_codes == [code]
+
+        protocols._last_code = None
+        protocols._last_decoder = None
+        rlc = [int(pulse * 1.1) for pulse in FRAME]
+        assert protocols.decode(rlc, NEC.frequency) is code
+    finally:
+        code.delete()
+
+    # noinspection PyProtectedMember
+    assert NEC._saved_codes == []
+
+
+def test_repeat_matcher():
+    ir_code = NEC.encode(repeat_count=1, function=97, sub_device=52, device=46)
+    frame, repeat = ir_code.normalized_rlc
+
+    code = NEC.decode(frame[:], NEC.frequency)
+    matcher = decoder_index.RepeatMatcher(code)
+
+    assert matcher.is_current(code)
+    assert not matcher.is_current(ir_code)
+
+    assert matcher.match_frame(frame)
+    assert not matcher.match_frame(repeat)
+    assert matcher.match_repeat(repeat)
+    assert not matcher.match_repeat(frame)
+
+    bad_repeat = repeat[:]
+    bad_repeat[0] *= 2
+    assert not matcher.match_repeat(bad_repeat)
+
+    tolerance = NEC.tolerance
+    NEC.tolerance = tolerance + 1
+    try:
+        assert not matcher.is_current(code)
+    finally:
+        NEC.tolerance = tolerance
+
+    assert matcher.is_current(code)
+
+
+def test_repeat_matcher_frames_added():
+    code = NEC.decode(FRAME[:], NEC.frequency)
+    matcher = decoder_index.RepeatMatcher(code)
+
+    # decoders like OrtekMCE add the frames that follow to the code
+    # noinspection PyProtectedMember
+    code._normalized_rlc += [FRAME[:]]
+    assert not matcher.is_current(code)
+
+    # a code made up of two frames is not repeated by one of them
+    assert not decoder_index.RepeatMatcher(code).match_frame(FRAME)
+
+    # noinspection PyProtectedMember
+    code._normalized_rlc = [FRAME[:]]
+    assert not matcher.is_current(code)
+
+
+def test_wrap_cache():
+    pioneer = protocols.Pioneer
+    # noinspection PyProtectedMember
+    wrap_cache = protocols._wrap_cache
+
+    # noinspection PyProtectedMember
+    assert NEC._wrap_group == pioneer._wrap_group
+    # noinspection PyProtectedMember
+    assert NEC._wrap_group != protocols.NECx._wrap_group
+    # noinspection PyProtectedMember
+    assert NEC._wrap_cache is wrap_cache
+
+    frame = FRAME[:]
+
+    # nothing is shared outside of a scan
+    # noinspection PyProtectedMember
+    assert NEC._wrap_frame(frame) is not pioneer._wrap_frame(frame)
+
+    with wrap_cache.scan(frame):
+        # noinspection PyProtectedMember
+        code = NEC._wrap_frame(frame)
+        # noinspection PyProtectedMember
+        assert pioneer._wrap_frame(frame) is code
+        # a frame that is equal to the one being scanned is wrapped again
+        # noinspection PyProtectedMember
+        assert pioneer._wrap_frame(FRAME[:]) is not code
+
+    # noinspection PyProtectedMember
+    assert wrap_cache.get(frame, (NEC._wrap_group, NEC.tolerance)) is None
+    # noinspection PyProtectedMember
+    assert list(code) == list(NEC._new_wrap(frame))
+
+
+def test_wrap_cache_error():
+    frame = FRAME[:]
+    frame[0] = 4000
+
+    # noinspection PyProtectedMember
+    wrap_cache = protocols._wrap_cache
+    # noinspection PyProtectedMember
+    key = (NEC._wrap_group, NEC.tolerance)
+    errors = []
+
+    with wrap_cache.scan(frame):
+        for decoder in (NEC, protocols.Pioneer, NEC):
+            try:
+                # noinspection PyProtectedMember
+                decoder._wrap_frame(frame)
+            except IRException as err:
+                errors.append(err)
+
+        cls, _ = wrap_cache.get(frame, key)
+
+    # the class of the error is held on to, every decoder gets an error of
+    # its own
+    assert cls is LeadInError
+    assert len(errors) == 3
+    assert len(set(id(err) for err in errors)) == 3
+    assert all(err.__class__ is cls for err in errors)
+
+
+def test_wrap_cache_batch():
+    protocols._last_code = None
+    protocols._last_decoder = None
+
+    live_code = protocols.decode(FRAME[:], NEC.frequency)
+    batch_code, = protocols.decode_many([FRAME[:]], NEC.frequency)
+    assert batch_code == live_code
+
+    # noinspection PyProtectedMember
+    batch_cache = protocols._batch_wrap_cache
+    # noinspection PyProtectedMember
+    assert batch_cache is not protocols._wrap_cache
+
+    # noinspection PyProtectedMember
+    for batch_decoder in protocols._batch_decoders:
+        # noinspection PyProtectedMember
+        assert batch_decoder._wrap_cache is batch_cache
@@ -27,9 +27,11 @@
 from pyIRDecoder import (
     RepeatLeadInError, 
     RepeatLeadOutError,
-    IRException
+    IRException,
+    DecodeError
 )
 from pyIRDecoder import protocols
+from pyIRDecoder import protocol_base
 
 protocol = protocols.F121
 
@@ -105,3 +107,28 @@ def test_encode():
         assert new_ir_code == ir_code
 
         break
+
+
+def test_decode_short_frame():
+    # a frame that ends with a mark
+    rlc = F121.rlc[0][:23]
+
+    try:
+        protocol.decode(rlc, protocol.frequency)
+    except DecodeError:
+        pass
+    else:
+        raise AssertionError('frame that ends with a mark was accepted')
+
+    # noinspection PyProtectedMember
+    assert protocol._try_decode(rlc, protocol.frequency) == (
+        None,
+        protocol_base.REJECT_DECODE
+    )
+
+    # the decoder scan does not stop at a decoder that trips over a frame
+    protocols._last_code = None
+    protocols._last_decoder = None
+    assert protocols.decode(rlc, protocol.frequency) is None
+    assert protocols.decode([-87220], 38700) is None
+    assert protocols.decode([3456, -3456, 432], 38000) is None
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+from pyIRDecoder import protocols
+from pyIRDecoder import protocol_base
+from pyIRDecoder import frame_pattern
+
+NEC = protocols.NEC
+
+FRAME = NEC.encode(function=97, sub_device=52, device=46).normalized_rlc[0]
+REPEAT_FRAME = [9024, -2256, 564, -96156]
+
+
+def test_build_template():
+    # the lead in is able to run into the mark of the first burst
+    assert frame_pattern.build_template(NEC) == (
+        (
+            ((9024, 9588, 9588), (-4512, -3948, -3948)),
+            [[564, -564], [564, -1692]],
+            32,
+            2
+        ),
+        (((9024,), (-2256,)), [], 0, 2)
+    )
+    # noinspection PyProtectedMember
+    assert NEC._frame_template == frame_pattern.build_template(NEC)
+
+    # bi-phase bursts do not start with a mark
+    assert frame_pattern.build_template(protocols.RC5) is None
+
+
+def test_frame_patterns():
+    patterns = frame_pattern.FramePatterns([NEC, protocols.Samsung20])
+    assert patterns.frame(FRAME[:]).allows(NEC)
+
+    # decoders without a template are never ruled out
+    assert patterns.frame(FRAME[:]).allows(protocols.RC5)
+
+    # two spaces in a row are left to the decoder
+    assert patterns.frame(FRAME[:-1] + [-564, -40884]).allows(NEC)
+
+    # the repeat frame has a template of its own
+    assert patterns.frame(REPEAT_FRAME).allows(NEC)
+    assert not patterns.frame(REPEAT_FRAME).allows(protocols.Samsung20)
+
+    # a frame with a bit missing
+    frame = FRAME[:-4] + FRAME[-2:]
+    assert not patterns.frame(frame).allows(NEC)
+
+
+def test_frame_patterns_tolerance():
+    patterns = frame_pattern.FramePatterns([NEC])
+
+    # a pulse right at the edge of the tolerance of a mark and of a space,
+    # the pattern rules out the frames the decoder rejects and no others
+    for index, pulse, allowed in (
+        (2, 676, True),
+        (2, 677, False),
+        (2, 451, True),
+        (2, 450, False),
+        (5, -2031, True),
+        (5, -2032, False),
+    ):
+        frame = FRAME[:]
+        frame[index] = pulse
+
+        assert patterns.frame(frame).allows(NEC) is allowed, pulse
+        # noinspection PyProtectedMember
+        assert (
+            NEC._try_decode(frame, NEC.frequency)[1] ==
+            protocol_base.DECODED
+        ) is allowed, pulse
+
+    frame = FRAME[:]
+    frame[2] = 700
+
+    tolerance = NEC.tolerance
+
+    try:
+        NEC.tolerance = 25
+        # the patterns are made again for the new tolerance once told to
+        assert not patterns.frame(frame).allows(NEC)
+        patterns.update()
+        assert patterns.frame(frame).allows(NEC)
+
+        NEC.enabled = False
+        patterns.update()
+        assert patterns.frame(FRAME[:-4] + FRAME[-2:]).allows(NEC)
+    finally:
+        NEC.tolerance = tolerance
+        NEC.enabled = True
@@ -27,7 +27,8 @@
 from pyIRDecoder import (
     RepeatLeadInError, 
     RepeatLeadOutError,
-    IRException
+    IRException,
+    LeadOutError
 )
 from pyIRDecoder import protocols
 
@@ -99,3 +100,21 @@ def test_encode():
         assert new_ir_code == ir_code
 
         break
+
+
+def test_decode_short_repeat():
+    ir_code = protocol.decode(GICable.rlc[0][:], protocol.frequency)
+
+    # noinspection PyProtectedMember
+    assert protocol._last_code is ir_code
+
+    # the lead out of a repeat frame without the lead in of one
+    try:
+        protocol.decode([490, -87220], protocol.frequency)
+    except LeadOutError:
+        pass
+    else:
+        raise AssertionError('frame without a lead in was accepted')
+
+    # noinspection PyProtectedMember
+    assert protocol._last_code is None
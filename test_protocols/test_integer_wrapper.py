@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+from pyIRDecoder.integer_wrapper import IntegerWrapper
+
+
+def test_construction():
+    # the bit count comes from the value unless it is given, a given count
+    # masks positive values and leaves negative ones alone
+    assert IntegerWrapper(0).num_bits == 1
+    assert IntegerWrapper(0xB5).num_bits == 8
+    assert IntegerWrapper(0x1B5, 8) == 0xB5
+    assert IntegerWrapper(-5, 4) == -5
+
+    wrapped = IntegerWrapper(0xB5, 12, [564, -1692], 'lsb')
+    copied = IntegerWrapper(wrapped)
+    assert copied.num_bits == 12
+    assert copied == 0xB5
+    assert IntegerWrapper(wrapped, 4) == 0x5
+
+
+def test_bit_slicing():
+    value = IntegerWrapper(0xA5C3, 16)
+
+    # [:count:start] is count bits starting at bit start
+    assert value[:8:0] == 0xC3
+    assert value[:8:8] == 0xA5
+    assert value[:8:4] == 0x5C
+    assert value[:8:12] == 0xA
+    assert value[:8:4].num_bits == 8
+
+    # [:count] is the lowest count bits
+    assert value[:4] == 0x3
+    assert value[:4].num_bits == 4
+
+    # a negative count reverses the order of the bits
+    assert value[:-8] == 0xC3
+    assert value[:-4] == 0xC
+    assert value[:-8:8] == 0xA5
+    assert value[:-4:4] == 0x3
+    assert value[:-4:4].num_bits == 4
+
+    # True as the first index inverts the bits
+    assert value[True:8:0] == 0x3C
+    assert value[True:4] == 0xC
+
+    # any other first index compares the slice with it, a negative one
+    # with the inverted slice
+    assert value[0xC3:8:0] is True
+    assert value[0xC4:8:0] is False
+    assert value[-0xC4:8:0] is True
+
+    assert list(IntegerWrapper(0x6, 4)) == [0, 1, 1, 0]
+    assert value[3] == 0
+    assert value[IntegerWrapper(7)] == 1
+
+
+def test_bit_order():
+    value = IntegerWrapper(0x0B, 4)
+    assert reversed(value) == 0xD
+    assert value.reverse_bit_order() == 0xD
+    assert value.reverse_bit_order(8) == 0xD0
+    assert value.invert_bits() == 0x4
+    assert value.invert_bits(8) == 0xF4
+    assert value.num_one_bits == 3
+
+    # reversing spans more than one byte
+    value = IntegerWrapper(0x12345, 20)
+    assert reversed(value) == 0xA2C48
+    assert reversed(reversed(value)) == 0x12345
+
+    # the bits are listed from the most significant one
+    assert value.bits == [
+        0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 1, 1, 0, 1, 0, 0, 0, 1, 0, 1
+    ]
+
+
+def test_arithmetic():
+    value = IntegerWrapper(0xC3, 8, [564, -1692], 'lsb')
+    other = IntegerWrapper(0x0F, 4)
+
+    assert value + other == 0xD2
+    assert value - 3 == 0xC0
+    assert 0x100 - value == 0x3D
+    assert value * 2 == 0x186
+    assert value // other == 13
+    assert value % 7 == 6
+    assert value & other == 0x3
+    assert value | 0x3C == 0xFF
+    assert value ^ 0xFF == 0x3C
+    assert 0xF0 & value == 0xC0
+    assert value >> 4 == 0xC
+    assert value << 4 == 0xC30
+    assert 0x3C ^ value == 0xFF
+    assert -value == -0xC3
+    assert ~value == ~0xC3
+
+    # the results keep the timings and the encoding
+    res = value + 1
+    assert isinstance(res, IntegerWrapper)
+    assert res.encoding == 'lsb'
+    assert res.timings == IntegerWrapper(0xC4, 8, [564, -1692]).timings
+
+    res = IntegerWrapper(value)
+    res += 1
+    res |= 0x100
+    assert res == 0x1C4
+    assert res.num_bits == 9
+    assert value == 0xC3
+
+    assert int(value) == 0xC3
+    assert str(value) == '195'
+    assert hash(value) == hash(0xC3)
+    assert len(value) == 8
+    assert value == IntegerWrapper(0xC3)
+    assert value < 0xC4 <= value + 1
+
+
+def test_set_bits():
+    value = IntegerWrapper(0, 1)
+    value[5] = 1
+    assert value == 0x20
+    assert value.num_bits == 6
+
+    # [:count:start] sets count bits starting at bit start
+    value[:4:8] = 0xA
+    assert value == 0xA20
+    assert value.num_bits == 12
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+from pyIRDecoder import protocols
+from pyIRDecoder import protocol_base
+from pyIRDecoder import high_precision_timers
+from pyIRDecoder.ir_code import Timer
+
+NEC = protocols.NEC
+
+PARAMS = dict(function=97, sub_device=52, device=46)
+FRAME = NEC.encode(**PARAMS).normalized_rlc[0]
+
+
+def test_code_key():
+    ir_code = NEC.encode(**PARAMS)
+    other_code = NEC.decode(FRAME[:], NEC.frequency)
+
+    assert ir_code is not other_code
+    assert ir_code == other_code
+    assert hash(ir_code) == hash(other_code)
+    assert {ir_code: None}.keys() == {other_code: None}.keys()
+
+    # the protocol, the number of bits and the bits of the parameters in
+    # the order they are sent
+    assert ir_code.key == (NEC.__class__, 24, 0x742C86)
+    assert int(ir_code) == 0x742C86
+    assert ir_code.hexadecimal == '0x742C86'
+    assert str(ir_code) == 'NEC.2E:34:61'
+
+    # the same parameters in a different protocol are a different code
+    pioneer_code = protocols.Pioneer.encode(**PARAMS)
+    assert int(pioneer_code) == int(ir_code)
+    assert pioneer_code != ir_code
+
+    # a frame is compared using the tolerance of the protocol
+    assert ir_code == [int(pulse * 1.1) for pulse in FRAME]
+    assert ir_code != [int(pulse * 1.5) for pulse in FRAME]
+    assert ir_code == [FRAME]
+
+
+def test_code_key_changes():
+    ir_code = NEC.encode(**PARAMS)
+    ir_code2 = NEC.encode(
+        function=98,
+        sub_device=52,
+        device=46
+    )
+
+    assert ir_code != ir_code2
+    assert str(ir_code2) == 'NEC.2E:34:62'
+    assert ir_code2.hexadecimal == '0x742C46'
+
+    # changing a parameter changes the identity of the code and what has
+    # been built from it
+    # noinspection PyProtectedMember
+    ir_code2._data['F'] = 97
+    assert ir_code == ir_code2
+    assert hash(ir_code) == hash(ir_code2)
+    assert str(ir_code2) == 'NEC.2E:34:61'
+    assert ir_code2.hexadecimal == '0x742C86'
+
+    # a name stands in for the parameters
+    # noinspection PyProtectedMember
+    ir_code2._name = 'power'
+    assert str(ir_code2) == 'power'
+    assert ir_code == ir_code2
+
+
+def test_code_memory():
+    import gc
+    import tracemalloc
+
+    ir_code = NEC.decode(FRAME[:], NEC.frequency)
+
+    # the repeat timer only gets made when it is asked for
+    code = protocol_base.IRCode(
+        NEC,
+        ir_code.original_rlc,
+        ir_code.normalized_rlc,
+        dict(ir_code._data)
+    )
+    # noinspection PyProtectedMember
+    assert code._repeat_timer is None
+    assert code.repeat_timer is code.repeat_timer
+    assert not hasattr(code, '__dict__')
+
+    count = 1000
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        codes = [
+            protocol_base.IRCode(
+                NEC,
+                ir_code.original_rlc,
+                ir_code.normalized_rlc,
+                ir_code._data
+            )
+            for _ in range(count)
+        ]
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    assert len(codes) == count
+    # a code used to take around 2.5kb
+    assert size / count < 1500, size / count
+
+
+def test_repeat_timer():
+    calls = []
+    timer = Timer(lambda: calls.append(None), 100000)
+
+    # stopping a timer that was never started has nothing to release
+    assert timer.timer is None
+    assert not timer.is_running
+    timer.stop()
+    assert timer.run_func()
+
+    timer.start(high_precision_timers.TimerUS())
+    assert timer.timer is not None
+    assert timer.is_running
+    # the time it took to decode the frame gets added to the duration
+    assert timer.adjusted_duration >= timer.duration * 1.2
+    assert not timer.run_func()
+
+    timer.cancel()
+    assert not timer.is_running
+    assert timer.run_func()
+    assert calls == []
@@ -99,3 +99,34 @@ def test_encode():
         assert new_ir_code == ir_code
 
         break
+
+
+def test_decode_different_frames():
+    params = NECx.params[0]
+    ir_code = protocol.encode(repeat_count=1, **params)
+    frame, repeat = ir_code.normalized_rlc
+
+    other_code = protocol.encode(
+        device=params['device'],
+        sub_device=params['sub_device'],
+        function=params['function'] + 1
+    )
+
+    # noinspection PyProtectedMember
+    protocol._last_code = None
+
+    first = protocol.decode(frame[:], protocol.frequency)
+    assert first.function == params['function']
+
+    # the repeat frame of the code is the code
+    assert protocol.decode(repeat[:], protocol.frequency) is first
+
+    # the frame of a different code that starts the same way is not a repeat
+    second = protocol.decode(
+        other_code.normalized_rlc[0][:],
+        protocol.frequency
+    )
+    assert second is not first
+    assert second.function == params['function'] + 1
+
+    assert protocol.decode(frame[:], protocol.frequency) == first
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+from pyIRDecoder import protocols
+from pyIRDecoder import parallel
+
+NEC = protocols.NEC
+
+FRAME = NEC.encode(function=97, sub_device=52, device=46).normalized_rlc[0]
+REPEAT_FRAME = [9024, -2256, 564, -96156]
+SONY_FRAME = protocols.Sony12.encode(device=5, function=9).normalized_rlc[0]
+
+# FRAME as a pronto code
+PRONTO_CODE = (
+    '0000 006C 0000 0022 015A 00AD 0015 0015 0015 0040 0015 0040 0015 0040 '
+    '0015 0015 0015 0040 0015 0015 0015 0015 0015 0015 0015 0015 0015 0040 '
+    '0015 0015 0015 0040 0015 0040 0015 0015 0015 0015 0015 0040 0015 0015 '
+    '0015 0015 0015 0015 0015 0015 0015 0040 0015 0040 0015 0015 0015 0015 '
+    '0015 0040 0015 0040 0015 0040 0015 0040 0015 0015 0015 0015 0015 0040 '
+    '0015 0621'
+)
+
+
+def test_decode():
+    frames = [FRAME, [], REPEAT_FRAME, SONY_FRAME] * 3
+    expected = protocols.decode_many(frames)
+
+    with parallel.CorpusDecoder(max_workers=2, chunk_size=3) as decoder:
+        # noinspection PyProtectedMember
+        chunks = list(decoder._chunks(frames, 0))
+        assert [len(chunk) for chunk in chunks] == [3, 3, 3, 3]
+
+        codes = list(decoder.decode(frames))
+
+    assert len(codes) == len(frames)
+
+    for i, code in enumerate(codes):
+        if i % 4 in (1, 2):
+            assert code is None
+            continue
+
+        # the codes come back in order
+        assert code.decoder is expected[i].decoder
+        assert code == expected[i]
+        assert code is not expected[i]
+
+    assert codes[0].decoder is NEC
+    assert codes[0].function == 97
+    assert codes[3].decoder is protocols.Sony12
+
+
+def test_decode_ir_code():
+    ir_code = NEC.encode(function=97, sub_device=52, device=46)
+    frames = [ir_code, PRONTO_CODE, FRAME]
+    expected = protocols.decode_many(frames)
+
+    # IRCode instances and pronto codes use their own frequency
+    with parallel.CorpusDecoder(max_workers=1) as decoder:
+        codes = list(decoder.decode(frames))
+
+    assert len(codes) == len(frames)
+
+    for i, code in enumerate(codes):
+        assert code.decoder is NEC
+        assert (code.device, code.sub_device, code.function) == (46, 52, 97)
+        assert code == expected[i]
+
+
+def test_saved_code():
+    saved_code = NEC.encode(function=97, sub_device=52, device=46)
+    saved_code.save()
+
+    try:
+        codes = list(parallel.decode([FRAME, FRAME], NEC.frequency, 1))
+    finally:
+        saved_code.delete()
+
+    # a saved code comes back as the saved instance
+    assert codes[0] is saved_code
+    assert codes[1] is saved_code
+
+
+def test_config():
+    NEC.enabled = False
+    try:
+        with parallel.CorpusDecoder(max_workers=1) as decoder:
+            code, = decoder.decode([FRAME], NEC.frequency)
+    finally:
+        NEC.enabled = True
+
+    # the processes copy the decoders when they start
+    assert code is None or code.decoder is not NEC
+
+    try:
+        parallel.CorpusDecoder(chunk_size=0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+from pyIRDecoder import protocols
+from pyIRDecoder import decoder_index
+from pyIRDecoder import protocol_base
+
+NEC = protocols.NEC
+
+FRAME = NEC.encode(function=97, sub_device=52, device=46).normalized_rlc[0]
+
+
+def test_shapes():
+    # noinspection PyProtectedMember
+    assert NEC._shapes == (
+        decoder_index.Shape(65, 68, 49632, 86292, None),
+        decoder_index.Shape(1, 4, 11280, 11844, None)
+    )
+
+    tolerance = NEC.tolerance
+
+    try:
+        # the durations get the tolerance added plus a microsecond for
+        # each pulse the bounds got rounded down for
+        NEC.tolerance = 20
+        main_shape, repeat_shape = NEC.shapes
+        assert main_shape[:4] == (65, 68, 39637, 103618)
+        assert repeat_shape[:4] == (1, 4, 9020, 14216)
+        # noinspection PyProtectedMember
+        assert main_shape.first_pulse == NEC._first_pulse_bounds()
+
+        NEC.tolerance = 0
+        main_shape, repeat_shape = NEC.shapes
+        assert main_shape[:4] == (65, 68, 49564, 86360)
+    finally:
+        NEC.tolerance = tolerance
+
+    # decoders that work their frames out themselves have no shapes
+    assert protocols.RC6.shapes is None
+
+
+def test_fits_shape():
+    duration = sum(abs(item) for item in FRAME[:-1])
+
+    # noinspection PyProtectedMember
+    assert NEC._fits_shape(len(FRAME), duration)
+    # noinspection PyProtectedMember
+    assert NEC._fits_shape(4, 11280)
+    # noinspection PyProtectedMember
+    assert not NEC._fits_shape(12, duration)
+    # noinspection PyProtectedMember
+    assert not NEC._fits_shape(len(FRAME), duration * 3)
+
+    tolerance = NEC.tolerance
+
+    try:
+        NEC.tolerance = 0
+        # noinspection PyProtectedMember
+        assert NEC._fits_shape(68, 86360)
+        # noinspection PyProtectedMember
+        assert not NEC._fits_shape(68, 86361)
+        # noinspection PyProtectedMember
+        assert not NEC._fits_shape(69, duration)
+    finally:
+        NEC.tolerance = tolerance
+
+    # noinspection PyProtectedMember
+    assert protocols.RC6._fits_shape(1, 0)
+
+
+def test_try_decode():
+    # a protocol with its own decode gets its exceptions turned into reasons
+    # noinspection PyProtectedMember
+    code, reason = NEC._try_decode(FRAME[:], NEC.frequency)
+    assert reason == protocol_base.DECODED
+    assert code.function == 97
+
+    # noinspection PyProtectedMember
+    assert NEC._try_decode([9024, -2256, 564, -96156], NEC.frequency) == (
+        code,
+        protocol_base.DECODED
+    )
+    code.repeat_timer.stop()
+
+    bad_checksum = FRAME[:]
+    bad_checksum[-3] = -564
+
+    for frame, expected in (
+        (bad_checksum, protocol_base.REJECT_DECODE),
+        (FRAME[:-2] + [564, -564] + FRAME[-2:],
+         protocol_base.REJECT_TOO_MANY_BITS),
+        (FRAME[:-4] + FRAME[-2:], protocol_base.REJECT_NOT_ENOUGH_BITS),
+    ):
+        # noinspection PyProtectedMember
+        assert NEC._try_decode(frame, NEC.frequency) == (None, expected)
+
+
+def test_try_decode_stock():
+    # a protocol that uses the stock decode never raises
+    sony = protocols.Sony12
+    frame = sony.encode(device=5, function=9).normalized_rlc[0]
+
+    # noinspection PyProtectedMember
+    code, reason = sony._try_decode(frame[:], sony.frequency)
+    assert reason == protocol_base.DECODED
+    assert code.function == 9
+
+    for bad_frame, expected in (
+        (FRAME[:], protocol_base.REJECT_FRAME),
+        ([2400, -600, 1200, -25200], protocol_base.REJECT_FRAME),
+        (frame[:-4] + frame[-2:], protocol_base.REJECT_NOT_ENOUGH_BITS),
+    ):
+        # noinspection PyProtectedMember
+        assert sony._try_decode(bad_frame, sony.frequency) == (None, expected)
+
+    try:
+        sony._checksum_rules = (('F', '=', 8),)
+        # noinspection PyProtectedMember
+        assert sony._try_decode(frame[:], sony.frequency) == (
+            None,
+            protocol_base.REJECT_CHECKSUM
+        )
+
+        sony._checksum_rules = (('F', '=', 9),)
+        # noinspection PyProtectedMember
+        assert sony._try_decode(frame[:], sony.frequency)[1] == (
+            protocol_base.DECODED
+        )
+    finally:
+        del sony._checksum_rules
+
+
+def test_try_decode_short_frame():
+    # short or broken frames have to come back as a reason from every
+    # decoder, a decoder that trips over one raises and that is a bug
+    protocols._last_code = None
+    protocols._last_decoder = None
+
+    for decoder in protocols:
+        for frame in (
+            [24, -21148],
+            [500],
+            [500, -500],
+            [500, -500, 500],
+            [9024],
+            FRAME[:3],
+        ):
+            # noinspection PyProtectedMember
+            code, reason = decoder._try_decode(frame[:], decoder.frequency)
+            assert code is None
+            assert reason != protocol_base.DECODED
+
+        for frame in (
+            FRAME[:-1],
+            FRAME[1:],
+            FRAME[:-3] + FRAME[-1:],
+        ):
+            # noinspection PyProtectedMember
+            code, reason = decoder._try_decode(frame[:], decoder.frequency)
+
+            if decoder is protocols.Universal:
+                assert reason == protocol_base.DECODED
+                code.repeat_timer.stop()
+            else:
+                assert code is None
+                assert reason != protocol_base.DECODED
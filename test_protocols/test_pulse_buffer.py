@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+import threading
+import time
+
+from pyIRDecoder import protocols
+from pyIRDecoder import pulse_buffer
+
+
+def test_put_get():
+    buffer = pulse_buffer.PulseBuffer(8)
+    assert buffer.capacity == 8
+    assert buffer.policy == pulse_buffer.DROP_OLDEST
+    assert buffer.get() is None
+
+    assert buffer.put([1, -2, 3], 38000) == 3
+    assert buffer.put([4, -5], 38000) == 2
+    assert buffer.put([6, -7], 56000) == 2
+    assert len(buffer) == 7
+
+    # pulses come back out grouped by frequency
+    assert buffer.get(2) == ([1, -2], 38000)
+    assert buffer.get() == ([3, 4, -5], 38000)
+
+    # the pulses wrap around the end of the buffer
+    assert buffer.put([8, -9, 10, -11, 12], 56000) == 5
+    assert buffer.get() == ([6, -7, 8, -9, 10, -11, 12], 56000)
+    assert buffer.get() is None
+
+    assert buffer.dropped == 0
+    assert buffer.high_water == 7
+
+    for capacity in (0, -1):
+        try:
+            pulse_buffer.PulseBuffer(capacity)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(capacity)
+
+    try:
+        buffer.policy = 'drop_everything'
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('unknown policy was accepted')
+
+    assert buffer.policy == pulse_buffer.DROP_OLDEST
+
+
+def test_drop_oldest():
+    buffer = pulse_buffer.PulseBuffer(8, pulse_buffer.DROP_OLDEST)
+    buffer.put([1, -2, 3], 38000)
+    buffer.put([4, -5], 36000)
+
+    # the oldest pulses make room, a run that gets emptied goes away
+    assert buffer.put([6, -7, 8, -9, 10, -11, 12], 56000) == 7
+    assert len(buffer) == 8
+    assert buffer.dropped == 4
+    assert buffer.high_water == 8
+    assert buffer.get() == ([-5], 36000)
+    assert buffer.get() == ([6, -7, 8, -9, 10, -11, 12], 56000)
+
+    buffer.put([1, -2, 3, -4], 38000)
+    assert buffer.put([5, -6, 7], 38000) == 3
+    assert buffer.get() == ([1, -2, 3, -4, 5, -6, 7], 38000)
+
+    # only the newest pulses of a put larger than the buffer are kept
+    buffer.reset_counters()
+    assert buffer.put(list(range(1, 13)), 38000) == 8
+    assert buffer.dropped == 4
+    assert buffer.get() == (list(range(5, 13)), 38000)
+
+
+def test_drop_newest():
+    buffer = pulse_buffer.PulseBuffer(8, pulse_buffer.DROP_NEWEST)
+    buffer.put([1, -2, 3, -4, 5], 38000)
+
+    # the pulses that do not fit are thrown away
+    assert buffer.put([6, -7, 8, -9], 56000) == 3
+    assert buffer.dropped == 1
+    assert buffer.put([10], 56000) == 0
+    assert buffer.dropped == 2
+
+    assert buffer.get() == ([1, -2, 3, -4, 5], 38000)
+    assert buffer.get() == ([6, -7, 8], 56000)
+
+    assert buffer.put(list(range(1, 11))) == 8
+    assert buffer.dropped == 4
+    assert buffer.get() == (list(range(1, 9)), 0)
+
+
+def test_block():
+    buffer = pulse_buffer.PulseBuffer(8, pulse_buffer.BLOCK)
+    buffer.put([1, -2, 3, -4, 5, -6])
+
+    # nothing is reading so the pulses that do not fit are dropped when the
+    # time runs out
+    assert buffer.put([7, -8, 9, -10], timeout=0.01) == 2
+    assert buffer.dropped == 2
+    assert buffer.get() == ([1, -2, 3, -4, 5, -6, 7, -8], 0)
+
+    # the put waits for a reader to make room
+    buffer.reset_counters()
+    buffer.put(list(range(1, 9)))
+    taken = []
+
+    def read():
+        while len(taken) < 12:
+            if buffer.wait(1):
+                taken.extend(buffer.get(3)[0])
+
+    reader = threading.Thread(target=read)
+    reader.start()
+
+    try:
+        assert buffer.put(list(range(9, 13)), timeout=5) == 4
+    finally:
+        reader.join(5)
+
+    assert taken == list(range(1, 13))
+    assert buffer.dropped == 0
+
+    # a put that is waiting stops when the buffer gets closed or the
+    # policy gets changed, a closed buffer stays empty
+    for stop, size in (
+        (buffer.close, 0),
+        (lambda: setattr(buffer, 'policy', pulse_buffer.DROP_NEWEST), 8)
+    ):
+        buffer.open()
+        buffer.policy = pulse_buffer.BLOCK
+        buffer.clear()
+        buffer.put(list(range(8)))
+
+        timer = threading.Timer(0.05, stop)
+        timer.start()
+
+        start = time.time()
+        assert buffer.put([1, -2], timeout=5) == 0
+        assert time.time() - start < 5
+        assert len(buffer) == size
+        timer.join()
+
+
+def test_close():
+    buffer = pulse_buffer.PulseBuffer(8)
+    buffer.put([1, -2, 3])
+
+    buffer.close()
+    assert buffer.closed
+    assert len(buffer) == 0
+    assert buffer.put([4, -5]) == 0
+    assert not buffer.wait(0.01)
+
+    buffer.open()
+    assert buffer.put([4, -5]) == 2
+    assert buffer.wait(0.01)
+
+    # cleared pulses are not counted as dropped
+    buffer.clear()
+    assert buffer.get() is None
+    assert buffer.dropped == 0
+
+    # noinspection PyUnresolvedReferences
+    assert isinstance(protocols.stream_buffer, pulse_buffer.PulseBuffer)
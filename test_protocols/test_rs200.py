@@ -27,7 +27,8 @@
 from pyIRDecoder import (
     RepeatLeadInError, 
     RepeatLeadOutError,
-    IRException
+    IRException,
+    DecodeError
 )
 from pyIRDecoder import protocols
 
@@ -99,3 +100,15 @@ def test_encode():
         assert new_ir_code == ir_code
 
         break
+
+
+def test_decode_missing_pulse():
+    # a frame that lost a pulse is not made of mark and space pairs
+    rlc = Rs200.rlc[0][:-2] + Rs200.rlc[0][-1:]
+
+    try:
+        protocol.decode(rlc, protocol.frequency)
+    except DecodeError:
+        pass
+    else:
+        raise AssertionError('DecodeError was not raised')
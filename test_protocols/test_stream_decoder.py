@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+#
+# *****************************************************************************
+# MIT License
+#
+# Copyright (c) 2020 Kevin G. Schlosser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# *****************************************************************************
+
+
+from pyIRDecoder import protocols
+
+# noinspection PyProtectedMember
+stream_module = protocols._original_module
+
+NEC = protocols.NEC
+
+FRAME = NEC.encode(function=97, sub_device=52, device=46).normalized_rlc[0]
+
+# pulses that no decoder accepts, with gaps in between them
+NOISE = [310, -720, 1290, -460, 820, -2600] * 3
+
+
+def reset():
+    protocols._last_code = None
+    protocols._last_decoder = None
+    protocols.feed_many([], -1)
+
+
+def test_feed():
+    reset()
+
+    codes = []
+    for pulse in FRAME:
+        code = protocols.feed(pulse, NEC.frequency)
+        if code is not None:
+            codes.append(code)
+
+    assert len(codes) == 1
+    assert codes[0].decoder is NEC
+    # noinspection PyProtectedMember
+    assert protocols._stream.pending == []
+
+    reset()
+
+    # where the chunks start and end does not matter
+    codes = protocols.feed_many(FRAME[:5], NEC.frequency)
+    codes += protocols.feed_many(FRAME[5:], NEC.frequency)
+    assert len(codes) == 1
+    assert codes[0].device == 46
+
+    # a different frequency drops what is left over
+    protocols.feed_many(FRAME[:5], NEC.frequency)
+    protocols.feed_many([], 56000)
+    # noinspection PyProtectedMember
+    assert protocols._stream.pending == []
+
+
+def test_feed_after_noise():
+    reset()
+
+    assert protocols.feed_many(NOISE, NEC.frequency) == []
+    # noinspection PyProtectedMember
+    assert protocols._stream.pending == NOISE
+
+    codes = protocols.feed_many(FRAME, NEC.frequency)
+    assert len(codes) == 1
+    assert codes[0].decoder is NEC
+    assert codes[0].function == 97
+    # noinspection PyProtectedMember
+    assert protocols._stream.pending == []
+
+    # a frame cut short by noise and followed by a whole one
+    reset()
+
+    codes = protocols.feed_many(FRAME[:20] + [-9000] + FRAME, NEC.frequency)
+    assert len(codes) == 1
+    assert codes[0].function == 97
+
+
+def test_feed_limits():
+    reset()
+
+    for _ in range(stream_module.MAX_STREAM_STARTS):
+        assert protocols.feed_many(NOISE, NEC.frequency) == []
+
+        # noinspection PyProtectedMember
+        stream = protocols._stream
+        assert len(stream.pending) <= stream_module.MAX_STREAM_PULSES
+        # noinspection PyProtectedMember
+        assert len(stream._starts) <= stream_module.MAX_STREAM_STARTS
+
+    # a stream without a single gap in it
+    assert protocols.feed_many(
+        [500, -500] * stream_module.MAX_STREAM_PULSES,
+        NEC.frequency
+    ) == []
+    # noinspection PyProtectedMember
+    assert len(protocols._stream.pending) == stream_module.MAX_STREAM_PULSES
+
+    # a frame that comes after a gap still decodes
+    codes = protocols.feed_many([-9000] + FRAME, NEC.frequency)
+    assert len(codes) == 1
+    assert codes[0].decoder is NEC
+
+
+class CountingDecoder(object):
+    # stands in for the decoders, nothing ever decodes
+
+    def __init__(self):
+        self.calls = []
+
+    def _decode(self, data, frequency):
+        self.calls.append(len(data))
+        return None
+
+
+def test_feed_decode_count():
+    decoder = CountingDecoder()
+    stream = stream_module.StreamDecoder(decoder, NEC.frequency)
+    max_starts = stream_module.MAX_STREAM_STARTS
+
+    noise = NOISE * 300
+    num_gaps = 0
+    num_calls = 0
+    longest = 0
+
+    for pulse in noise:
+        del decoder.calls[:]
+        assert stream.feed(pulse) is None
+
+        if pulse < -stream_module.STREAM_GAP:
+            num_gaps += 1
+            num_calls += len(decoder.calls)
+
+            # a gap costs a decode for every place a frame is able to
+            # start at, that does not grow with the length of the stream
+            assert 0 < len(decoder.calls) <= max_starts
+
+            # one less right after the oldest pulses got dropped
+            if num_gaps >= max_starts:
+                assert len(decoder.calls) >= max_starts - 1
+
+            # only the first held pulse is able to make for a long frame
+            assert max(decoder.calls[1:] or [0]) <= max_starts * 6
+            longest = max(longest, decoder.calls[0])
+        else:
+            assert decoder.calls == []
+
+    assert num_gaps == 900
+    # 5 decodes a gap, less for the first few gaps and right after the
+    # oldest pulses got dropped
+    assert num_calls == 4485
+    assert longest <= stream_module.MAX_STREAM_PULSES
+    assert len(stream.pending) <= stream_module.MAX_STREAM_PULSES
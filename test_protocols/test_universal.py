@@ -65,3 +65,15 @@ def test_decode():
             )
         print()
         print(ir_code)
+
+
+def test_decode_lone_pulse(capsys):
+    # a frame that ends with a mark is not made of mark and space pairs,
+    # it gets decoded by looking at the marks and spaces on their own
+    rlc = Universal.rlc[0][:-1]
+
+    ir_code = protocol.decode(rlc, protocol.frequency)
+    assert ir_code.code == 0xE097AF3999E666116008124
+
+    # and that is not an error
+    assert capsys.readouterr().err == ''
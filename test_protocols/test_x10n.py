@@ -99,3 +99,24 @@ def test_encode():
         assert new_ir_code == ir_code
 
         break
+
+
+def test_decode_repeat():
+    ir_code = protocol.encode(function=5, n=3, repeat_count=1)
+    first, second, repeat = ir_code.normalized_rlc
+
+    # noinspection PyProtectedMember
+    protocol._last_code = None
+
+    try:
+        protocol.decode(first[:], protocol.frequency)
+    except RepeatLeadInError:
+        pass
+    else:
+        raise AssertionError('first frame did not ask for the second one')
+
+    code = protocol.decode(second[:], protocol.frequency)
+    assert code == ir_code
+
+    # the second frame repeating is the same code
+    assert protocol.decode(repeat[:], protocol.frequency) is code